@@ -0,0 +1,288 @@
+"""Synthetic DSSAT outputs for benchmarks and the mock backend.
+
+Every generator is deterministic for a given seed and scales with the number
+of runs (treatments), variables and simulated days. Two forms are produced:
+the JSON payloads returned by the backend endpoints (consumed by
+`data.data_processor.load_file_data`) and the raw text files the backend
+parses (consumed by the header sniffer, workspace index and file preview).
+"""
+import os
+from datetime import date, timedelta
+
+import numpy as np
+
+# Time series variables of PlantGro.OUT-like files, extended with V001, V002... when more are requested
+SERIES_CODES = ("LAID", "CWAD", "GWAD", "LWAD", "SWAD", "RWAD", "HWAD", "SNAD",
+                "GNAD", "EPAC", "ESAC", "SWTD", "NSTD", "WSGD", "RDPD", "L#SD")
+# Summary variables of EVALUATE.OUT-like files
+SUMMARY_CODES = ("HWAM", "CWAM", "MDAT", "ADAT", "HWUM", "H#AM", "LAIX", "CNAM", "GNAM", "HIAM")
+# First simulated day
+START_DATE = date(1982, 2, 26)
+# Default experiment code of the generated files
+EXPERIMENT = "UFGA8201"
+# Days between two measurements
+MEASURED_EVERY = 10
+# Share of measured values reported as missing (-99)
+MISSING_SHARE = 0.05
+# Dataset size presets: runs (treatments), variables per run and simulated days per run
+SIZES = {
+    "small": {"runs": 4, "variables": 8, "days": 120},
+    "medium": {"runs": 16, "variables": 16, "days": 180},
+    "large": {"runs": 64, "variables": 32, "days": 365}
+}
+
+def variable_codes(count, codes=SERIES_CODES):
+    """Return `count` distinct variable codes, the known DSSAT codes first.
+
+    Args:
+        count (int): Number of codes.
+        codes (tuple): Known codes used before the numbered ones.
+    Returns:
+        list: Variable codes.
+    """
+    found = list(codes[:count])
+    found.extend(f"V{i:03d}" for i in range(1, count - len(found) + 1))
+    return found
+
+def iso_dates(days, start=START_DATE):
+    """ISO dates of consecutive days, as sent by the backend."""
+    return [(start + timedelta(days=i)).isoformat() for i in range(days)]
+
+def _growth_curves(rng, runs, variables, days):
+    """Logistic curves with noise, one per run and variable (array of shape runs x variables x days)."""
+    t = np.arange(days, dtype=float)
+    scale = rng.uniform(1, 10000, size=(runs, variables, 1))
+    midpoint = rng.uniform(0.3, 0.7, size=(runs, variables, 1)) * days
+    rate = rng.uniform(4, 12, size=(runs, variables, 1)) / max(days, 1)
+    curves = scale / (1 + np.exp(-rate * (t - midpoint)))
+    return np.round(curves * rng.normal(1, 0.02, size=curves.shape), 2)
+
+def _measured_points(rng, curve, measured_every):
+    """Sample a simulated curve every `measured_every` days with noise and some missing values."""
+    index = np.arange(measured_every - 1, len(curve), measured_every)
+    values = np.round(curve[index] * rng.normal(1, 0.1, size=len(index)), 2)
+    missing = rng.random(len(index)) < MISSING_SHARE
+    return index, ["-99" if m else float(v) for v, m in zip(values, missing)]
+
+def out_payload(runs=4, variables=8, days=120, measured=True, measured_every=MEASURED_EVERY,
+                experiment=EXPERIMENT, seed=0):
+    """JSON payload of `/api/out` (or `/api/sim-vs-obs` when measured data is included).
+
+    Args:
+        runs (int): Number of runs.
+        variables (int): Number of simulated variables per run.
+        days (int): Simulated days per run.
+        measured (bool): Include the measuredFinal and measuredTimeSeries fields.
+        measured_every (int): Days between two measurements.
+        experiment (str): Experiment code.
+        seed (int): Random seed.
+    Returns:
+        list: One dict per run.
+    """
+    rng = np.random.default_rng(seed)
+    codes = variable_codes(variables)
+    dates = iso_dates(days)
+    curves = _growth_curves(rng, runs, variables, days)
+    payload = []
+    for run in range(runs):
+        entry = {
+            "run": f"Treatment_{run + 1}",
+            "experiment": experiment,
+            "treatmentNumber": run + 1,
+            "fileType": "out",
+            "simulated": {
+                cde: {"values": curves[run, i].tolist(), "dates": dates} for i, cde in enumerate(codes)
+            }
+        }
+        if measured:
+            entry["measuredFinal"] = {}
+            entry["measuredTimeSeries"] = {}
+            for i, cde in enumerate(codes):
+                index, values = _measured_points(rng, curves[run, i], measured_every)
+                entry["measuredFinal"][cde] = {"value": values[-1] if values and values[-1] != "-99" else -99}
+                entry["measuredTimeSeries"][cde] = {"values": values, "dates": [dates[j] for j in index]}
+        payload.append(entry)
+    return payload
+
+def t_payload(runs=4, variables=8, days=120, measured_every=MEASURED_EVERY, experiment=EXPERIMENT, seed=0):
+    """JSON payload of `/api/t`: measured time series only.
+
+    Args:
+        runs (int): Number of treatments.
+        variables (int): Number of measured variables per treatment.
+        days (int): Days covered by the measurements.
+        measured_every (int): Days between two measurements.
+        experiment (str): Experiment code.
+        seed (int): Random seed.
+    Returns:
+        list: One dict per treatment.
+    """
+    rng = np.random.default_rng(seed)
+    codes = variable_codes(variables)
+    dates = iso_dates(days)
+    curves = _growth_curves(rng, runs, variables, days)
+    payload = []
+    for run in range(runs):
+        series = {}
+        for i, cde in enumerate(codes):
+            index, values = _measured_points(rng, curves[run, i], measured_every)
+            series[cde] = {"values": values, "dates": [dates[j] for j in index]}
+        payload.append({
+            "run": f"Treatment_{run + 1}",
+            "experiment": experiment,
+            "treatment": str(run + 1),
+            "measuredTimeSeries": series
+        })
+    return payload
+
+def evaluate_payload(runs=4, variables=8, experiment=EXPERIMENT, crop_code="MZ", seed=0):
+    """JSON payload of `/api/evaluate`: one simulated/measured pair per run and variable.
+
+    Args:
+        runs (int): Number of runs (rows of EVALUATE.OUT).
+        variables (int): Number of summary variables.
+        experiment (str): Experiment code.
+        crop_code (str): Two-letter crop code appended to the experiment code.
+        seed (int): Random seed.
+    Returns:
+        dict: {"timeField": ..., "results": [...]}.
+    """
+    rng = np.random.default_rng(seed)
+    codes = variable_codes(variables, SUMMARY_CODES)
+    simulated = np.round(rng.uniform(100, 10000, size=(runs, variables)), 1)
+    measured = np.round(simulated * rng.normal(1, 0.1, size=simulated.shape), 1)
+    missing = rng.random(simulated.shape) < MISSING_SHARE
+    results = []
+    for run in range(runs):
+        result = {
+            "RUN": {"value": run + 1},
+            "EXCODE": {"value": f"{experiment}{crop_code}"},
+            "TRNO": {"value": run + 1}
+        }
+        for i, cde in enumerate(codes):
+            result[cde] = {
+                "type": "combined",
+                "simulated": float(simulated[run, i]),
+                "measured": -99 if missing[run, i] else float(measured[run, i])
+            }
+        results.append(result)
+    return {"timeField": "RUN", "results": results}
+
+def _day_columns(day):
+    """YEAR, DOY, DAS and DAP of a simulated day."""
+    current = START_DATE + timedelta(days=day)
+    return current.year, current.timetuple().tm_yday, day, day
+
+def write_out_file(file_path, runs=4, variables=8, days=120, experiment=EXPERIMENT, seed=0):
+    """Write a PlantGro.OUT-like file.
+
+    Args:
+        file_path (str): Output path.
+        runs (int): Number of runs.
+        variables (int): Number of variable columns.
+        days (int): Rows per run.
+        experiment (str): Experiment code.
+        seed (int): Random seed.
+    Returns:
+        str: The file path.
+    """
+    rng = np.random.default_rng(seed)
+    codes = variable_codes(variables)
+    curves = _growth_curves(rng, runs, variables, days)
+    header = "@YEAR DOY   DAS   DAP" + "".join(f"{cde:>8}" for cde in codes)
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("$PLANT GROWTH ASPECTS OUTPUT FILE\n\n*DSSAT Cropping System Model Ver. 4.8.2.000\n\n")
+        for run in range(runs):
+            f.write(f"*RUN {run + 1:3d}        : SYNTHETIC RUN {run + 1:<14d} MZCER048 {experiment} {run + 1}\n")
+            f.write(" MODEL          : MZCER048 - Maize\n")
+            f.write(f" EXPERIMENT     : {experiment} MZ SYNTHETIC BENCHMARK DATA\n")
+            f.write(f" TREATMENT {run + 1:3d}  : SYNTHETIC RUN {run + 1:<14d} MZCER048\n\n")
+            f.write(header + "\n")
+            rows = curves[run].T
+            for day in range(days):
+                year, doy, das, dap = _day_columns(day)
+                f.write(f" {year:4d} {doy:3d} {das:5d} {dap:5d}" + "".join(f"{v:8.1f}" for v in rows[day]) + "\n")
+            f.write("\n")
+    return file_path
+
+def write_t_file(file_path, runs=4, variables=8, days=120, measured_every=MEASURED_EVERY,
+                 experiment=EXPERIMENT, seed=0):
+    """Write a T-file (e.g. UFGA8201.MZT) with measured values in YYDDD dates.
+
+    Args:
+        file_path (str): Output path.
+        runs (int): Number of treatments.
+        variables (int): Number of variable columns.
+        days (int): Days covered by the measurements.
+        measured_every (int): Days between two measurements.
+        experiment (str): Experiment code.
+        seed (int): Random seed.
+    Returns:
+        str: The file path.
+    """
+    rng = np.random.default_rng(seed)
+    codes = variable_codes(variables)
+    curves = _growth_curves(rng, runs, variables, days)
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(f"*EXP.DATA (T): {experiment}MZ SYNTHETIC BENCHMARK DATA\n\n")
+        f.write("@TRNO DATE" + "".join(f"{cde:>8}" for cde in codes) + "\n")
+        for run in range(runs):
+            for day in range(measured_every - 1, days, measured_every):
+                year, doy, _, _ = _day_columns(day)
+                values = curves[run, :, day] * rng.normal(1, 0.1, size=variables)
+                missing = rng.random(variables) < MISSING_SHARE
+                f.write(f" {run + 1:4d} {year % 100:02d}{doy:03d}"
+                        + "".join("     -99" if m else f"{v:8.1f}" for v, m in zip(values, missing)) + "\n")
+    return file_path
+
+def write_evaluate_file(file_path, runs=4, variables=8, experiment=EXPERIMENT, crop_code="MZ", seed=0):
+    """Write an EVALUATE.OUT-like file with one simulated (S) and measured (M) column per variable.
+
+    Args:
+        file_path (str): Output path.
+        runs (int): Number of rows.
+        variables (int): Number of summary variables.
+        experiment (str): Experiment code.
+        crop_code (str): Two-letter crop code.
+        seed (int): Random seed.
+    Returns:
+        str: The file path.
+    """
+    payload = evaluate_payload(runs, variables, experiment, crop_code, seed)
+    codes = variable_codes(variables, SUMMARY_CODES)
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(f"*EVALUATION : {experiment}{crop_code} SYNTHETIC BENCHMARK DATA\n\n")
+        f.write("@RUN EXCODE     TRNO RN CR" + "".join(f"{cde + 'S':>9}{cde + 'M':>9}" for cde in codes) + "\n")
+        for result in payload["results"]:
+            f.write(f"{result['RUN']['value']:4d} {result['EXCODE']['value']:<10} {result['TRNO']['value']:4d}  0 {crop_code}"
+                    + "".join(f"{result[cde]['simulated']:9.1f}{result[cde]['measured']:9.1f}" for cde in codes) + "\n")
+    return file_path
+
+def write_workspace(root, experiments=4, crops=("Maize",), runs=4, variables=8, days=120, seed=0):
+    """Write a DSSAT-like directory tree with one directory per experiment and crop
+    (root/UFGA8201/Maize) holding a PlantGro.OUT, a T-file and an EVALUATE.OUT.
+
+    Args:
+        root (str): Directory to create the tree in.
+        experiments (int): Number of experiments.
+        crops (tuple): Crop directory names.
+        runs (int): Runs per file.
+        variables (int): Variables per file.
+        days (int): Simulated days per run.
+        seed (int): Random seed.
+    Returns:
+        list: Paths of the written files.
+    """
+    written = []
+    for i in range(experiments):
+        experiment = f"UFGA{8201 + i:04d}"
+        for crop in crops:
+            crop_dir = os.path.join(root, experiment, crop)
+            os.makedirs(crop_dir, exist_ok=True)
+            written.append(write_out_file(os.path.join(crop_dir, "PlantGro.OUT"), runs, variables, days,
+                                          experiment, seed + i))
+            written.append(write_t_file(os.path.join(crop_dir, f"{experiment}.MZT"), runs, variables, days,
+                                        experiment=experiment, seed=seed + i))
+            written.append(write_evaluate_file(os.path.join(crop_dir, "EVALUATE.OUT"), runs, variables,
+                                               experiment, seed=seed + i))
+    return written
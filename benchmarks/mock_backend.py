@@ -0,0 +1,264 @@
+"""Local stand-in for the DSSAT backend service used by `load_file_data`.
+
+Serves `/api/t/{crop}/{file}`, `/api/out/{crop}/{file}`,
+`/api/evaluate/{crop}/{file}` and `/api/sim-vs-obs/{crop}/{file}` with the
+same JSON shapes as the real service. Responses come from fixture files
+(FIXTURES/{endpoint}/{crop}/{file}.json) or from `benchmarks.generators`.
+Latency, jitter, error rate and payload size are configurable, so the
+loading path can be tested and load-tested offline.
+
+Usage:
+    python -m benchmarks.mock_backend --latency 50 --jitter 20 --error-rate 0.05 --size medium
+    python -m benchmarks.mock_backend --fixtures path/to/fixtures --port 3001
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from urllib.parse import urlsplit, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from . import generators
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from benchmarks import generators
+
+# Address the loader requests (see data.data_processor.load_file_data)
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 3000
+# Endpoints served, as in /api/{endpoint}/{crop}/{file}
+ENDPOINTS = ("t", "out", "evaluate", "sim-vs-obs")
+# Serialized responses kept in memory, so generation time does not count as server latency
+PAYLOAD_CACHE_SIZE = 256
+
+class MockBackendServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering the backend endpoints with fixture or synthetic payloads."""
+    daemon_threads = True
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, latency=0.0, jitter=0.0, error_rate=0.0,
+                 runs=4, variables=8, days=120, fixtures=None, fixtures_only=False, seed=0, verbose=False):
+        """Bind the server (call `serve_forever` or use `start` to serve).
+
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port (0 picks a free one).
+            latency (float): Delay added to every response, in seconds.
+            jitter (float): Maximum random delay added on top of the latency, in seconds.
+            error_rate (float): Share of requests answered with HTTP 500 (0 to 1).
+            runs (int): Runs per synthetic payload.
+            variables (int): Variables per synthetic payload.
+            days (int): Simulated days per synthetic run.
+            fixtures (str, optional): Directory of {endpoint}/{crop}/{file}.json fixture files.
+            fixtures_only (bool): Answer 404 instead of generating data when a fixture is missing.
+            seed (int): Seed of the synthetic data and of the injected delays and errors.
+            verbose (bool): Log every request to stderr.
+        """
+        super().__init__((host, port), MockBackendHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.runs = runs
+        self.variables = variables
+        self.days = days
+        self.fixtures = fixtures
+        self.fixtures_only = fixtures_only
+        self.seed = seed
+        self.verbose = verbose
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.payloads = {}
+        self.counts = {"requests": 0, "errors": 0, "not_found": 0, "bytes": 0}
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the server (e.g. http://localhost:3000)."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw_delay_and_error(self):
+        """Pick the delay and decide whether to fail the next response."""
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self.error_rate > 0 and self.random.random() < self.error_rate
+        return delay, failed
+
+    def payload(self, endpoint, crop, file_name):
+        """Return the serialized response of one file, from the fixtures or generated.
+
+        Args:
+            endpoint (str): One of ENDPOINTS.
+            crop (str): Crop directory name (e.g. "Maize").
+            file_name (str): File name (e.g. "PlantGro.OUT").
+        Returns:
+            bytes or None: JSON body, or None if there is no fixture and generation is disabled.
+        """
+        key = (endpoint, crop.lower(), file_name.lower())
+        with self.lock:
+            if key in self.payloads:
+                return self.payloads[key]
+
+        body = None
+        if self.fixtures:
+            fixture_path = os.path.join(self.fixtures, endpoint, crop, f"{file_name}.json")
+            if os.path.isfile(fixture_path):
+                with open(fixture_path, "rb") as f:
+                    body = f.read()
+        if body is None and not self.fixtures_only:
+            body = json.dumps(synthetic_payload(
+                endpoint, crop, file_name, self.runs, self.variables, self.days, self.seed
+            )).encode("utf-8")
+
+        if body is not None:
+            with self.lock:
+                if len(self.payloads) >= PAYLOAD_CACHE_SIZE:
+                    self.payloads.pop(next(iter(self.payloads)))
+                self.payloads[key] = body
+        return body
+
+    def count(self, name, amount=1):
+        """Add to one of the request counters."""
+        with self.lock:
+            self.counts[name] += amount
+
+    def start(self):
+        """Serve in a daemon thread and return the base URL."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+class MockBackendHandler(BaseHTTPRequestHandler):
+    """Request handler of MockBackendServer (keep-alive, so client connection pooling can be measured)."""
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, delayed ACKs add ~40 ms per kept-alive request
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """Answer /api/{endpoint}/{crop}/{file} after the configured delay."""
+        server = self.server
+        server.count("requests")
+        delay, failed = server.draw_delay_and_error()
+        if delay > 0:
+            time.sleep(delay)
+
+        parts = [unquote(part) for part in urlsplit(self.path).path.strip("/").split("/")]
+        if len(parts) != 4 or parts[0] != "api" or parts[1] not in ENDPOINTS:
+            server.count("not_found")
+            self.send_json(404, json.dumps({"error": f"Unknown route: {self.path}"}).encode("utf-8"))
+            return
+        if failed:
+            server.count("errors")
+            self.send_json(500, json.dumps({"error": "Injected failure"}).encode("utf-8"))
+            return
+
+        body = server.payload(parts[1], parts[2], parts[3])
+        if body is None:
+            server.count("not_found")
+            self.send_json(404, json.dumps({"error": f"No fixture for {self.path}"}).encode("utf-8"))
+            return
+        self.send_json(200, body)
+
+    def send_json(self, status, body):
+        """Send a JSON response with its length, so the connection can be reused."""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count("bytes", len(body))
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def synthetic_payload(endpoint, crop, file_name, runs=4, variables=8, days=120, seed=0):
+    """Generate the response of one endpoint; the same file always gets the same data.
+
+    Args:
+        endpoint (str): One of ENDPOINTS.
+        crop (str): Crop directory name.
+        file_name (str): Requested file name.
+        runs (int): Runs (treatments).
+        variables (int): Variables per run.
+        days (int): Simulated days per run.
+        seed (int): Base random seed.
+    Returns:
+        list or dict: JSON-serializable payload.
+    """
+    file_seed = seed + zlib.crc32(f"{crop}/{file_name}".lower().encode("utf-8"))
+    stem = os.path.splitext(file_name)[0].upper()
+    # T-files are named after their experiment (UFGA8201.MZT)
+    experiment = stem[:8] if endpoint == "t" and len(stem) >= 8 else generators.EXPERIMENT
+    if endpoint == "t":
+        return generators.t_payload(runs, variables, days, experiment=experiment, seed=file_seed)
+    if endpoint == "evaluate":
+        return generators.evaluate_payload(runs, variables, experiment, seed=file_seed)
+    return generators.out_payload(runs, variables, days, measured=endpoint == "sim-vs-obs",
+                                  experiment=experiment, seed=file_seed)
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Serve synthetic or fixture DSSAT backend responses locally.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay added to every response, in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random extra delay, in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with HTTP 500 (0-1)")
+    parser.add_argument("--size", choices=sorted(generators.SIZES), default="small",
+                        help="Synthetic payload size preset (default: small)")
+    parser.add_argument("--runs", type=int, help="Runs per payload (overrides --size)")
+    parser.add_argument("--variables", type=int, help="Variables per payload (overrides --size)")
+    parser.add_argument("--days", type=int, help="Simulated days per run (overrides --size)")
+    parser.add_argument("--fixtures", help="Directory of {endpoint}/{crop}/{file}.json fixture files")
+    parser.add_argument("--fixtures-only", action="store_true", help="Answer 404 when a fixture is missing")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+    if not 0 <= args.error_rate <= 1:
+        parser.error("--error-rate must be between 0 and 1")
+
+    size = generators.SIZES[args.size]
+    server = MockBackendServer(
+        args.host, args.port,
+        latency=args.latency / 1000, jitter=args.jitter / 1000, error_rate=args.error_rate,
+        runs=args.runs or size["runs"], variables=args.variables or size["variables"],
+        days=args.days or size["days"],
+        fixtures=args.fixtures, fixtures_only=args.fixtures_only,
+        seed=args.seed, verbose=args.verbose
+    )
+    print(f"Mock backend listening on {server.url} "
+          f"({server.runs} runs x {server.variables} variables x {server.days} days, "
+          f"latency {args.latency:g}+{args.jitter:g} ms, error rate {args.error_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {server.counts['requests']} request(s), {server.counts['errors']} injected error(s), "
+              f"{server.counts['not_found']} not found, {server.counts['bytes']} bytes.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,426 @@
+"""Benchmarks of the load, plot, statistics and export pipeline on synthetic data.
+
+Each benchmark times one stage (backend JSON normalization, run/variable
+extraction, plot data construction, Agg rendering, statistics, exports and
+the raw-file scanners) on data from `benchmarks.generators`, so results are
+reproducible without DSSAT or the backend. Results are written as JSON and
+can be compared against a stored baseline: any benchmark slower than the
+baseline by more than the threshold makes the command exit with status 1.
+
+Usage:
+    python -m benchmarks.run_benchmarks --size medium -o bench.json
+    python -m benchmarks.run_benchmarks --size medium --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --size medium --baseline benchmarks/baseline.json --threshold 0.2
+"""
+import os
+import io
+import sys
+import json
+import time
+import types
+import fnmatch
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+from datetime import datetime
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from . import generators
+    from ..data import data_processor
+    from ..data.data_processor import load_file_data, extract_runs_and_variables
+    from ..data.header_sniffer import sniff_headers
+    from ..data.workspace_index import WorkspaceIndex
+    from ..plots.plotting import (
+        build_plot_data, build_scatter_plot_data, build_evaluate_plot_data,
+        plot_time_series, plot_scatter, plot_evaluate
+    )
+    from ..utils.stats_calculator import calculate_statistics, get_variable_data, statistics_table
+    from ..utils.mapped_text import MappedTextFile
+    from ..export.export_functions import EXPORT_WRITERS
+    from ..export.tidy_export import write_tidy_csv, write_columnar
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from benchmarks import generators
+    from data import data_processor
+    from data.data_processor import load_file_data, extract_runs_and_variables
+    from data.header_sniffer import sniff_headers
+    from data.workspace_index import WorkspaceIndex
+    from plots.plotting import (
+        build_plot_data, build_scatter_plot_data, build_evaluate_plot_data,
+        plot_time_series, plot_scatter, plot_evaluate
+    )
+    from utils.stats_calculator import calculate_statistics, get_variable_data, statistics_table
+    from utils.mapped_text import MappedTextFile
+    from export.export_functions import EXPORT_WRITERS
+    from export.tidy_export import write_tidy_csv, write_columnar
+
+# Experiments in the raw workspace used by the scanner benchmarks
+WORKSPACE_EXPERIMENTS = {"small": 10, "medium": 50, "large": 200}
+# Timed repetitions per benchmark (after one untimed warm-up call)
+DEFAULT_REPEAT = 5
+# Allowed slowdown against the baseline before a benchmark counts as a regression (0.2 = 20%)
+REGRESSION_THRESHOLD = 0.2
+# Slowdowns smaller than this many seconds are timer noise, never regressions
+REGRESSION_MIN_DELTA = 0.001
+# Bump when benchmarks change in a way that makes older results incomparable
+RESULTS_VERSION = 1
+# Paths the loader is pointed at; only their names and crop directory matter
+OUT_PATH = os.path.join("Maize", "PlantGro.OUT")
+T_PATH = os.path.join("Maize", "UFGA8201.MZT")
+EVALUATE_PATH = os.path.join("Maize", "EVALUATE.OUT")
+
+# Registered benchmarks: name -> function taking the fixture
+_BENCHMARKS = {}
+
+def benchmark(name):
+    """Register a benchmark function under a dotted name (e.g. "load.out")."""
+    def register(func):
+        _BENCHMARKS[name] = func
+        return func
+    return register
+
+class _PayloadResponse:
+    """Stand-in for a `requests` response holding a serialized JSON body."""
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.body)
+
+@contextlib.contextmanager
+def serve_payloads(routes):
+    """Answer the loader's backend requests from in-memory JSON bodies.
+
+    Args:
+        routes (dict): Endpoint name ("out", "sim-vs-obs", "t", "evaluate") -> JSON body (bytes).
+    """
+    original = data_processor.requests
+
+    def get(url, *args, **kwargs):
+        endpoint = url.split("/api/", 1)[1].split("/", 1)[0]
+        return _PayloadResponse(routes[endpoint])
+
+    data_processor.requests = types.SimpleNamespace(get=get, RequestException=original.RequestException)
+    try:
+        yield
+    finally:
+        data_processor.requests = original
+
+def _render(plot, plot_data, **kwargs):
+    """Plot on a new Agg figure and draw it."""
+    figure = Figure(figsize=(9, 6), tight_layout=True)
+    canvas = FigureCanvasAgg(figure)
+    plot(figure, plot_data, **kwargs)
+    canvas.draw()
+
+def build_fixture(size, workdir):
+    """Generate the payloads, normalized data, plot data and raw files of one size.
+
+    Args:
+        size (str): Key of generators.SIZES.
+        workdir (str): Directory for the raw files and export outputs.
+    Returns:
+        dict: Everything the benchmarks read.
+    """
+    params = generators.SIZES[size]
+    runs, variables, days = params["runs"], params["variables"], params["days"]
+    routes = {
+        "out": json.dumps(generators.out_payload(runs, variables, days, measured=False)).encode("utf-8"),
+        "sim-vs-obs": json.dumps(generators.out_payload(runs, variables, days)).encode("utf-8"),
+        "t": json.dumps(generators.t_payload(runs, variables, days)).encode("utf-8"),
+        "evaluate": json.dumps(generators.evaluate_payload(runs, variables)).encode("utf-8")
+    }
+    fixture = {"size": size, "params": params, "routes": routes, "workdir": workdir}
+
+    with serve_payloads(routes), contextlib.redirect_stdout(io.StringIO()):
+        fixture["out_data"], _ = load_file_data(OUT_PATH)
+        fixture["t_data"], _ = load_file_data(T_PATH)
+        fixture["evaluate_data"], _ = load_file_data(EVALUATE_PATH)
+        fixture["runs"], fixture["variables"] = extract_runs_and_variables(fixture["out_data"])
+        _, fixture["summary_variables"] = extract_runs_and_variables(fixture["evaluate_data"])
+        codes = generators.variable_codes(variables)
+        fixture["variable"] = codes[1]
+        fixture["scatter_pair"] = (codes[0], codes[1])
+        fixture["time_series"] = build_plot_data(fixture["out_data"], fixture["variable"])
+        fixture["t_series"] = build_plot_data(fixture["t_data"], fixture["variable"])
+        fixture["scatter"] = [
+            d for d in (build_scatter_plot_data(fixture["out_data"], codes[0], codes[1], run) for run in fixture["runs"]) if d
+        ]
+        fixture["evaluate"] = build_evaluate_plot_data(fixture["evaluate_data"], fixture["summary_variables"])
+
+    workspace = os.path.join(workdir, "workspace")
+    fixture["raw_files"] = generators.write_workspace(
+        workspace, WORKSPACE_EXPERIMENTS[size], runs=runs, variables=variables, days=days
+    )
+    fixture["raw_out"] = generators.write_out_file(os.path.join(workdir, "Large.OUT"), runs * 4, variables, days)
+    return fixture
+
+@benchmark("load.out")
+def _load_out(fixture):
+    with serve_payloads(fixture["routes"]):
+        load_file_data(OUT_PATH)
+
+@benchmark("load.t")
+def _load_t(fixture):
+    with serve_payloads(fixture["routes"]):
+        load_file_data(T_PATH)
+
+@benchmark("load.evaluate")
+def _load_evaluate(fixture):
+    with serve_payloads(fixture["routes"]):
+        load_file_data(EVALUATE_PATH)
+
+@benchmark("extract.runs_and_variables")
+def _extract(fixture):
+    extract_runs_and_variables(fixture["out_data"])
+
+@benchmark("build.time_series")
+def _build_time_series(fixture):
+    build_plot_data(fixture["out_data"], fixture["variable"])
+
+@benchmark("build.t_file")
+def _build_t_file(fixture):
+    build_plot_data(fixture["t_data"], fixture["variable"])
+
+@benchmark("build.scatter")
+def _build_scatter(fixture):
+    x_cde, y_cde = fixture["scatter_pair"]
+    for run in fixture["runs"]:
+        build_scatter_plot_data(fixture["out_data"], x_cde, y_cde, run)
+
+@benchmark("build.evaluate")
+def _build_evaluate(fixture):
+    build_evaluate_plot_data(fixture["evaluate_data"], fixture["summary_variables"])
+
+@benchmark("stats.get_variable_data")
+def _stats_variable_data(fixture):
+    for run in fixture["runs"]:
+        get_variable_data(fixture["out_data"], fixture["variable"], run)
+
+@benchmark("stats.calculate_statistics")
+def _stats_calculate(fixture):
+    for run in fixture["runs"]:
+        observed, simulated = get_variable_data(fixture["out_data"], fixture["variable"], run)
+        calculate_statistics(observed, simulated)
+
+@benchmark("stats.statistics_table")
+def _stats_table(fixture):
+    statistics_table(fixture["out_data"], fixture["variables"])
+
+@benchmark("plot.time_series")
+def _plot_time_series(fixture):
+    _render(plot_time_series, fixture["time_series"])
+
+@benchmark("plot.t_file")
+def _plot_t_file(fixture):
+    _render(plot_time_series, fixture["t_series"])
+
+@benchmark("plot.scatter")
+def _plot_scatter(fixture):
+    _render(plot_scatter, fixture["scatter"])
+
+@benchmark("plot.evaluate")
+def _plot_evaluate(fixture):
+    _render(plot_evaluate, fixture["evaluate"])
+
+def _export_benchmark(plot_type, plot_key, file_format):
+    """Register the benchmark of one headless exporter."""
+    name = f"export.{plot_type.replace(' ', '_')}.{file_format}"
+
+    @benchmark(name)
+    def run(fixture):
+        target = os.path.join(fixture["workdir"], f"{name}.{file_format}")
+        EXPORT_WRITERS[(plot_type, file_format)](fixture[plot_key], target)
+    return run
+
+for _plot_type, _plot_key in (("time series", "time_series"), ("scatter plot", "scatter"),
+                              ("evaluate data", "evaluate"), ("t file", "t_series")):
+    for _file_format in ("txt", "xlsx"):
+        _export_benchmark(_plot_type, _plot_key, _file_format)
+
+@benchmark("export.tidy.csv")
+def _export_tidy_csv(fixture):
+    write_tidy_csv(fixture["out_data"], os.path.join(fixture["workdir"], "tidy.csv"))
+
+@benchmark("export.tidy.csv_gz")
+def _export_tidy_csv_gz(fixture):
+    write_tidy_csv(fixture["out_data"], os.path.join(fixture["workdir"], "tidy.csv.gz"))
+
+@benchmark("export.tidy.parquet")
+def _export_parquet(fixture):
+    write_columnar(fixture["out_data"], os.path.join(fixture["workdir"], "tidy.parquet"))
+
+@benchmark("export.tidy.feather")
+def _export_feather(fixture):
+    write_columnar(fixture["out_data"], os.path.join(fixture["workdir"], "tidy.feather"))
+
+@benchmark("raw.sniff_headers")
+def _raw_sniff(fixture):
+    for _ in sniff_headers(fixture["raw_files"]):
+        pass
+
+@benchmark("raw.workspace_index")
+def _raw_index(fixture):
+    db_path = os.path.join(fixture["workdir"], "index.sqlite")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    WorkspaceIndex(db_path).update(os.path.join(fixture["workdir"], "workspace"))
+
+@benchmark("raw.mapped_text")
+def _raw_mapped_text(fixture):
+    with MappedTextFile(fixture["raw_out"]) as mapped_file:
+        mapped_file.find_line_prefix("*RUN")
+        mapped_file.lines(mapped_file.line_count // 2, 60)
+
+def time_benchmark(func, fixture, repeat=DEFAULT_REPEAT):
+    """Time a benchmark after one warm-up call, with its console output discarded.
+
+    Args:
+        func (callable): Registered benchmark function.
+        fixture (dict): Data from `build_fixture`.
+        repeat (int): Timed calls.
+    Returns:
+        dict: "min", "median", "mean" and "stdev" in seconds, plus the raw "times".
+    """
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(fixture)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(fixture)
+            times.append(time.perf_counter() - start)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "times": times
+    }
+
+def run_benchmarks(size="small", repeat=DEFAULT_REPEAT, patterns=None, progress=None):
+    """Run the registered benchmarks on one dataset size.
+
+    Args:
+        size (str): Key of generators.SIZES.
+        repeat (int): Timed calls per benchmark.
+        patterns (list, optional): Shell-style patterns of the benchmark names to run (all if None).
+        progress (callable, optional): Called with (name, result) after each benchmark.
+    Returns:
+        dict: Machine-readable results with the run metadata.
+    """
+    names = [
+        name for name in _BENCHMARKS
+        if not patterns or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="gbuild_bench_") as workdir:
+        fixture = build_fixture(size, workdir)
+        for name in names:
+            try:
+                result = time_benchmark(_BENCHMARKS[name], fixture, repeat)
+            except ImportError as e:
+                # Optional dependency (e.g. pyarrow) not installed
+                result = {"skipped": str(e)}
+            results[name] = result
+            if progress:
+                progress(name, result)
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "size": size,
+        "parameters": generators.SIZES[size],
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+
+def compare_results(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """Compare results against a baseline run on the best (minimum) times.
+
+    Slowdowns under REGRESSION_MIN_DELTA are not counted, so sub-millisecond
+    benchmarks do not fail on timer noise.
+
+    Args:
+        current (dict): Output of `run_benchmarks`.
+        baseline (dict): Stored output of `run_benchmarks`.
+        threshold (float): Allowed relative slowdown.
+    Returns:
+        list: (name, baseline seconds, current seconds, ratio, regressed) for the benchmarks present in both.
+    """
+    if current.get("version") != baseline.get("version") or current.get("size") != baseline.get("size"):
+        raise ValueError(
+            f"Baseline (size {baseline.get('size')}, version {baseline.get('version')}) is not comparable "
+            f"with these results (size {current.get('size')}, version {current.get('version')})."
+        )
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if "min" not in result or not base or "min" not in base:
+            continue
+        ratio = result["min"] / base["min"] if base["min"] > 0 else float("inf")
+        regressed = ratio > 1 + threshold and result["min"] - base["min"] > REGRESSION_MIN_DELTA
+        rows.append((name, base["min"], result["min"], ratio, regressed))
+    return rows
+
+def _print_result(name, result):
+    """Print one benchmark result line."""
+    if "skipped" in result:
+        print(f"{name:<32} skipped ({result['skipped']})")
+    else:
+        print(f"{name:<32} min {result['min'] * 1000:10.2f} ms   median {result['median'] * 1000:10.2f} ms")
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the data, plotting and export pipeline on synthetic data.")
+    parser.add_argument("--size", choices=sorted(generators.SIZES), default="small", help="Dataset size (default: small)")
+    parser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Timed calls per benchmark (default: {DEFAULT_REPEAT})")
+    parser.add_argument("-k", "--filter", action="append",
+                        help="Only run benchmarks matching this pattern (e.g. 'plot.*'), may be repeated")
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this results file and exit with 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help=f"Allowed slowdown against the baseline (default: {REGRESSION_THRESHOLD})")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Also store the results as a baseline")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in _BENCHMARKS:
+            print(name)
+        return 0
+
+    results = run_benchmarks(args.size, args.repeat, args.filter, progress=_print_result)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare_results(results, baseline, args.threshold)
+    print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):")
+    for name, base, current, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:<32} {base * 1000:10.2f} ms -> {current * 1000:10.2f} ms  ({ratio:5.2f}x) {flag}")
+    regressions = sum(1 for row in rows if row[4])
+    print(f"{regressions} regression(s) in {len(rows)} compared benchmark(s).")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
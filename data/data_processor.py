@@ -7,29 +7,46 @@ from datetime import datetime
 try:
     from ..utils.t_files_dictionary import CROP_T_FILE_EXTENSIONS
     from ..utils.settings import get_plot_type
+    from ..utils.profiler import profile_span, profiled
 except ImportError:
     import sys
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from utils.t_files_dictionary import CROP_T_FILE_EXTENSIONS
     from utils.settings import get_plot_type
+    from utils.profiler import profile_span, profiled
 
-def read_experiment_code(file_path):
+def experiment_code_from_line(line):
+    """Return the experiment code of an OUT header line (e.g., " EXPERIMENT : UFGA8201 MZ ..."), or None.
+
+    Args:
+        line (str): One line of the file.
+    Returns:
+        str or None: The 8-character experiment code if the line is an experiment header.
+    """
+    line = line.strip()
+    if line.startswith("EXP.") or "EXPERIMENT" in line.upper():
+        for part in line.split():
+            if len(part) == 8 and part.isalnum():
+                return part.upper()
+    return None
+
+def read_experiment_code(file_path, max_lines=None):
     """Try to read the experiment code from a .OUT file header (e.g., UFGA8201).
     
     Args:
         file_path (str): Path to the .OUT file.
+        max_lines (int, optional): Stop after this many lines (whole file if None).
     Returns:
         str or None: The experiment code if found, else None.
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip() 
-                if line.startswith("EXP.") or "EXPERIMENT" in line.upper():
-                    parts = line.split()
-                    for part in parts:
-                        if len(part) == 8 and part.isalnum():
-                            return part.upper()
+            for line_number, line in enumerate(f):
+                if max_lines is not None and line_number >= max_lines:
+                    break
+                code = experiment_code_from_line(line)
+                if code:
+                    return code
         return None
     except Exception as e:
         print(f"Error reading experiment code: {e}")
@@ -54,6 +71,7 @@ def get_file_type(filename):
     else:
         return "unknown"
 
+@profiled("file load")
 def load_file_data(file_path):
     """Load data from a single file using the API.
     
@@ -76,19 +94,21 @@ def load_file_data(file_path):
             response.raise_for_status()
             data = response.json()
             # Validate that data is a list 
-            normalized_data = []
-            for entry in data:
-                entry["file_type"] = "t"  # Already there
-                values_list = []
-                for cde, ts in entry.get("measuredTimeSeries", {}).items():
-                    values_list.append({
-                        "cde": cde,
-                        "values": [float(v) if v != '-99' and v is not None else None for v in ts.get("values", [])],  # Handle -99 as None
-                        "x_calendar": ts.get("dates", []),  # Keep as strings for now
-                        "type": "measured"
-                    })
-                entry["values"] = values_list
-                normalized_data.append(entry)
+            with profile_span("normalization"):
+                normalized_data = []
+                for entry in data:
+                    entry["file_type"] = "t"  # Already there
+                    entry.setdefault("crop", crop_type)
+                    values_list = []
+                    for cde, ts in entry.get("measuredTimeSeries", {}).items():
+                        values_list.append({
+                            "cde": cde,
+                            "values": [float(v) if v != '-99' and v is not None else None for v in ts.get("values", [])],  # Handle -99 as None
+                            "x_calendar": ts.get("dates", []),  # Keep as strings for now
+                            "type": "measured"
+                        })
+                    entry["values"] = values_list
+                    normalized_data.append(entry)
             print(f"Normalized T data: {normalized_data}")
             return normalized_data, None 
         except requests.RequestException as e:
@@ -103,33 +123,36 @@ def load_file_data(file_path):
             response = requests.get(url)
             response.raise_for_status()
             raw_json = response.json()
-            normalized_data = []
-            for result in raw_json.get("results", []):
-                entry = {
-                    "run": f"Treatment_{result.get('TRNO', {}).get('value', 'Unknown')}",
-                    "experiment": result.get("EXCODE", {}).get("value", "Unknown"),
-                    "file_type": "evaluate",
-                    "values": []
-                }
-                time_field = raw_json.get("timeField")
-                for key, val in result.items():
-                    if key == time_field or not isinstance(val, dict) or val.get("type") != "combined":
-                        continue
-                    if val["simulated"] is not None and val["simulated"] != -99:
-                        entry["values"].append({
-                            "cde": key,
-                            "values": [float(val["simulated"])],
-                            "x_calendar": [],  # Summary, no dates
-                            "type": "simulated"
-                        })
-                    if val["measured"] is not None and val["measured"] != -99:
-                        entry["values"].append({
-                            "cde": key,
-                            "values": [float(val["measured"])],
-                            "x_calendar": [],  # Summary, no dates
-                            "type": "measured"
-                        })
-                normalized_data.append(entry)
+            with profile_span("normalization"):
+                normalized_data = []
+                for result in raw_json.get("results", []):
+                    entry = {
+                        "run": f"Treatment_{result.get('TRNO', {}).get('value', 'Unknown')}",
+                        "experiment": result.get("EXCODE", {}).get("value", "Unknown"),
+                        "treatment": str(result.get('TRNO', {}).get('value', 'Unknown')),
+                        "crop": crop_name,
+                        "file_type": "evaluate",
+                        "values": []
+                    }
+                    time_field = raw_json.get("timeField")
+                    for key, val in result.items():
+                        if key == time_field or not isinstance(val, dict) or val.get("type") != "combined":
+                            continue
+                        if val["simulated"] is not None and val["simulated"] != -99:
+                            entry["values"].append({
+                                "cde": key,
+                                "values": [float(val["simulated"])],
+                                "x_calendar": [],  # Summary, no dates
+                                "type": "simulated"
+                            })
+                        if val["measured"] is not None and val["measured"] != -99:
+                            entry["values"].append({
+                                "cde": key,
+                                "values": [float(val["measured"])],
+                                "x_calendar": [],  # Summary, no dates
+                                "type": "measured"
+                            })
+                    normalized_data.append(entry)
             print(f"Normalized Evaluate data: {normalized_data}")
             return normalized_data, None
         except requests.RequestException as e:
@@ -172,54 +195,57 @@ def load_file_data(file_path):
                     # Fall back to out_data without measured data
 
             # Normalize data
-            for run_entry in out_data:
-                run_name = run_entry.get("run", f"Treatment_{run_entry.get('treatmentNumber', 'Unknown')}")
-                entry = {
-                    "run": run_name,
-                    "experiment": run_entry.get("experiment", experiment),
-                    "file_type": run_entry.get("fileType", "out").lower(),
-                    "values": []
-                }
+            with profile_span("normalization"):
+                for run_entry in out_data:
+                    run_name = run_entry.get("run", f"Treatment_{run_entry.get('treatmentNumber', 'Unknown')}")
+                    entry = {
+                        "run": run_name,
+                        "experiment": run_entry.get("experiment", experiment),
+                        "treatment": str(run_entry.get("treatmentNumber", run_name)),
+                        "crop": crop_name,
+                        "file_type": run_entry.get("fileType", "out").lower(),
+                        "values": []
+                    }
 
-                # Add simulated data (time-series)
-                for cde, sim in run_entry.get("simulated", {}).items():
-                    values = sim.get("values", [])
-                    dates = sim.get("dates", [])
-                    if values:  # Only include if non-empty
-                        entry["values"].append({
-                            "cde": cde,
-                            "values": [float(v) if v is not None and v != -99 and not isinstance(v, str) else None for v in values],
-                            "x_calendar": dates,  # Keep as strings
-                            "type": "simulated"
-                        })
+                    # Add simulated data (time-series)
+                    for cde, sim in run_entry.get("simulated", {}).items():
+                        values = sim.get("values", [])
+                        dates = sim.get("dates", [])
+                        if values:  # Only include if non-empty
+                            entry["values"].append({
+                                "cde": cde,
+                                "values": [float(v) if v is not None and v != -99 and not isinstance(v, str) else None for v in values],
+                                "x_calendar": dates,  # Keep as strings
+                                "type": "simulated"
+                            })
 
-                # Add measured final data (single values)
-                for cde, meas in run_entry.get("measuredFinal", {}).items():
-                    value = meas.get("value")
-                    if value is not None and value != -99:
-                        entry["values"].append({
-                            "cde": cde,
-                            "values": [float(value)],
-                            "x_calendar": [],
-                            "type": "measured"
-                        })
+                    # Add measured final data (single values)
+                    for cde, meas in run_entry.get("measuredFinal", {}).items():
+                        value = meas.get("value")
+                        if value is not None and value != -99:
+                            entry["values"].append({
+                                "cde": cde,
+                                "values": [float(value)],
+                                "x_calendar": [],
+                                "type": "measured"
+                            })
 
-                # Add measured time-series data (full arrays)
-                for cde, ts in run_entry.get("measuredTimeSeries", {}).items():
-                    values = ts.get("values", [])
-                    dates = ts.get("dates", [])
-                    if values:  # Only include if non-empty
-                        entry["values"].append({
-                            "cde": cde,
-                            "values": [float(v) if v is not None and v != '-99' and v != -99 else None for v in values],
-                            "x_calendar": dates,
-                            "type": "measured"
-                        })
+                    # Add measured time-series data (full arrays)
+                    for cde, ts in run_entry.get("measuredTimeSeries", {}).items():
+                        values = ts.get("values", [])
+                        dates = ts.get("dates", [])
+                        if values:  # Only include if non-empty
+                            entry["values"].append({
+                                "cde": cde,
+                                "values": [float(v) if v is not None and v != '-99' and v != -99 else None for v in values],
+                                "x_calendar": dates,
+                                "type": "measured"
+                            })
 
-                if entry["values"]:  # Only append if there are values
-                    enriched_data.append(entry)
-                else:
-                    print(f"Warning: No valid data for run {run_name} in {file_name}")
+                    if entry["values"]:  # Only append if there are values
+                        enriched_data.append(entry)
+                    else:
+                        print(f"Warning: No valid data for run {run_name} in {file_name}")
 
             if not enriched_data:
                 print(f"Error: No valid data processed for {file_name}")
@@ -237,6 +263,7 @@ def load_file_data(file_path):
         return None, f"Unsupported file type: {file_name}"
     
     
+@profiled("load files")
 def load_all_file_data(file_paths):
     """Load data from multiple files and return combined data.
     
@@ -0,0 +1,97 @@
+"""Bulk header sniffing of DSSAT output files.
+
+Reads a bounded prefix of each file (never the whole file) to extract its kind,
+experiment code and the number of runs started in that prefix, across many
+files at once with a thread pool. Results are yielded as they complete.
+"""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from .data_processor import experiment_code_from_line, get_file_type
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from data.data_processor import experiment_code_from_line, get_file_type
+
+# Bytes read from the start of each file
+HEADER_PREFIX_BYTES = 64 * 1024
+# Threads reading headers (the work is I/O bound, so more threads than CPUs help on network shares)
+SNIFF_WORKERS = 16
+
+def sniff_header(file_path, prefix_bytes=HEADER_PREFIX_BYTES):
+    """Extract the kind, experiment code and run count from the start of a file.
+
+    Args:
+        file_path (str): File to sniff.
+        prefix_bytes (int): Maximum number of bytes read.
+    Returns:
+        dict: "path", "kind" (see `get_file_type`), "experiment" (str or None),
+        "runs" (number of *RUN headers in the prefix), "truncated" (True if the
+        file is longer than the prefix, so "runs" is a lower bound) and "error"
+        (None or the error message).
+    """
+    name = os.path.basename(file_path)
+    result = {"path": file_path, "kind": get_file_type(name), "experiment": None,
+              "runs": 0, "truncated": False, "error": None}
+    try:
+        with open(file_path, "rb") as f:
+            prefix = f.read(prefix_bytes + 1)
+    except OSError as e:
+        result["error"] = str(e)
+        return result
+
+    result["truncated"] = len(prefix) > prefix_bytes
+    lines = prefix[:prefix_bytes].decode("latin-1").splitlines()
+    if result["truncated"]:
+        lines = lines[:-1]  # The last line may be cut
+    excode_column = None
+    for line in lines:
+        if line.startswith("*RUN"):
+            result["runs"] += 1
+        if result["experiment"]:
+            continue
+        if line.startswith("@"):
+            columns = line.lstrip("@").split()
+            excode_column = columns.index("EXCODE") if "EXCODE" in columns else None
+        elif excode_column is not None and line.strip():
+            # EVALUATE.OUT rows carry the experiment and crop code (UFGA8201MZ)
+            values = line.split()
+            if len(values) > excode_column:
+                result["experiment"] = values[excode_column][:8].upper()
+        else:
+            result["experiment"] = experiment_code_from_line(line)
+
+    if result["kind"] == "t" and not result["experiment"]:
+        # T-files are named after their experiment (UFGA8201.MZT)
+        result["experiment"] = os.path.splitext(name)[0][:8].upper()
+    return result
+
+def sniff_headers(file_paths, workers=SNIFF_WORKERS, prefix_bytes=HEADER_PREFIX_BYTES):
+    """Sniff many files with a thread pool, yielding each result as soon as it is ready.
+
+    At most 4 * workers files are in flight, so the input can be a lazy iterator
+    (e.g. a directory walk) of any length.
+
+    Args:
+        file_paths (iterable): Files to sniff.
+        workers (int): Number of threads.
+        prefix_bytes (int): Maximum number of bytes read per file.
+    Yields:
+        dict: `sniff_header` results, in completion order.
+    """
+    paths = iter(file_paths)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for path in paths:
+            pending.add(executor.submit(sniff_header, path, prefix_bytes))
+            if len(pending) >= 4 * workers:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.add(executor.submit(sniff_header, next_path, prefix_bytes))
@@ -0,0 +1,376 @@
+"""Searchable SQLite catalog of the DSSAT outputs under a workspace root.
+
+Every OUT, EVALUATE.OUT and T-file is recorded with its crop, experiment code,
+treatments, variable codes, size and mtime. Updates are incremental: only files
+whose size or mtime changed are parsed again.
+
+Usage:
+    python -m data.workspace_index C:\\DSSAT48 --search "crop:maize var:HWAM"
+"""
+import os
+import sys
+import mmap
+import time
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from .data_processor import read_experiment_code, get_file_type
+    from ..utils.t_files_dictionary import CROP_T_FILE_EXTENSIONS
+    from ..utils.profiler import profiled
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from data.data_processor import read_experiment_code, get_file_type
+    from utils.t_files_dictionary import CROP_T_FILE_EXTENSIONS
+    from utils.profiler import profiled
+
+# Default location of the workspace index
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".gbuild", "workspace_index.sqlite")
+# Header lines searched for the experiment code of OUT files
+EXPERIMENT_CODE_LINES = 40
+# Header columns that identify rows rather than hold variables
+ID_COLUMNS = {"RUN", "TRNO", "EXCODE", "CR", "DATE", "YEAR", "DOY", "TNAME"}
+# Files parsed between two commits of the index
+INDEX_COMMIT_FILES = 200
+# Maximum number of search results
+SEARCH_LIMIT = 500
+# Search keys accepted as "key:value" terms
+SEARCH_KEYS = {"exp": "experiment", "experiment": "experiment", "crop": "crop", "var": "variable",
+               "variable": "variable", "kind": "kind", "trt": "treatment", "treatment": "treatment"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE,
+    kind TEXT NOT NULL,
+    crop TEXT COLLATE NOCASE,
+    experiment TEXT COLLATE NOCASE,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS variables (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    cde TEXT NOT NULL COLLATE NOCASE
+);
+CREATE TABLE IF NOT EXISTS treatments (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    treatment TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_root ON files(root);
+CREATE INDEX IF NOT EXISTS files_experiment ON files(experiment);
+CREATE INDEX IF NOT EXISTS files_crop ON files(crop);
+CREATE INDEX IF NOT EXISTS files_name ON files(name);
+CREATE INDEX IF NOT EXISTS variables_cde ON variables(cde, path);
+CREATE INDEX IF NOT EXISTS variables_path ON variables(path);
+CREATE INDEX IF NOT EXISTS treatments_path ON treatments(path);
+"""
+
+def _mapped(file_path):
+    """Return the file contents as a read-only mmap (bytes for empty files)."""
+    with open(file_path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""
+
+def _lines_with_prefix(data, prefix):
+    """Yield the decoded lines of a buffer that start with a byte prefix."""
+    start = 0 if data[:len(prefix)] == prefix else None
+    search_from = 0
+    while True:
+        if start is None:
+            position = data.find(b"\n" + prefix, search_from)
+            if position == -1:
+                return
+            start = position + 1
+        end = data.find(b"\n", start)
+        end = len(data) if end == -1 else end
+        yield data[start:end].decode("latin-1").rstrip("\r")
+        search_from, start = end, None
+
+def _header_columns(line):
+    """Split an "@" header line into its column codes."""
+    return line.lstrip("@").split()
+
+def _variables_from_headers(headers):
+    """Collect the variable codes of a set of header lines."""
+    variables = set()
+    for line in headers:
+        variables.update(code for code in _header_columns(line) if code.upper() not in ID_COLUMNS)
+    return variables
+
+def _table_rows(data):
+    """Yield (header columns, row values) for the "@" tables of a small file."""
+    columns = None
+    for line in data[:].decode("latin-1").splitlines():
+        if line.startswith("@"):
+            columns = _header_columns(line)
+        elif line.startswith("*"):
+            columns = None
+        elif not line.strip() or line.startswith(("!", "$")):
+            continue
+        elif columns:
+            yield columns, line.split()
+
+def scan_file(file_path):
+    """Extract the catalog fields of one output file.
+
+    Args:
+        file_path (str): OUT, EVALUATE.OUT or T-file.
+    Returns:
+        dict: "kind", "crop", "experiment", "treatments" and "variables" (sets of str).
+    """
+    name = os.path.basename(file_path)
+    kind = get_file_type(name)
+    extension = os.path.splitext(name)[1].lower()
+    crop = CROP_T_FILE_EXTENSIONS.get(extension) if kind == "t" else os.path.basename(os.path.dirname(file_path))
+    info = {"kind": kind, "crop": crop, "experiment": None, "treatments": set(), "variables": set()}
+
+    data = _mapped(file_path)
+    try:
+        if kind == "out":
+            info["experiment"] = read_experiment_code(file_path, EXPERIMENT_CODE_LINES)
+            info["variables"] = _variables_from_headers(_lines_with_prefix(data, b"@"))
+            position = data.find(b"TREATMENT")
+            while position != -1:
+                line_start = data.rfind(b"\n", 0, position) + 1
+                line_end = data.find(b"\n", position)
+                parts = data[position:line_end if line_end != -1 else len(data)].split()
+                if not data[line_start:position].strip() and len(parts) > 1 and parts[1].isdigit():
+                    info["treatments"].add(parts[1].decode())
+                position = data.find(b"TREATMENT", position + 1)
+        else:
+            experiments = set()
+            for columns, values in _table_rows(data):
+                row = dict(zip(columns, values))
+                if "TRNO" in row:
+                    info["treatments"].add(row["TRNO"])
+                if "EXCODE" in row:
+                    experiments.add(row["EXCODE"][:8].upper())
+            variables = _variables_from_headers(_lines_with_prefix(data, b"@"))
+            if kind == "evaluate":
+                # Simulated/measured pairs (HWAMS, HWAMM) are catalogued by their common code
+                variables = {v[:-1] for v in variables if v.endswith("S") and v[:-1] + "M" in variables} or variables
+            else:
+                # T-files are named after their experiment (UFGA8201.MZT)
+                experiments.add(os.path.splitext(name)[0][:8].upper())
+            info["variables"] = variables
+            info["experiment"] = ",".join(sorted(experiments)) or None
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    return info
+
+def find_output_files(root):
+    """Yield (path, size, mtime) of every OUT, EVALUATE.OUT and T-file under a directory tree."""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif get_file_type(entry.name) != "unknown":
+                            stat = entry.stat()
+                            yield entry.path, stat.st_size, stat.st_mtime_ns
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def _search_terms(query):
+    """Split a search query into (column, value) terms; bare words match any column."""
+    terms = []
+    for word in query.split():
+        key, _, value = word.partition(":")
+        if value and key.lower() in SEARCH_KEYS:
+            terms.append((SEARCH_KEYS[key.lower()], value))
+        else:
+            terms.append((None, word))
+    return terms
+
+class WorkspaceIndex:
+    """SQLite catalog of DSSAT output files, updated incrementally by mtime."""
+    def __init__(self, db_path=DEFAULT_INDEX_PATH):
+        """Open (and create if needed) the index database.
+
+        Args:
+            db_path (str): SQLite file of the index.
+        """
+        self.db_path = db_path
+        self._update_thread = None
+        self._update_lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection for one operation, committed and closed at the end.
+
+        Connections are not shared between threads; WAL lets searches run during updates.
+        """
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.row_factory = sqlite3.Row
+            yield connection
+            connection.commit()
+        finally:
+            connection.close()
+
+    @profiled("index build")
+    def update(self, root, progress=None):
+        """Bring the index of a directory tree up to date.
+
+        Args:
+            root (str): DSSAT root to walk.
+            progress (callable, optional): Called with (files parsed, path) after each parsed file.
+        Returns:
+            dict: Counts of "added", "updated", "removed" and "unchanged" files.
+        """
+        root = os.path.abspath(root)
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        with self._update_lock, self._connect() as connection:
+            known = {row["path"]: (row["size"], row["mtime"])
+                     for row in connection.execute("SELECT path, size, mtime FROM files WHERE root = ?", (root,))}
+            parsed = 0
+            for path, size, mtime in find_output_files(root):
+                previous = known.pop(path, None)
+                if previous == (size, mtime):
+                    counts["unchanged"] += 1
+                    continue
+                try:
+                    info = scan_file(path)
+                except OSError as e:
+                    print(f"Warning: could not index {path}: {e}")
+                    continue
+                connection.execute("DELETE FROM files WHERE path = ?", (path,))
+                connection.execute(
+                    "INSERT INTO files (path, root, name, kind, crop, experiment, size, mtime) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, root, os.path.basename(path), info["kind"], info["crop"], info["experiment"], size, mtime)
+                )
+                connection.executemany("INSERT INTO variables (path, cde) VALUES (?, ?)",
+                                       [(path, cde) for cde in sorted(info["variables"])])
+                connection.executemany("INSERT INTO treatments (path, treatment) VALUES (?, ?)",
+                                       [(path, trno) for trno in sorted(info["treatments"])])
+                counts["updated" if previous else "added"] += 1
+                parsed += 1
+                if parsed % INDEX_COMMIT_FILES == 0:
+                    connection.commit()
+                if progress:
+                    progress(parsed, path)
+
+            # Files that disappeared since the last update
+            connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in known])
+            counts["removed"] = len(known)
+        return counts
+
+    def start_update(self, root, on_finished=None):
+        """Update the index in a background thread (no-op while an update is running).
+
+        Args:
+            root (str): DSSAT root to walk.
+            on_finished (callable, optional): Called with the update counts.
+        Returns:
+            threading.Thread: The update thread.
+        """
+        if self._update_thread and self._update_thread.is_alive():
+            return self._update_thread
+
+        def run():
+            try:
+                counts = self.update(root)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: could not update the workspace index: {e}")
+                return
+            if on_finished:
+                on_finished(counts)
+
+        self._update_thread = threading.Thread(target=run, name="workspace-index", daemon=True)
+        self._update_thread.start()
+        return self._update_thread
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Find indexed files by experiment, crop, variable, treatment, kind or name.
+
+        Bare words match the start of the experiment code, crop or file name, or a
+        variable code exactly; "exp:", "crop:", "var:", "trt:" and "kind:" restrict a
+        word to one field. All words must match.
+
+        Args:
+            query (str): Search text, e.g. "UFGA8201" or "crop:maize var:HWAM".
+            limit (int): Maximum number of results.
+        Returns:
+            list: Dicts with "path", "name", "kind", "crop", "experiment", "size" and "mtime".
+        """
+        conditions, parameters = [], []
+        for column, value in _search_terms(query):
+            prefix = value.replace("%", "").replace("_", r"\_") + "%"
+            if column == "variable":
+                conditions.append("path IN (SELECT path FROM variables WHERE cde = ?)")
+                parameters.append(value)
+            elif column == "treatment":
+                conditions.append("path IN (SELECT path FROM treatments WHERE treatment = ?)")
+                parameters.append(value)
+            elif column == "kind":
+                conditions.append("kind = ?")
+                parameters.append(value.lower())
+            elif column:
+                conditions.append(f"{column} LIKE ? ESCAPE '\\'")
+                parameters.append(prefix)
+            else:
+                conditions.append(
+                    "(experiment LIKE ? ESCAPE '\\' OR crop LIKE ? ESCAPE '\\' OR name LIKE ? ESCAPE '\\'"
+                    " OR path IN (SELECT path FROM variables WHERE cde = ?))"
+                )
+                parameters += [prefix, prefix, prefix, value]
+        if not conditions:
+            return []
+        sql = ("SELECT path, name, kind, crop, experiment, size, mtime FROM files WHERE "
+               + " AND ".join(conditions) + " ORDER BY experiment, name LIMIT ?")
+        with self._connect() as connection:
+            return [dict(row) for row in connection.execute(sql, parameters + [limit])]
+
+    def file_details(self, path):
+        """Return the indexed variables and treatments of a file.
+
+        Args:
+            path (str): Indexed file path.
+        Returns:
+            dict: "variables" and "treatments" lists (empty if the file is not indexed).
+        """
+        with self._connect() as connection:
+            variables = [row["cde"] for row in connection.execute("SELECT cde FROM variables WHERE path = ? ORDER BY cde", (path,))]
+            treatments = [row["treatment"] for row in connection.execute("SELECT treatment FROM treatments WHERE path = ?", (path,))]
+        return {"variables": variables, "treatments": sorted(treatments, key=lambda t: (len(t), t))}
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Index the DSSAT outputs under a directory and search them.")
+    parser.add_argument("root", help="DSSAT root to index (e.g. C:\\DSSAT48)")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="SQLite index file")
+    parser.add_argument("--search", default=None, help='Search query, e.g. "crop:maize var:HWAM"')
+    args = parser.parse_args(argv)
+
+    index = WorkspaceIndex(args.index)
+    start = time.time()
+    counts = index.update(args.root)
+    print(f"Indexed {args.root} in {time.time() - start:.1f}s: {counts['added']} added, "
+          f"{counts['updated']} updated, {counts['removed']} removed, {counts['unchanged']} unchanged.")
+    if args.search:
+        for result in index.search(args.search):
+            print(f"{result['experiment'] or '-':10} {result['crop'] or '-':12} {result['path']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,173 @@
 # C:\Users\User\Documents\Projetos\interface_Gbuild_refatorada\export\export_functions.py
+import numpy as np
 import pandas as pd
-from PyQt5.QtWidgets import QFileDialog
+import xlsxwriter
 from collections import defaultdict
+from contextlib import nullcontext
 from xlsxwriter.utility import xl_col_to_name
 
-def export_data_to_txt_time_series(plot_data, parent):
-    """ Export time series data to a TXT file with simulated and measured data aligned in separate sections
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from ..utils.profiler import profiled
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.profiler import profiled
+
+# Workbook options for Excel exports: rows are flushed to disk as they are written
+EXCEL_WORKBOOK_OPTIONS = {'constant_memory': True, 'nan_inf_to_errors': True}
+# Excel refuses charts with more series than this
+EXCEL_CHART_MAX_SERIES = 255
+# Rows formatted and written per block by the fixed-width TXT writer
+TXT_CHUNK_ROWS = 5000
+
+def _column_texts(column, blank_missing):
+    """Format one column of a row block as text, with the mask of cells left blank.
 
-    Args: 
+    Args:
+        column (np.ndarray): Column of `df.values` (already upcast to the frame's common dtype).
+        blank_missing (bool): Blank NaN/None cells (True) or only None cells (False).
+    Returns:
+        tuple: (texts as a str array, boolean mask of blank cells).
+    """
+    if column.dtype.kind in 'fiub':
+        # NumPy formats float64 exactly like str() (shortest round-trip repr)
+        texts = column.astype(str)
+        blank = np.isnan(column) if blank_missing and column.dtype.kind == 'f' else np.zeros(len(column), dtype=bool)
+        return texts, blank
+    texts = np.array([str(value) for value in column], dtype=str) if len(column) else np.array([], dtype=str)
+    if blank_missing:
+        blank = pd.isna(column)
+    else:
+        blank = np.fromiter((value is None for value in column), dtype=bool, count=len(column))
+    return texts, blank
+
+def _text_width(series):
+    """Return the length of the longest value of a column written as text ('nan'/'None' included)."""
+    if not len(series):
+        return 0
+    if series.dtype.kind in 'fiub':
+        return int(np.char.str_len(series.to_numpy().astype(str)).max())
+    if series.dtype.kind in 'Mm':
+        # pandas formats whole date columns (e.g. without a time part at midnight)
+        return int(series.astype(str).str.len().max())
+    return max(len(str(value)) for value in series)
+
+def write_fixed_width(file_obj, df, sep, blank_missing=True):
+    """Write a DataFrame as left-justified fixed-width text, a block of rows at a time.
+
+    Column widths are the longest of the header and the column's text. Each
+    column is formatted once with NumPy string operations, and the lines are
+    written TXT_CHUNK_ROWS at a time. Cells come from `df.values`, so a frame
+    with integer and float columns prints its integers as floats, like the
+    former per-row writer.
+
+    Args:
+        file_obj: Text file object to write to.
+        df (pd.DataFrame): Data to write.
+        sep (str): Column separator.
+        blank_missing (bool): Blank NaN/None cells (True) or only None cells (False,
+            NaN is written as "nan").
+    """
+    values = df.values
+    if values.dtype.kind in 'Mm':
+        # Rows of an all-date frame hold Timestamps, not datetime64 values
+        values = df.astype(object).values
+
+    columns, widths = [], []
+    for col_num, col in enumerate(df.columns):
+        texts, blank = _column_texts(values[:, col_num], blank_missing)
+        # The width follows the column's own dtype; reuse the cell text when it is the same
+        if df[col].dtype == values.dtype and len(texts):
+            text_width = int(np.char.str_len(texts).max())
+        else:
+            text_width = _text_width(df[col])
+        width = max(len(str(col)), text_width)
+        columns.append(np.where(blank, " " * width, np.char.ljust(texts, width)) if len(texts) else texts)
+        widths.append(width)
+
+    file_obj.write(sep.join(str(col).ljust(width) for col, width in zip(df.columns, widths)) + "\n")
+    for start in range(0, len(df), TXT_CHUNK_ROWS):
+        block = [column[start:start + TXT_CHUNK_ROWS].tolist() for column in columns]
+        # Joining whole rows in C is much cheaper than growing fixed-width NumPy strings column by column
+        file_obj.write("".join(sep.join(row) + "\n" for row in zip(*block)))
+
+def _excel_formats(workbook):
+    """Create the header and bordered cell formats shared by the Excel exports."""
+    header_format = workbook.add_format({
+        'bold': True, 'bg_color': '#D3D3D3',
+        'border': 1, 'align': 'center'
+    })
+    cell_format = workbook.add_format({'border': 1})
+    return header_format, cell_format
+
+def _column_widths(df):
+    """Return the display width of every column (header or longest value as text)."""
+    return [max(len(str(col)), int(df[col].astype(str).str.len().max()) if len(df) else 0) for col in df.columns]
+
+def _write_sheet(workbook, sheet_name, df, autofit=False):
+    """Write a DataFrame to a new worksheet, one row at a time.
+
+    Every cell is written exactly once together with its border format, in row
+    order, which is what xlsxwriter's constant_memory mode requires. Missing
+    values become formatted blank cells.
+
+    Args:
+        workbook: xlsxwriter Workbook.
+        sheet_name (str): Name of the new worksheet.
+        df (pd.DataFrame): Data to write below a formatted header row.
+        autofit (bool): Size the columns to their content.
+    Returns:
+        Worksheet: The new worksheet.
+    """
+    header_format, cell_format = _excel_formats(workbook)
+    worksheet = workbook.add_worksheet(sheet_name)
+    if autofit:
+        for col_num, width in enumerate(_column_widths(df)):
+            worksheet.set_column(col_num, col_num, width + 2)
+
+    worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+    # Object dtype turns NumPy scalars into Python values; missing values become blank cells
+    values = df.astype(object).where(df.notna(), '').to_numpy().tolist()
+    for row_num, row in enumerate(values, 1):
+        worksheet.write_row(row_num, 0, row, cell_format)
+    return worksheet
+
+def _open_output(target, mode, encoding=None):
+    """Return a context manager for a path or an already open stream (left open).
+
+    Args:
+        target: File path or file object.
+        mode (str): Open mode used for paths.
+        encoding (str, optional): Text encoding used for paths.
+    """
+    if hasattr(target, 'write'):
+        return nullcontext(target)
+    return open(target, mode, encoding=encoding)
+
+def _new_workbook(target):
+    """Create an export workbook on a path or a binary stream (e.g. io.BytesIO)."""
+    if hasattr(target, 'write'):
+        # xlsxwriter assembles streamed workbooks in memory, constant_memory does not apply
+        return xlsxwriter.Workbook(target, dict(EXCEL_WORKBOOK_OPTIONS, in_memory=True))
+    return xlsxwriter.Workbook(target, EXCEL_WORKBOOK_OPTIONS)
+
+def _scatter_series(plot_data):
+    """Return scatter datasets as (x_values, y_values, label) tuples (accepts tuples or plot dicts)."""
+    return [
+        (d.get('x', []), d.get('y', []), d.get('label', 'No label')) if isinstance(d, dict) else tuple(d)
+        for d in plot_data
+    ]
+
+def time_series_frames(plot_data):
+    """Shape time series plot data into the simulated and measured export tables.
+
+    Args:
         plot_data (list): List of datasets containing labels, y-values, and data type (simulated/measured)
-        parent: Parent Widget for the QFileDialog
+    Returns:
+        tuple: (df_sim indexed by day, df_meas indexed by date) DataFrames.
     """
-    # Open file save dialog for TXT file
-    options = QFileDialog.Options()
-    file_path, _ = QFileDialog.getSaveFileName(
-        parent,
-        "Save Time Series to TXT",
-        "",
-        "Text Files (*.txt);;All Files (*)",
-        options=options
-    )
-    if not file_path:
-        return
-    
     # Initialize dictionaries to store simulated and measured data
     simulated_dict = defaultdict(list)
     measured_dict = defaultdict(dict)
@@ -42,156 +187,348 @@ def export_data_to_txt_time_series(plot_data, parent):
                 measured_dict[x][f"{label} (Measured)"] = y
 
     # Build DataFrame for simulated data, indexed by day
-    df_sim = pd.DataFrame({'Day': range(1, max_len + 1)})
+    columns = {'Day': range(1, max_len + 1)}
     for label, y_vals in simulated_dict.items():
-        padded = y_vals + [None] * (max_len - len(y_vals))
-        df_sim[f"{label} (Simulated)"] = padded
+        columns[f"{label} (Simulated)"] = list(y_vals) + [None] * (max_len - len(y_vals))
+    df_sim = pd.DataFrame(columns)
 
     # Build DataFrame for measured data, indexed by date
     df_meas = pd.DataFrame.from_dict(measured_dict, orient='index')
     df_meas.index.name = 'Date'
     df_meas.reset_index(inplace=True)
     df_meas.sort_values(by='Date', inplace=True)
+    return df_sim, df_meas
 
-    def write_aligned(df, file_obj, title):
-        """Write DataFrame to a file with aligned columns
-        
-        Args:
-            df (pd.DataFrame): DataFrame to write.
-            file_obj: File object to write to.
-            title (str): Section title for the output.
-        """
-        file_obj.write(f"=== {title} ===\n")
-        # Calculate width for each column
-        col_widths = {
-            col: max(len(str(col)), df[col].astype(str).map(len).max())
-            for col in df.columns
-        }
-
-        # Write header with aligned column names
-        header_line = "  ".join(str(col).ljust(col_widths[col]) for col in df.columns)
-        file_obj.write(header_line + "\n")
-
-        # Write data rows with aligned values 
-        for _, row in df.iterrows():
-            line = "  ".join(
-                str(row[col]).ljust(col_widths[col]) if pd.notna(row[col]) else " " * col_widths[col]
-                for col in df.columns
-            )
-            file_obj.write(line + "\n")
-
-    # Write both DataFrames to the TXT file
-    with open(file_path, 'w', encoding='utf-8') as f:
-        write_aligned(df_sim, f, "Simulated Time Series")
-        f.write("\n")
-        write_aligned(df_meas, f, "Measured Data Points")
+def scatter_frame(plot_data, index_name='Index'):
+    """Shape scatter plot data into one table with an X and a Y column per dataset.
+
+    Args:
+        plot_data (list): Scatter datasets, (x_values, y_values, label) tuples or plot dicts.
+        index_name (str): Name of the leading 1-based index column.
+    Returns:
+        pd.DataFrame: The export table.
+    """
+    series = _scatter_series(plot_data)
+    max_length = max((len(x_values) for x_values, _, _ in series), default=0)
+    columns = {index_name: range(1, max_length + 1)}
+    for x_values, y_values, label in series:
+        # Fill missing values with None to ensure equal length
+        columns[f'{label} X'] = list(x_values) + [None] * (max_length - len(x_values))
+        columns[f'{label} Y'] = list(y_values)[:max_length] + [None] * (max_length - len(y_values))
+    return pd.DataFrame(columns)
+
+def evaluate_frame(plot_data):
+    """Shape evaluate plot data into one table with simulated and measured columns per dataset.
 
+    Args:
+        plot_data (list): List of datasets containing labels, x-values (simulated), and y-values (measured).
+    Returns:
+        pd.DataFrame: The export table.
+    """
+    max_length = max(len(data.get('x', [])) for data in plot_data) if plot_data else 0
+    if max_length == 0:
+        raise ValueError("No data to export.")
+
+    columns = {'Index': range(1, max_length + 1)}
+    for data in plot_data:
+        label = data.get('label', 'No label')
+        x_vals = list(data.get('x', []))
+        y_vals = list(data.get('y', []))
+        columns[f'{label} Simulated'] = x_vals + [None] * (max_length - len(x_vals))
+        columns[f'{label} Measured'] = y_vals + [None] * (max_length - len(y_vals))
+    return pd.DataFrame(columns)
+
+def tfile_frame(plot_data, use_calendar_mode=True):
+    """Shape T file plot data into one table indexed by date or DAP.
 
+    Args:
+        plot_data (list): List of datasets containing labels, x-values, and y-values.
+        use_calendar_mode (bool): True to use calendar dates, False to use DAP.
+    Returns:
+        pd.DataFrame: The export table, sorted by its first column.
+    """
+    # Determine x-axis key and label based on mode
+    x_key = 'x_calendar' if use_calendar_mode else 'x_dap'
+    x_label = 'Date' if use_calendar_mode else 'DAP'
 
-def export_data_to_excel_time_series(plot_data, parent):
-    """Export time series data to an Excel file with simulated and measured data in 
-    separate sheets, inlcuding line chart.
+    # Build dictionary for DataFrame
+    data_dict = defaultdict(dict)
+    for dataset in plot_data:
+        label = dataset['label']
+        x_vals = dataset.get(x_key)
+        y_vals = dataset.get('y')
+        for x, y in zip(x_vals, y_vals):
+            data_dict[x][label] = y
+
+    # Create and sort DataFrame
+    df = pd.DataFrame.from_dict(data_dict, orient='index')
+    df.index.name = x_label
+    df.sort_index(inplace=True)
+    df.reset_index(inplace=True)
+    return df
+
+@profiled("export")
+def write_time_series_txt(plot_data, target):
+    """Write time series data to a TXT file with simulated and measured data aligned in separate sections.
 
     Args:
-        plot_data (list): List of datasets containing labels, y-values, and data type
-        (simulated/measured) 
-        parent: Parent widget for the QFileDialog
+        plot_data (list): List of datasets containing labels, y-values, and data type (simulated/measured)
+        target: Output path or text stream.
     """
+    df_sim, df_meas = time_series_frames(plot_data)
+    with _open_output(target, 'w', encoding='utf-8') as f:
+        f.write("=== Simulated Time Series ===\n")
+        write_fixed_width(f, df_sim, "  ")
+        f.write("\n")
+        f.write("=== Measured Data Points ===\n")
+        write_fixed_width(f, df_meas, "  ")
 
-    # Open file save dialog for Excel file
-    options = QFileDialog.Options()
-    file_path, _ = QFileDialog.getSaveFileName(
-        parent,
-        "Save Time Series to Excel",
-        "",
-        "Excel Files (*.xlsx);;All Files (*)",
-        options=options
-    )
-    if not file_path:
-        return
+@profiled("export")
+def write_time_series_excel(plot_data, target):
+    """Write time series data to an Excel workbook with Simulated, Measured and Chart sheets.
 
-    # Initialize dictionaries to store simulated and measured data
-    simulated_dict = defaultdict(list)
-    measured_dict = defaultdict(dict)
-    max_len = 0
+    Args:
+        plot_data (list): List of datasets containing labels, y-values, and data type (simulated/measured)
+        target: Output path or binary stream.
+    """
+    df_sim, df_meas = time_series_frames(plot_data)
+    workbook = _new_workbook(target)
+    _write_sheet(workbook, 'Simulated', df_sim)
+    _write_sheet(workbook, 'Measured', df_meas)
+
+    # Create line chart for simulated data
+    chart_sheet = workbook.add_worksheet('Chart')
+    chart = workbook.add_chart({'type': 'line'})
+    added_series = 0
+    for i, col in enumerate(df_sim.columns[1:], 1):  # Skip "Day"
+        col_letter = xl_col_to_name(i)
+        if df_sim[col].count() < 2:
+            continue
+        if added_series == EXCEL_CHART_MAX_SERIES:
+            print(f"Warning: chart limited to the first {EXCEL_CHART_MAX_SERIES} series.")
+            break
+        chart.add_series({
+            'name':       col,
+            'categories': f"Simulated!$A$2:$A${len(df_sim)+1}",
+            'values':     f"Simulated!${col_letter}$2:${col_letter}${len(df_sim)+1}",
+            'line': {'width': 1.5}
+        })
+        added_series += 1
 
-    # Separate data into simulated and measured dictionaries
-    for dataset in plot_data:
-        label = dataset.get('label', 'No label')
-        y_vals = dataset.get('y', [])
-        data_type = dataset.get('type', 'simulated')
-        if data_type == 'simulated':
-            simulated_dict[label] = y_vals
-            max_len = max(max_len, len(y_vals))
-        elif data_type == 'measured':
-            x_vals = dataset.get('x_calendar', [])
-            for x, y in zip(x_vals, y_vals):
-                measured_dict[x][f"{label} (Measured)"] = y
+    if added_series:
+        chart.set_title({'name': 'Simulated Time Series'})
+        chart.set_x_axis({'name': 'Day'})
+        chart.set_y_axis({'name': 'Value'})
+        chart.set_legend({'position': 'top'})
+        chart_sheet.insert_chart('B2', chart, {'x_scale': 2, 'y_scale': 1.5})
+    else:
+        chart_sheet.write('A1', 'No valid simulated series to display.')
+    workbook.close()
 
-    # Create DataFrame for simulated data (indexed by Day)
-    df_sim = pd.DataFrame({'Day': range(1, max_len + 1)})
-    for label, y_vals in simulated_dict.items():
-        padded = y_vals + [None] * (max_len - len(y_vals))
-        df_sim[f"{label} (Simulated)"] = padded
+@profiled("export")
+def write_scatter_txt(plot_data, target):
+    """Write scatter plot data to a TXT file with aligned columns for X and Y values.
 
-    # Create DataFrame for measured data (indexed by Date)
-    df_meas = pd.DataFrame.from_dict(measured_dict, orient='index')
-    df_meas.index.name = 'Date'
-    df_meas.reset_index(inplace=True)
-    df_meas.sort_values(by='Date', inplace=True)
+    Args:
+        plot_data (list): Scatter datasets, (x_values, y_values, label) tuples or plot dicts.
+        target: Output path or text stream.
+    """
+    df = scatter_frame(plot_data, index_name='Day')
+    with _open_output(target, 'w') as f:
+        write_fixed_width(f, df, '\t', blank_missing=False)
+
+@profiled("export")
+def write_scatter_excel(plot_data, target):
+    """Write scatter plot data to an Excel workbook with a combined scatter chart.
 
-    # Write Excel with formatting and chart
-    with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
-        workbook = writer.book
-        header_format = workbook.add_format({
-            'bold': True, 'bg_color': '#D3D3D3',
-            'border': 1, 'align': 'center'
+    Args:
+        plot_data (list): Scatter datasets, (x_values, y_values, label) tuples or plot dicts.
+        target: Output path or binary stream.
+    """
+    series = _scatter_series(plot_data)
+    df = scatter_frame(series)
+    max_length = len(df)
+
+    # Write to Excel with formatting and auto-sized columns
+    workbook = _new_workbook(target)
+    _write_sheet(workbook, 'Data', df, autofit=True)
+
+    # Create single combined chart
+    chart_sheet = workbook.add_worksheet('Charts')
+    chart = workbook.add_chart({'type': 'scatter'})
+
+    for idx, (_, _, label) in enumerate(series[:EXCEL_CHART_MAX_SERIES]):
+        x_col_letter = xl_col_to_name(1 + 2 * idx)  # X columns: 1, 3, 5...
+        y_col_letter = xl_col_to_name(2 + 2 * idx)
+
+        chart.add_series({
+            'name': label,
+            'categories': f"'Data'!${x_col_letter}$2:${x_col_letter}${max_length + 1}",
+            'values': f"'Data'!${y_col_letter}$2:${y_col_letter}${max_length + 1}",
+            'marker': {'type': 'circle', 'size': 6}
         })
-        cell_format = workbook.add_format({'border': 1})
-
-        # Write Simulated sheet
-        df_sim.to_excel(writer, sheet_name='Simulated', index=False, startrow=1)
-        ws_sim = writer.sheets['Simulated']
-        for col_num, col in enumerate(df_sim.columns):
-            ws_sim.write(0, col_num, col, header_format)
-        for row_num, row in df_sim.iterrows():
-            for col_num, val in enumerate(row):
-                ws_sim.write(row_num + 1, col_num, val if pd.notna(val) else '', cell_format)
-
-        # Write Measured data sheet
-        df_meas.to_excel(writer, sheet_name='Measured', index=False, startrow=1)
-        ws_meas = writer.sheets['Measured']
-        for col_num, col in enumerate(df_meas.columns):
-            ws_meas.write(0, col_num, col, header_format)
-        for row_num, row in df_meas.iterrows():
-            for col_num, val in enumerate(row):
-                ws_meas.write(row_num + 1, col_num, val if pd.notna(val) else '', cell_format)
-
-        # Create line chart for simulated data
-        chart_sheet = workbook.add_worksheet('Chart')
-        chart = workbook.add_chart({'type': 'line'})
-        added_series = False
-        for i, col in enumerate(df_sim.columns[1:], 1):  # Skip "Day"
-            col_letter = chr(65 + i)
-            if df_sim[col].count() < 2:
+
+    chart.set_title({'name': 'Scatter Plot - All Runs'})
+    chart.set_x_axis({'name': 'X Variable'})
+    chart.set_y_axis({'name': 'Y Variable'})
+    chart.set_legend({'position': 'top'})
+
+    chart_sheet.insert_chart('B2', chart, {'x_scale': 2, 'y_scale': 1.5})
+    workbook.close()
+
+@profiled("export")
+def write_evaluate_txt(plot_data, target):
+    """Write evaluation data (simulated vs measured) to a TXT file.
+
+    Args:
+        plot_data (list): List of datasets containing labels, x-values (simulated), and y-values (measured).
+        target: Output path or text stream.
+    """
+    with _open_output(target, 'w', encoding='utf-8') as f:
+        f.write("Evaluate Data\n")
+        f.write("Index\tSimulated\tMeasured\tVariable\n")
+        for data in plot_data:
+            label = data.get('label', 'No label')
+            x_values = data.get('x', [])
+            y_values = data.get('y', [])
+            if not x_values or not y_values:
                 continue
-            chart.add_series({
-                'name':       col,
-                'categories': f"Simulated!$A$2:$A${len(df_sim)+1}",
-                'values':     f"Simulated!${col_letter}$2:${col_letter}${len(df_sim)+1}",
-                'line': {'width': 1.5}
-            })
-            added_series = True
-
-        if added_series:
-            chart.set_title({'name': 'Simulated Time Series'})
-            chart.set_x_axis({'name': 'Day'})
-            chart.set_y_axis({'name': 'Value'})
-            chart.set_legend({'position': 'top'})
-            chart_sheet.insert_chart('B2', chart, {'x_scale': 2, 'y_scale': 1.5})
-        else:
-            chart_sheet.write('A1', 'No valid simulated series to display.')
+            f.write(f"{label}\n")
+            f.write("Index\tSimulated\tMeasured\n")
+            for x, y in zip(x_values, y_values):
+                f.write(f"{x}\t{x if x is not None else ''}\t{y if y is not None else ''}\n")
+            f.write("\n")
 
+@profiled("export")
+def write_evaluate_excel(plot_data, target):
+    """Write evaluation data to an Excel workbook with a simulated vs measured scatter chart.
+
+    Args:
+        plot_data (list): List of datasets containing labels, x-values (simulated), and y-values (measured).
+        target: Output path or binary stream.
+    """
+    df = evaluate_frame(plot_data)
+    max_length = len(df)
+
+    # Write Excel file with formatting and chart
+    workbook = _new_workbook(target)
+    _write_sheet(workbook, 'Data', df, autofit=True)
+
+    # Chart
+    chart_sheet = workbook.add_worksheet('Charts')
+    chart = workbook.add_chart({'type': 'scatter'})
+
+    for idx, data in enumerate(plot_data[:EXCEL_CHART_MAX_SERIES]):
+        label = data.get('label', 'No label')
+        x_col_letter = xl_col_to_name(2 * idx + 1)  # Simulated columns: 1, 3, 5...
+        y_col_letter = xl_col_to_name(2 * idx + 2)  # Measured columns: 2, 4, 6...
+
+        chart.add_series({
+            'name': label,
+            'categories': f"'Data'!${x_col_letter}$2:${x_col_letter}${max_length + 1}",
+            'values': f"'Data'!${y_col_letter}$2:${y_col_letter}${max_length + 1}",
+            'marker': {'type': 'circle', 'size': 6}
+        })
+
+    chart.set_title({'name': 'Evaluate Data (Simulated vs Measured)'})
+    chart.set_x_axis({'name': 'Simulated'})
+    chart.set_y_axis({'name': 'Measured'})
+    chart.set_legend({'position': 'top'})
+    chart_sheet.insert_chart('B2', chart, {'x_scale': 2, 'y_scale': 1.5})
+    workbook.close()
+
+@profiled("export")
+def write_tfile_txt(plot_data, target, use_calendar_mode=True):
+    """Write T file data to a TXT file, using either calendar dates or DAP (days after planting).
+
+    Args:
+        plot_data (list): List of datasets containing labels, x-values, and y-values.
+        target: Output path or text stream.
+        use_calendar_mode (bool): True to use calendar dates, False to use DAP.
+    """
+    df = tfile_frame(plot_data, use_calendar_mode)
+    with _open_output(target, 'w') as f:
+        write_fixed_width(f, df, '\t')
+
+@profiled("export")
+def write_tfile_excel(plot_data, target, use_calendar_mode=True):
+    """Write T file data to an Excel workbook with a line chart, using either calendar dates or DAP.
+
+    Args:
+        plot_data (list): List of datasets containing labels, x-values, and y-values.
+        target: Output path or binary stream.
+        use_calendar_mode (bool): True to use calendar dates, False to use DAP.
+    """
+    df = tfile_frame(plot_data, use_calendar_mode)
+    x_label = df.columns[0]
+
+    # Write to Excel with formatting and chart
+    workbook = _new_workbook(target)
+    _write_sheet(workbook, 'Data', df, autofit=True)
+
+    # Create a line chart
+    chart_sheet = workbook.add_worksheet('Charts')
+    chart = workbook.add_chart({'type': 'line'})
+
+    for i, col in enumerate(df.columns[1:EXCEL_CHART_MAX_SERIES + 1], 1):
+        col_letter = xl_col_to_name(i)
+        chart.add_series({
+            'name':       f'=Data!${col_letter}$1',
+            'categories': f'=Data!$A$2:$A${len(df)+1}',
+            'values':     f'=Data!${col_letter}$2:${col_letter}${len(df)+1}',
+            'line': {'width': 1.5}
+        })
+
+    chart.set_title({'name': 'T File Data'})
+    chart.set_x_axis({'name': x_label})
+    chart.set_y_axis({'name': 'Value'})
+    chart.set_legend({'position': 'top'})
+    chart_sheet.insert_chart('B2', chart, {'x_scale': 2, 'y_scale': 1.5})
+    workbook.close()
+
+# Headless writers by (plot type, format), for scripted and batch exports
+EXPORT_WRITERS = {
+    ("time series", "txt"): write_time_series_txt,
+    ("time series", "xlsx"): write_time_series_excel,
+    ("scatter plot", "txt"): write_scatter_txt,
+    ("scatter plot", "xlsx"): write_scatter_excel,
+    ("evaluate data", "txt"): write_evaluate_txt,
+    ("evaluate data", "xlsx"): write_evaluate_excel,
+    ("t file", "txt"): write_tfile_txt,
+    ("t file", "xlsx"): write_tfile_excel
+}
+
+def _ask_save_path(parent, title, file_filter):
+    """Open a save dialog and return the chosen path (empty if cancelled)."""
+    # Imported here so the headless writers can be used without Qt
+    from PyQt5.QtWidgets import QFileDialog
+    options = QFileDialog.Options()
+    file_path, _ = QFileDialog.getSaveFileName(parent, title, "", file_filter, options=options)
+    return file_path
+
+def export_data_to_txt_time_series(plot_data, parent):
+    """ Export time series data to a TXT file with simulated and measured data aligned in separate sections
+
+    Args: 
+        plot_data (list): List of datasets containing labels, y-values, and data type (simulated/measured)
+        parent: Parent Widget for the QFileDialog
+    """
+    file_path = _ask_save_path(parent, "Save Time Series to TXT", "Text Files (*.txt);;All Files (*)")
+    if file_path:
+        write_time_series_txt(plot_data, file_path)
+
+def export_data_to_excel_time_series(plot_data, parent):
+    """Export time series data to an Excel file with simulated and measured data in 
+    separate sheets, inlcuding line chart.
+
+    Args:
+        plot_data (list): List of datasets containing labels, y-values, and data type
+        (simulated/measured) 
+        parent: Parent widget for the QFileDialog
+    """
+    file_path = _ask_save_path(parent, "Save Time Series to Excel", "Excel Files (*.xlsx);;All Files (*)")
+    if file_path:
+        write_time_series_excel(plot_data, file_path)
 
 def export_data_to_txt_scatter(plot_data, parent):
     """Export scatter plot data to a TXT file with aligned columns for X and Y values.
@@ -200,36 +537,10 @@ def export_data_to_txt_scatter(plot_data, parent):
         plot_data (list): List of tuples containing (x_values, y_values, label).
         parent: Parent widget for the QFileDialog.
     """
-    # Open file save dialog for the TXT file
-    options = QFileDialog.Options()
-    file_path, _ = QFileDialog.getSaveFileName(parent, "Save Scatter Plot Data to TXT", "", "Text Files (*.txt);;All Files (*)", options=options)
+    file_path = _ask_save_path(parent, "Save Scatter Plot Data to TXT", "Text Files (*.txt);;All Files (*)")
     if file_path:
-        # Create DataFrame with aligned data
-        max_len = max(len(x) for x, _, _ in plot_data)
-        df = pd.DataFrame({'Day': range(1, max_len + 1)})
-    
-        # Add X and Y values for each dataset
-        for x_values, y_values, label in plot_data:
-            # Fill missing values with None to ensure equal length
-            x_values = list(x_values) + [None] * (max_len - len(x_values))
-            y_values = list(y_values) + [None] * (max_len - len(y_values))
-            df[f'{label} X'] = x_values
-            df[f'{label} Y'] = y_values
-
-        # Align column widths
-        column_widths = {col: max(len(col), df[col].astype(str).map(len).max()) for col in df.columns}
-
-        # Write to TXT file with aligned columns
-        with open(file_path, 'w') as f:
-            header = '\t'.join(col.ljust(column_widths[col]) for col in df.columns)
-            f.write(header + '\n')
-            for _, row in df.iterrows():
-                line = '\t'.join(
-                    str(item).ljust(column_widths[col]) if item is not None else ' ' * column_widths[col]
-                    for col, item in zip(df.columns, row)
-                )
-                f.write(line + '\n')
-                
+        write_scatter_txt(plot_data, file_path)
+
 def export_data_to_excel_scatter(plot_data, parent):
     """Export scatter plot data to an Excel file with a combined scatter chart.
     
@@ -237,92 +548,9 @@ def export_data_to_excel_scatter(plot_data, parent):
         plot_data (list): List of tuples containing (x_values, y_values, label).
         parent: Parent Widget for QFileDialog.
     """
-    # Import required for column letter conversion
-    from string import ascii_uppercase
-
-    # Open file save dialog for Excel file 
-    options = QFileDialog.Options()
-    file_path, _ = QFileDialog.getSaveFileName(
-        parent,
-        "Save Scatter Plot Data & Graph to Excel",
-        "",
-        "Excel Files (*.xlsx);;All Files (*)",
-        options=options
-    )
+    file_path = _ask_save_path(parent, "Save Scatter Plot Data & Graph to Excel", "Excel Files (*.xlsx);;All Files (*)")
     if file_path:
-        # Write to Excel formatting chart 
-        with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
-            workbook = writer.book
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#D3D3D3',
-                'border': 1,
-                'align': 'center'
-            })
-            cell_format = workbook.add_format({'border': 1})
-
-            # Get max data length
-            max_length = max(len(x_values) for x_values, _, _ in plot_data)
-
-            # Create data table
-            df = pd.DataFrame({'Index': range(1, max_length + 1)})
-            for x_values, y_values, label in plot_data:
-                x_series = pd.Series(x_values).reindex(range(max_length))
-                y_series = pd.Series(y_values).reindex(range(max_length))
-                df[f'{label} X'] = x_series
-                df[f'{label} Y'] = y_series
-
-            # Write to Excel
-            df.to_excel(writer, sheet_name='Data', startrow=1, index=False)
-
-            worksheet = writer.sheets['Data']
-
-            # Header formatting
-            for col_num, value in enumerate(df.columns):
-                worksheet.write(0, col_num, value, header_format)
-
-            # Cell formatting
-            for row_num, row in df.iterrows():
-                for col_num, value in enumerate(row):
-                    worksheet.write(row_num + 1, col_num, value if pd.notna(value) else '', cell_format)
-
-            # Column width auto-adjust
-            for col_num, col in enumerate(df.columns):
-                max_len = max(len(str(col)), df[col].astype(str).map(len).max())
-                worksheet.set_column(col_num, col_num, max_len + 2)
-
-            # Create single combined chart
-            chart_sheet = workbook.add_worksheet('Charts')
-            chart = workbook.add_chart({'type': 'scatter'})
-
-            for idx, (_, _, label) in enumerate(plot_data):
-                x_col_idx = 1 + 2 * idx  # X columns: 1, 3, 5...
-                y_col_idx = x_col_idx + 1
-
-                # Convert to Excel letters (supports >26 cols)
-                def col_letter(idx):
-                    letters = ''
-                    while idx >= 0:
-                        letters = chr(65 + (idx % 26)) + letters
-                        idx = idx // 26 - 1
-                    return letters
-
-                x_col_letter = col_letter(x_col_idx)
-                y_col_letter = col_letter(y_col_idx)
-
-                chart.add_series({
-                    'name': label,
-                    'categories': f"'Data'!${x_col_letter}$2:${x_col_letter}${max_length + 1}",
-                    'values': f"'Data'!${y_col_letter}$2:${y_col_letter}${max_length + 1}",
-                    'marker': {'type': 'circle', 'size': 6}
-                })
-
-            chart.set_title({'name': 'Scatter Plot - All Runs'})
-            chart.set_x_axis({'name': 'X Variable'})
-            chart.set_y_axis({'name': 'Y Variable'})
-            chart.set_legend({'position': 'top'})
-
-            chart_sheet.insert_chart('B2', chart, {'x_scale': 2, 'y_scale': 1.5})
+        write_scatter_excel(plot_data, file_path)
 
 def export_data_to_txt_evaluate(plot_data, parent):
     """Export evaluation data (simulated vs measured) to a TXT file
@@ -331,25 +559,9 @@ def export_data_to_txt_evaluate(plot_data, parent):
         plot_data (list): List of datasets containing labels, x-values (simulated), and y-values (measured).
         parent: Parent widget for the QFileDialog.
         """
-    # Open file save dialog for TXT file
-    options = QFileDialog.Options()
-    file_path, _ = QFileDialog.getSaveFileName(parent, "Save Evaluate Data to TXT", "", "Text Files (*.txt);;All Files (*)", options=options)
+    file_path = _ask_save_path(parent, "Save Evaluate Data to TXT", "Text Files (*.txt);;All Files (*)")
     if file_path:
-        # Write evaluation data TXT file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write("Evaluate Data\n")
-            f.write("Index\tSimulated\tMeasured\tVariable\n")
-            for data in plot_data:
-                label = data.get('label', 'No label')
-                x_values = data.get('x', [])
-                y_values = data.get('y', [])
-                if not x_values or not y_values:
-                    continue
-                f.write(f"{label}\n")
-                f.write("Index\tSimulated\tMeasured\n")
-                for x, y in zip(x_values, y_values):
-                    f.write(f"{x}\t{x if x is not None else ''}\t{y if y is not None else ''}\n")
-                f.write("\n")
+        write_evaluate_txt(plot_data, file_path)
 
 def export_data_to_excel_evaluate(plot_data, parent):
     """Export evaluation data to an Excel file with scatter chart comparing simulated vs measured data.
@@ -358,83 +570,9 @@ def export_data_to_excel_evaluate(plot_data, parent):
         plot_data (list): List of datasets containing labels, x-values (simulated), and y-values (measured).
         parent: Parent widget for the QFileDialog
     """
-    # Open file save dialog for Excel file
-    options = QFileDialog.Options()
-    file_path, _ = QFileDialog.getSaveFileName(parent, "Save Evaluate Data & Graph to Excel", "", "Excel Files (*.xlsx);;All Files (*)", options=options)
+    file_path = _ask_save_path(parent, "Save Evaluate Data & Graph to Excel", "Excel Files (*.xlsx);;All Files (*)")
     if file_path:
-        # Write Excel file with formatting and chart
-        with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
-            workbook = writer.book
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#D3D3D3',
-                'border': 1,
-                'align': 'center'
-            })
-            cell_format = workbook.add_format({'border': 1})
-
-            # Prepare data
-            max_length = max(len(data.get('x', [])) for data in plot_data) if plot_data else 0
-            if max_length == 0:
-                raise ValueError("No data to export.")
-
-            df = pd.DataFrame({'Index': range(1, max_length + 1)})
-            for data in plot_data:
-                label = data.get('label', 'No label')
-                x_vals = data.get('x', [None] * max_length)
-                y_vals = data.get('y', [None] * max_length)
-                df[f'{label} Simulated'] = x_vals
-                df[f'{label} Measured'] = y_vals
-
-            # Write DataFrame to Excel
-            df.to_excel(writer, sheet_name='Data', startrow=1, index=False)
-            worksheet = writer.sheets['Data']
-
-            # Headers
-            for col_num, value in enumerate(df.columns):
-                worksheet.write(0, col_num, value, header_format)
-
-            # Data
-            for row_num, row in df.iterrows():
-                for col_num, value in enumerate(row):
-                    worksheet.write(row_num + 1, col_num, value if pd.notna(value) else '', cell_format)
-
-            # Column widths
-            for col_num, col in enumerate(df.columns):
-                max_len = max(len(str(col)), df[col].astype(str).map(len).max())
-                worksheet.set_column(col_num, col_num, max_len + 2)
-
-            # Chart
-            chart_sheet = workbook.add_worksheet('Charts')
-            chart = workbook.add_chart({'type': 'scatter'})
-
-            for idx, data in enumerate(plot_data):
-                label = data.get('label', 'No label')
-                x_col_idx = 2 * idx + 1  # Simulated columns: 1, 3, 5...
-                y_col_idx = x_col_idx + 1  # Measured columns: 2, 4, 6...
-
-                def col_letter(idx):
-                    letters = ''
-                    while idx >= 0:
-                        letters = chr(65 + (idx % 26)) + letters
-                        idx = idx // 26 - 1
-                    return letters
-
-                x_col_letter = col_letter(x_col_idx)
-                y_col_letter = col_letter(y_col_idx)
-
-                chart.add_series({
-                    'name': label,
-                    'categories': f"'Data'!${x_col_letter}$2:${x_col_letter}${max_length + 1}",
-                    'values': f"'Data'!${y_col_letter}$2:${y_col_letter}${max_length + 1}",
-                    'marker': {'type': 'circle', 'size': 6}
-                })
-
-            chart.set_title({'name': 'Evaluate Data (Simulated vs Measured)'})
-            chart.set_x_axis({'name': 'Simulated'})
-            chart.set_y_axis({'name': 'Measured'})
-            chart.set_legend({'position': 'top'})
-            chart_sheet.insert_chart('B2', chart, {'x_scale': 2, 'y_scale': 1.5})
+        write_evaluate_excel(plot_data, file_path)
 
 def export_tfile_to_txt(plot_data, parent, use_calendar_mode=True):
     """Export T file data to a TXT file, using either calendar dates or DAP (days after planting).
@@ -444,42 +582,9 @@ def export_tfile_to_txt(plot_data, parent, use_calendar_mode=True):
         parent: Parent widget for the QFileDialog
         use_calendar_mode (bool): True to use calendar dates, False to use DAP.
     """
-    # Open file save dialog for TXT file
-    options = QFileDialog.Options()
-    file_path, _ = QFileDialog.getSaveFileName(parent, "Save T File Data to TXT", "", "Text Files (*.txt);;All Files (*)", options=options)
-    if not file_path:
-        return
-
-    # Determine x-axis key and label based on mode
-    x_key = 'x_calendar' if use_calendar_mode else 'x_dap'
-    x_label = 'Date' if use_calendar_mode else 'DAP'
-
-    # Build dictionary for DataFrame
-    data_dict = defaultdict(dict)
-    for dataset in plot_data:
-        label = dataset['label']
-        x_vals = dataset.get(x_key)
-        y_vals = dataset.get('y')
-        for x, y in zip(x_vals, y_vals):
-            data_dict[x][label] = y
-
-    # Create and sort DataFrame 
-    df = pd.DataFrame.from_dict(data_dict, orient='index')
-    df.index.name = x_label
-    df.sort_index(inplace=True)
-    df.reset_index(inplace=True)
-
-    # Calculate column widths for alignment 
-    column_widths = {col: max(len(str(col)), df[col].astype(str).map(len).max()) for col in df.columns}
-
-    # Write to TXT file with aligned columns 
-    with open(file_path, 'w') as f:
-        header = '\t'.join(col.ljust(column_widths[col]) for col in df.columns)
-        f.write(header + '\n')
-        for _, row in df.iterrows():
-            line = '\t'.join(str(row[col]).ljust(column_widths[col]) if pd.notnull(row[col]) else ' ' * column_widths[col] for col in df.columns)
-            f.write(line + '\n')
-
+    file_path = _ask_save_path(parent, "Save T File Data to TXT", "Text Files (*.txt);;All Files (*)")
+    if file_path:
+        write_tfile_txt(plot_data, file_path, use_calendar_mode)
 
 def export_tfile_to_excel(plot_data, parent, use_calendar_mode=True):
     """Export T file data to an Excel file with a line chart, using either calendar dates or DAP
@@ -489,76 +594,6 @@ def export_tfile_to_excel(plot_data, parent, use_calendar_mode=True):
         parent: Parent widget for the QFileDialog.
         use_calendar_mode (bool): True to use calendar dates, False to use DAP.
         """
-    # Open save dialog for Excel file 
-    options = QFileDialog.Options()
-    file_path, _ = QFileDialog.getSaveFileName(parent, "Save T File Data to Excel", "", "Excel Files (*.xlsx);;All Files (*)", options=options)
-    if not file_path:
-        return
-
-    # Determine x-axis key and label based on mode
-    x_key = 'x_calendar' if use_calendar_mode else 'x_dap'
-    x_label = 'Date' if use_calendar_mode else 'DAP'
-
-    # Build dictionary for DataFrame 
-    data_dict = defaultdict(dict)
-    for dataset in plot_data:
-        label = dataset['label']
-        x_vals = dataset.get(x_key)
-        y_vals = dataset.get('y')
-        for x, y in zip(x_vals, y_vals):
-            data_dict[x][label] = y
-
-    # Create and Sort DataFrame
-    df = pd.DataFrame.from_dict(data_dict, orient='index')
-    df.index.name = x_label
-    df.sort_index(inplace=True)
-    df.reset_index(inplace=True)
-
-    # Write to Excel with formatting and chart
-    with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
-        df.to_excel(writer, sheet_name='Data', index=False, startrow=1)
-
-        workbook = writer.book
-        worksheet = writer.sheets['Data']
-
-        # Define formats
-        header_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#D3D3D3',
-            'border': 1,
-            'align': 'center'
-        })
-        cell_format = workbook.add_format({'border': 1})
-
-        # Write headers 
-        for col_num, value in enumerate(df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
-
-        # Write data
-        for row_num, row in df.iterrows():
-            for col_num, val in enumerate(row):
-                worksheet.write(row_num + 1, col_num, val if pd.notnull(val) else '', cell_format)
-
-        # Auto-adjust column widths
-        for col_num, col in enumerate(df.columns):
-            max_length = max(len(str(col)), df[col].astype(str).map(len).max())
-            worksheet.set_column(col_num, col_num, max_length + 2)
-
-        # Create a line chart
-        chart_sheet = workbook.add_worksheet('Charts')
-        chart = workbook.add_chart({'type': 'line'})
-
-        for i, col in enumerate(df.columns[1:], 1):
-            col_letter = chr(65 + i)
-            chart.add_series({
-                'name':       f'=Data!${col_letter}$1',
-                'categories': f'=Data!$A$2:$A${len(df)+1}',
-                'values':     f'=Data!${col_letter}$2:${col_letter}${len(df)+1}',
-                'line': {'width': 1.5}
-            })
-
-        chart.set_title({'name': 'T File Data'})
-        chart.set_x_axis({'name': x_label})
-        chart.set_y_axis({'name': 'Value'})
-        chart.set_legend({'position': 'top'})
-        chart_sheet.insert_chart('B2', chart, {'x_scale': 2, 'y_scale': 1.5})
+    file_path = _ask_save_path(parent, "Save T File Data to Excel", "Excel Files (*.xlsx);;All Files (*)")
+    if file_path:
+        write_tfile_excel(plot_data, file_path, use_calendar_mode)
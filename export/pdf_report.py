@@ -0,0 +1,286 @@
+import io
+import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+
+# pypdf is optional: it is only needed to assemble pages rendered by worker processes
+try:
+    from pypdf import PdfReader
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject
+except ImportError:
+    PdfReader = None
+
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from ..plots.plotting import plot_time_series, plot_scatter, plot_evaluate
+    from ..utils.stats_calculator import STATISTICS_COLUMNS, statistics_table
+    from ..utils.profiler import profiled
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from plots.plotting import plot_time_series, plot_scatter, plot_evaluate
+    from utils.stats_calculator import STATISTICS_COLUMNS, statistics_table
+    from utils.profiler import profiled
+
+# Landscape A4 in inches
+PAGE_SIZE = (11.69, 8.27)
+# Number of statistics rows per table page
+STATS_ROWS_PER_PAGE = 25
+# Below this many pages the report is rendered in-process
+PARALLEL_MIN_PAGES = 8
+# Workers are spawned, not forked: the GUI process runs Qt and background threads
+WORKER_START_METHOD = "spawn"
+
+def _dataset_group(dataset, plot_type):
+    """Return the key a dataset is grouped by (its variable, or the X vs Y pair for scatter plots)."""
+    if plot_type == "scatter plot":
+        return dataset.get("label", "No label").split(" (")[0]
+    return dataset.get("variable", dataset.get("label", "No label").split()[0])
+
+def build_report_pages(plot_data, plot_type, data=None, variables_per_page=1, use_calendar_mode=True, metrics=None):
+    """Split plot data into report page specifications.
+
+    Args:
+        plot_data (list): Datasets as shown in the GraphWindow.
+        plot_type (str): "time series", "scatter plot" or "evaluate data".
+        data (list, optional): Raw data used for the statistics pages.
+        variables_per_page (int): Number of variables (or scatter pairs) per graph page.
+        use_calendar_mode (bool): Calendar dates (True) or DAP (False) for time series.
+        metrics (list, optional): Metrics listed on the statistics pages (defaults to STATISTICS_COLUMNS).
+    Returns:
+        list: Page specifications (plain dicts, picklable for worker processes).
+    """
+    groups = {}
+    for dataset in plot_data:
+        groups.setdefault(_dataset_group(dataset, plot_type), []).append(dataset)
+
+    pages = []
+    keys = list(groups)
+    for i in range(0, len(keys), variables_per_page):
+        page_keys = keys[i:i + variables_per_page]
+        pages.append({
+            "kind": "graph",
+            "title": ", ".join(page_keys),
+            "plot_type": plot_type,
+            "plot_data": [d for key in page_keys for d in groups[key]],
+            "use_calendar_mode": use_calendar_mode
+        })
+
+    # Statistics are only meaningful where observed/simulated pairs exist
+    if data and plot_type != "scatter plot":
+        metrics = list(metrics) if metrics else STATISTICS_COLUMNS
+        header = ["Variable Name"] + metrics
+        rows = [
+            [variable] + [str(stats[key]) for key in metrics]
+            for variable, stats in statistics_table(data, keys, metrics=metrics) if stats
+        ]
+        for i in range(0, len(rows), STATS_ROWS_PER_PAGE):
+            pages.append({
+                "kind": "statistics",
+                "title": "Statistical Analysis",
+                "header": header,
+                "rows": rows[i:i + STATS_ROWS_PER_PAGE]
+            })
+    return pages
+
+def draw_report_page(figure, page):
+    """Draw one page specification onto a figure.
+
+    Args:
+        figure: Matplotlib figure sized as a report page.
+        page (dict): Page specification from `build_report_pages`.
+    """
+    if page["kind"] == "statistics":
+        figure.clear()
+        ax = figure.add_subplot(111)
+        ax.axis("off")
+        table = ax.table(cellText=page["rows"], colLabels=page["header"], loc="upper center", cellLoc="center")
+        table.auto_set_font_size(False)
+        table.set_fontsize(7)
+        table.auto_set_column_width(list(range(len(page["header"]))))
+        table.scale(1, 1.3)
+    elif page["plot_type"] == "time series":
+        plot_time_series(figure, page["plot_data"], page["use_calendar_mode"])
+    elif page["plot_type"] == "scatter plot":
+        plot_scatter(figure, page["plot_data"])
+    else:
+        plot_evaluate(figure, page["plot_data"])
+    figure.suptitle(page["title"])
+
+def _new_page_figure():
+    """Create a report-page figure on the base canvas.
+
+    The plotters finish with `figure.canvas.draw()`, which is a no-op on the base
+    canvas, so each page is only rendered once, when it is saved as PDF.
+    """
+    return Figure(figsize=PAGE_SIZE)
+
+def render_page_pdf(page):
+    """Render a page to a single-page PDF (runs in a worker process).
+
+    Args:
+        page (dict): Page specification.
+    Returns:
+        bytes: The page as a standalone PDF document.
+    """
+    figure = _new_page_figure()
+    draw_report_page(figure, page)
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="pdf")
+    return buffer.getvalue()
+
+class _PdfPageStream:
+    """Concatenate single-page PDFs into one file, writing each page's objects as soon as it arrives.
+
+    Only the object offsets and the page object numbers are kept in memory; the
+    page tree, catalog and cross-reference table are written on close.
+    """
+    # Object numbers of the catalog and the page tree (written last)
+    CATALOG = 1
+    PAGES = 2
+
+    def __init__(self, file_path):
+        self.file = open(file_path, "wb")
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.offsets = {}
+        self.page_numbers = []
+        self.next_number = self.PAGES + 1
+
+    def _reserve(self):
+        number = self.next_number
+        self.next_number += 1
+        return number
+
+    def _write_object(self, number, obj):
+        self.offsets[number] = self.file.tell()
+        self.file.write(f"{number} 0 obj\n".encode("ascii"))
+        obj.write_to_stream(self.file)
+        self.file.write(b"\nendobj\n")
+
+    def add_page(self, page_pdf):
+        """Append the page of a single-page PDF and write all the objects it uses.
+
+        Args:
+            page_pdf (bytes): Standalone PDF from `render_page_pdf`.
+        """
+        reader = PdfReader(io.BytesIO(page_pdf))
+        page = reader.pages[0]
+        page_number = self._reserve()
+        numbers = {page.indirect_reference.idnum: page_number}
+        queue = []
+
+        def renumber(obj):
+            """Point the indirect references of an object (in place) at their numbers in the output."""
+            if isinstance(obj, IndirectObject):
+                if obj.idnum not in numbers:
+                    numbers[obj.idnum] = self._reserve()
+                    queue.append(obj)
+                return IndirectObject(numbers[obj.idnum], 0, None)
+            if isinstance(obj, DictionaryObject):
+                for key, value in obj.items():
+                    obj[key] = renumber(value)
+            elif isinstance(obj, ArrayObject):
+                for i, value in enumerate(obj):
+                    obj[i] = renumber(value)
+            return obj
+
+        del page[NameObject("/Parent")]
+        renumber(page)
+        page[NameObject("/Parent")] = IndirectObject(self.PAGES, 0, None)
+        self._write_object(page_number, page)
+        while queue:
+            reference = queue.pop()
+            self._write_object(numbers[reference.idnum], renumber(reference.get_object()))
+        self.page_numbers.append(page_number)
+
+    def close(self):
+        """Write the page tree, catalog and cross-reference table, then close the file."""
+        try:
+            self._write_object(self.PAGES, DictionaryObject({
+                NameObject("/Type"): NameObject("/Pages"),
+                NameObject("/Kids"): ArrayObject(IndirectObject(n, 0, None) for n in self.page_numbers),
+                NameObject("/Count"): NumberObject(len(self.page_numbers))
+            }))
+            self._write_object(self.CATALOG, DictionaryObject({
+                NameObject("/Type"): NameObject("/Catalog"),
+                NameObject("/Pages"): IndirectObject(self.PAGES, 0, None)
+            }))
+            xref_offset = self.file.tell()
+            self.file.write(f"xref\n0 {self.next_number}\n0000000000 65535 f \n".encode("ascii"))
+            for number in range(1, self.next_number):
+                self.file.write(f"{self.offsets[number]:010d} 00000 n \n".encode("ascii"))
+            self.file.write(
+                f"trailer\n<< /Size {self.next_number} /Root {self.CATALOG} 0 R >>\n"
+                f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii")
+            )
+        finally:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _iter_rendered_pages(pages, workers):
+    """Yield rendered pages in order while keeping at most 2 * workers pages in flight."""
+    context = multiprocessing.get_context(WORKER_START_METHOD)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = deque()
+        page_iter = iter(pages)
+        for page in page_iter:
+            pending.append(executor.submit(render_page_pdf, page))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            yield pending.popleft().result()
+            next_page = next(page_iter, None)
+            if next_page is not None:
+                pending.append(executor.submit(render_page_pdf, next_page))
+
+@profiled("export")
+def generate_pdf_report(file_path, plot_data, plot_type, data=None, variables_per_page=1,
+                        use_calendar_mode=True, workers=None, metrics=None):
+    """Write a multi-page PDF report with one page per variable group plus statistics pages.
+
+    Pages are streamed into the PDF one at a time, so memory does not grow with
+    the page count. With a single worker they are drawn in-process; with several
+    (requires pypdf) each page is rendered to a small single-page PDF in a spawned
+    worker process, and its objects are written to the output as soon as it is
+    its turn, then released.
+
+    Args:
+        file_path (str): Output PDF path.
+        plot_data (list): Datasets as shown in the GraphWindow.
+        plot_type (str): "time series", "scatter plot" or "evaluate data".
+        data (list, optional): Raw data used for the statistics pages.
+        variables_per_page (int): Number of variables (or scatter pairs) per graph page.
+        use_calendar_mode (bool): Calendar dates (True) or DAP (False) for time series.
+        workers (int, optional): Worker processes; defaults to the CPU count for large reports.
+        metrics (list, optional): Metrics listed on the statistics pages (defaults to STATISTICS_COLUMNS).
+    Returns:
+        int: Number of pages written.
+    """
+    pages = build_report_pages(plot_data, plot_type.lower(), data, variables_per_page, use_calendar_mode, metrics)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(pages) >= PARALLEL_MIN_PAGES else 1
+    if workers > 1 and PdfReader is None:
+        print("Warning: pypdf is not installed, rendering the report in a single process.")
+        workers = 1
+
+    if workers <= 1:
+        with PdfPages(file_path) as pdf:
+            figure = _new_page_figure()
+            for page in pages:
+                draw_report_page(figure, page)
+                pdf.savefig(figure)
+        return len(pages)
+
+    with _PdfPageStream(file_path) as output:
+        for page_pdf in _iter_rendered_pages(pages, workers):
+            output.add_page(page_pdf)
+    return len(pages)
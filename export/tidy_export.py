@@ -0,0 +1,274 @@
+import csv
+import gzip
+import io
+import os
+import sys
+from contextlib import nullcontext
+
+import numpy as np
+
+# pyarrow is optional: it is only needed for the Parquet and Feather exports
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from ..utils.stats_calculator import parse_dates
+    from ..utils.profiler import profiled
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.stats_calculator import parse_dates
+    from utils.profiler import profiled
+
+# Columns of the long (tidy) dataset export, one row per value
+TIDY_COLUMNS = ("experiment", "run", "cde", "type", "date", "dap", "value")
+# Rows buffered before a row group (Parquet) or record batch (Feather) is written
+TIDY_ROW_GROUP_ROWS = 131072
+# Columnar formats by file extension
+COLUMNAR_FORMATS = {".parquet": "parquet", ".pq": "parquet", ".feather": "feather", ".arrow": "feather"}
+# gzip level for compressed CSV exports (9 is barely smaller and several times slower)
+CSV_GZIP_LEVEL = 6
+
+def _entry_series(entry):
+    """Yield (cde, type, dates, values) for every series of a normalized data entry."""
+    values = entry.get("values")
+    if isinstance(values, dict):
+        # Older evaluate format: {cde: {"measured": value, "simulated": value}}
+        for cde, value_dict in values.items():
+            for data_type in ("measured", "simulated"):
+                value = value_dict.get(data_type) if isinstance(value_dict, dict) else None
+                if value is not None:
+                    yield cde, data_type, [], [value]
+    elif isinstance(values, list):
+        for series in values:
+            if isinstance(series, dict) and series.get("cde") and series.get("values"):
+                yield series["cde"], series.get("type", "simulated"), series.get("x_calendar") or [], series["values"]
+
+def _series_dates(dates, n):
+    """Parse a series' dates as datetime64[D], padded with NaT to the number of values."""
+    parsed = parse_dates(list(dates[:n])) if len(dates) else np.empty(0, dtype="datetime64[D]")
+    if len(parsed) < n:
+        parsed = np.concatenate([parsed, np.full(n - len(parsed), np.datetime64("NaT"), dtype="datetime64[D]")])
+    return parsed
+
+def iter_tidy_chunks(data):
+    """Yield the dataset in long format, one chunk of columns per run entry.
+
+    DAP is counted from the run's planting date (the PDAT series if present,
+    otherwise its earliest date), as in `plots.plotting.build_plot_data`.
+
+    Args:
+        data (list): Normalized data entries (as returned by `load_all_file_data`).
+    Yields:
+        dict: "experiment" and "run" (str) plus the "cde", "type" (str arrays),
+        "date" (datetime64[D], NaT if undated), "dap" (float, NaN if unknown)
+        and "value" (float, NaN if missing) columns.
+    """
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        series = list(_entry_series(entry))
+        if not series:
+            continue
+
+        names, types, dates, values = [], [], [], []
+        planting_dates = []
+        for cde, data_type, x_calendar, y_values in series:
+            series_dates = _series_dates(x_calendar, len(y_values))
+            names.append(cde)
+            types.append(data_type)
+            dates.append(series_dates)
+            values.append(np.array([np.nan if v is None else v for v in y_values], dtype=float))
+            if cde.upper() == "PDAT":
+                planting_dates.append(series_dates)
+
+        lengths = [len(v) for v in values]
+        date = np.concatenate(dates)
+        candidates = np.concatenate(planting_dates) if planting_dates else date
+        candidates = candidates[~np.isnat(candidates)]
+        if len(candidates):
+            dap = (date - candidates.min()).astype(float)
+            dap[np.isnat(date)] = np.nan
+        else:
+            dap = np.full(len(date), np.nan)
+
+        yield {
+            "experiment": str(entry.get("experiment", "Unknown")),
+            "run": str(entry.get("run", "Unknown")),
+            "cde": np.repeat(np.array(names, dtype=str), lengths),
+            "type": np.repeat(np.array(types, dtype=str), lengths),
+            "date": date,
+            "dap": dap,
+            "value": np.concatenate(values)
+        }
+
+def tidy_categories(data):
+    """Collect the sorted distinct experiments, runs, CDEs and types of a dataset (values are not read).
+
+    Args:
+        data (list): Normalized data entries.
+    Returns:
+        dict: Column name -> sorted list of labels.
+    """
+    found = {"experiment": set(), "run": set(), "cde": set(), "type": set()}
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        for cde, data_type, _, _ in _entry_series(entry):
+            found["experiment"].add(str(entry.get("experiment", "Unknown")))
+            found["run"].add(str(entry.get("run", "Unknown")))
+            found["cde"].add(cde)
+            found["type"].add(data_type)
+    return {column: sorted(labels) for column, labels in found.items()}
+
+def tidy_schema():
+    """Arrow schema of the columnar export (dictionary-encoded labels, typed dates)."""
+    label = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("experiment", label),
+        ("run", label),
+        ("cde", label),
+        ("type", label),
+        ("date", pa.date32()),
+        ("dap", pa.int32()),
+        ("value", pa.float64())
+    ])
+
+def _record_batch(chunks, dictionaries, schema):
+    """Combine buffered chunks into one Arrow record batch with shared dictionaries."""
+    columns = []
+    for name in ("experiment", "run", "cde", "type"):
+        labels, dictionary = dictionaries[name]
+        if name in ("experiment", "run"):
+            indices = np.concatenate([
+                np.full(len(chunk["value"]), np.searchsorted(labels, chunk[name]), dtype=np.int32) for chunk in chunks
+            ])
+        else:
+            indices = np.searchsorted(labels, np.concatenate([chunk[name] for chunk in chunks])).astype(np.int32)
+        columns.append(pa.DictionaryArray.from_arrays(pa.array(indices), dictionary))
+
+    date = np.concatenate([chunk["date"] for chunk in chunks])
+    dap = np.concatenate([chunk["dap"] for chunk in chunks])
+    value = np.concatenate([chunk["value"] for chunk in chunks])
+    dap_missing = np.isnan(dap)
+    columns.append(pa.array(date, type=pa.date32(), mask=np.isnat(date)))
+    columns.append(pa.array(np.where(dap_missing, 0, dap).astype(np.int32), mask=dap_missing))
+    columns.append(pa.array(value, mask=np.isnan(value)))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+@profiled("export")
+def write_columnar(data, target, file_format=None, compression=None, row_group_rows=TIDY_ROW_GROUP_ROWS):
+    """Export the whole dataset in long format to Parquet or Feather (Arrow IPC).
+
+    Runs, CDEs, experiments and types are dictionary-encoded with one dictionary
+    for the whole file, dates are stored as date32 and DAP as int32. Rows are
+    buffered and written in row groups of about `row_group_rows`, so memory does
+    not grow with the size of the output.
+
+    Args:
+        data (list): Normalized data entries.
+        target: Output path or binary stream.
+        file_format (str, optional): "parquet" or "feather"; inferred from the path extension if None.
+        compression (str, optional): Codec; defaults to "snappy" for Parquet and none for
+            Feather, so Feather files can be memory-mapped and read without copies.
+        row_group_rows (int): Target number of rows per row group / record batch.
+    Returns:
+        int: Number of rows written.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet and Feather exports.")
+    if file_format is None:
+        extension = os.path.splitext(str(target))[1].lower()
+        if extension not in COLUMNAR_FORMATS:
+            raise ValueError(f"Cannot infer the export format from {target!r}; use .parquet or .feather.")
+        file_format = COLUMNAR_FORMATS[extension]
+    if file_format not in ("parquet", "feather"):
+        raise ValueError(f"Unsupported columnar format: {file_format}")
+
+    schema = tidy_schema()
+    dictionaries = {
+        column: (np.array(labels, dtype=str), pa.array(labels, type=pa.string()))
+        for column, labels in tidy_categories(data).items()
+    }
+
+    if file_format == "parquet":
+        writer = pq.ParquetWriter(target, schema, compression=compression or "snappy")
+    else:
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        writer = pa.ipc.new_file(target, schema, options=options)
+
+    rows = 0
+    with writer:
+        buffered, buffered_rows = [], 0
+        for chunk in iter_tidy_chunks(data):
+            buffered.append(chunk)
+            buffered_rows += len(chunk["value"])
+            if buffered_rows >= row_group_rows:
+                writer.write_batch(_record_batch(buffered, dictionaries, schema))
+                rows += buffered_rows
+                buffered, buffered_rows = [], 0
+        if buffered:
+            writer.write_batch(_record_batch(buffered, dictionaries, schema))
+            rows += buffered_rows
+    return rows
+
+def iter_tidy_csv_rows(data):
+    """Yield the dataset as CSV rows (experiment, run, cde, type, date, dap, value), run by run.
+
+    Missing dates, DAPs and values are written as empty fields.
+
+    Args:
+        data (list): Normalized data entries.
+    Yields:
+        list: Rows of one run entry.
+    """
+    for chunk in iter_tidy_chunks(data):
+        n = len(chunk["value"])
+        dates = np.datetime_as_string(chunk["date"], unit="D").tolist()
+        dates = ["" if d == "NaT" else d for d in dates]
+        daps = [None if d != d else int(d) for d in chunk["dap"].tolist()]
+        values = [None if v != v else v for v in chunk["value"].tolist()]
+        yield list(zip(
+            [chunk["experiment"]] * n, [chunk["run"]] * n,
+            chunk["cde"].tolist(), chunk["type"].tolist(),
+            dates, daps, values
+        ))
+
+def _open_csv_output(target, compress):
+    """Open a CSV text output on a path or stream, gzip-compressed if requested."""
+    if hasattr(target, "write"):
+        if not compress:
+            return nullcontext(target)
+        # Compressed output goes to a binary stream, which is left open
+        return io.TextIOWrapper(gzip.GzipFile(fileobj=target, mode="wb", compresslevel=CSV_GZIP_LEVEL), encoding="utf-8", newline="")
+    if compress:
+        return gzip.open(target, "wt", compresslevel=CSV_GZIP_LEVEL, encoding="utf-8", newline="")
+    return open(target, "w", encoding="utf-8", newline="")
+
+@profiled("export")
+def write_tidy_csv(data, target, compress=None):
+    """Stream the whole dataset to a long-format CSV, one run at a time.
+
+    Only one run is held in memory as rows at any time, so the output size is
+    not limited by RAM.
+
+    Args:
+        data (list): Normalized data entries.
+        target: Output path, text stream, or binary stream when compressing.
+        compress (bool, optional): gzip the output; inferred from a ".gz" path extension if None.
+    Returns:
+        int: Number of data rows written.
+    """
+    if compress is None:
+        compress = not hasattr(target, "write") and str(target).lower().endswith(".gz")
+    rows = 0
+    with _open_csv_output(target, compress) as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(TIDY_COLUMNS)
+        for run_rows in iter_tidy_csv_rows(data):
+            writer.writerows(run_rows)
+            rows += len(run_rows)
+    return rows
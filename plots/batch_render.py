@@ -0,0 +1,304 @@
+"""Headless batch rendering of DSSAT output figures.
+
+Walks a DSSAT directory tree and renders one figure per variable of every
+OUT, EVALUATE.OUT and T-file it finds, using the same `build_*_plot_data`
+and `plot_*` functions as the GUI on the Agg backend (no Qt import).
+
+Usage:
+    python -m plots.batch_render C:\\DSSAT48\\Maize -o figures --format png --format pdf
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from .plotting import (
+        build_plot_data, build_scatter_plot_data, build_evaluate_plot_data,
+        plot_time_series, plot_scatter, plot_evaluate
+    )
+    from ..data.data_processor import load_file_data, extract_runs_and_variables, get_file_type, experiment_code_from_line
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from plots.plotting import (
+        build_plot_data, build_scatter_plot_data, build_evaluate_plot_data,
+        plot_time_series, plot_scatter, plot_evaluate
+    )
+    from data.data_processor import load_file_data, extract_runs_and_variables, get_file_type, experiment_code_from_line
+
+# Bump when the rendering output changes so cached figures are redrawn
+RENDER_VERSION = 1
+MANIFEST_NAME = ".batch_render_manifest.json"
+# Date/time columns that are axes rather than variables
+SKIPPED_VARIABLES = {"DATE", "YEAR", "DOY", "DAP", "DAS"}
+# OUT files loaded through the sim-vs-obs endpoint, which merges the measured data of the experiment's T-file
+SIM_VS_OBS_FILES = {"plantgro.out", "plantn.out", "soilwat.out"}
+
+def find_input_files(root):
+    """Return every OUT, EVALUATE.OUT and T-file under a directory tree, sorted.
+
+    Args:
+        root (str): DSSAT directory to walk.
+    Returns:
+        list: Absolute file paths.
+    """
+    found = []
+    for dir_path, _, file_names in os.walk(root):
+        for file_name in file_names:
+            if get_file_type(file_name) != "unknown":
+                found.append(os.path.abspath(os.path.join(dir_path, file_name)))
+    return sorted(found)
+
+def measured_inputs(file_path):
+    """Return the T-files whose measured data the figures of an OUT file include.
+
+    The sim-vs-obs endpoint looks the T-files up in the same directory by
+    experiment code (UFGA8201 -> UFGA8201.MZT). If the OUT file names no
+    experiment, every T-file of the directory is returned.
+
+    Args:
+        file_path (str): Input file path.
+    Returns:
+        list: Absolute T-file paths, sorted (empty for files without measured data).
+    """
+    if os.path.basename(file_path).lower() not in SIM_VS_OBS_FILES:
+        return []
+    experiments = set()
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                code = experiment_code_from_line(line)
+                if code:
+                    experiments.add(code)
+    except OSError as e:
+        print(f"Warning: could not read the experiments of {file_path}: {e}")
+    directory = os.path.dirname(os.path.abspath(file_path))
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if get_file_type(name) == "t" and (not experiments or os.path.splitext(name)[0].upper() in experiments)
+    )
+
+def input_signature(file_path, options):
+    """Hash the file identity (size, mtime) and that of its measured T-files together with the render options.
+
+    Args:
+        file_path (str): Input file path.
+        options (dict): Render options that affect the output.
+    Returns:
+        str: Hex digest that changes whenever the figures would change.
+    """
+    identities = []
+    for path in [os.path.abspath(file_path)] + measured_inputs(file_path):
+        stat = os.stat(path)
+        identities.append([path, stat.st_size, stat.st_mtime_ns])
+    payload = json.dumps([identities, options, RENDER_VERSION], sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def _safe_name(name):
+    """Make a variable or pair name usable as a file name."""
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+def _save_figure(figure, base_path, formats, dpi):
+    """Save a figure in every requested format and return the written paths."""
+    written = []
+    for fmt in formats:
+        path = f"{base_path}.{fmt}"
+        figure.savefig(path, format=fmt, dpi=dpi)
+        written.append(path)
+    return written
+
+def _new_figure():
+    """Create a figure bound to an Agg canvas."""
+    figure = Figure(figsize=(9, 6), tight_layout=True)
+    FigureCanvasAgg(figure)
+    return figure
+
+def render_file(file_path, out_dir, options):
+    """Load one file and render all of its figures.
+
+    Args:
+        file_path (str): OUT, EVALUATE.OUT or T-file to render.
+        out_dir (str): Directory the figures are written to.
+        options (dict): "formats", "dpi", "use_calendar", "scatter" (list of
+            (x_cde, y_cde) pairs) and "verbose".
+    Returns:
+        tuple: (outputs, error_message) where outputs is a list of written paths.
+    """
+    # The loaders and plotters are chatty; keep worker output readable
+    log = contextlib.nullcontext() if options.get("verbose") else contextlib.redirect_stdout(io.StringIO())
+    with log:
+        data, error = load_file_data(file_path)
+        if error or not data:
+            return [], error or f"No data loaded from {file_path}"
+
+        os.makedirs(out_dir, exist_ok=True)
+        formats, dpi = options["formats"], options["dpi"]
+        file_type = get_file_type(os.path.basename(file_path))
+        _, variables = extract_runs_and_variables(data)
+        variables = [v for v in variables if v.upper() not in SKIPPED_VARIABLES]
+        outputs = []
+        figure = _new_figure()
+
+        if file_type == "evaluate":
+            for cde in variables:
+                plot_data = build_evaluate_plot_data(data, [cde])
+                if not plot_data:
+                    continue
+                plot_evaluate(figure, plot_data)
+                outputs += _save_figure(figure, os.path.join(out_dir, f"evaluate_{_safe_name(cde)}"), formats, dpi)
+            return outputs, None
+
+        for cde in variables:
+            plot_data = build_plot_data(data, cde, use_calendar=options["use_calendar"])
+            if not plot_data:
+                continue
+            plot_time_series(figure, plot_data, options["use_calendar"])
+            outputs += _save_figure(figure, os.path.join(out_dir, f"timeseries_{_safe_name(cde)}"), formats, dpi)
+
+        runs, _ = extract_runs_and_variables(data)
+        for x_cde, y_cde in options.get("scatter", []):
+            plot_data = [d for d in (build_scatter_plot_data(data, x_cde, y_cde, run) for run in runs) if d]
+            if not plot_data:
+                continue
+            plot_scatter(figure, plot_data)
+            name = _safe_name(f"{x_cde}_vs_{y_cde}")
+            outputs += _save_figure(figure, os.path.join(out_dir, f"scatter_{name}"), formats, dpi)
+        return outputs, None
+
+def _render_task(file_path, out_dir, options):
+    """Process pool entry point: never raise, report errors as values."""
+    try:
+        return render_file(file_path, out_dir, options)
+    except Exception as e:
+        return [], f"Error rendering {file_path}: {e}"
+
+def load_manifest(out_root):
+    """Load the render manifest ({file_path: {"signature", "outputs"}}) or an empty one."""
+    path = os.path.join(out_root, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(out_root, manifest):
+    """Write the render manifest atomically."""
+    path = os.path.join(out_root, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def batch_render(root, out_root, formats=("png",), dpi=150, use_calendar=True, scatter=(), workers=None, force=False, verbose=False):
+    """Render figures for every supported file under `root` across a process pool.
+
+    Files whose size, mtime, measured T-files and render options are unchanged
+    since the last run (and whose figures still exist) are skipped.
+
+    Args:
+        root (str): DSSAT directory tree to scan.
+        out_root (str): Output directory; figures go to <out_root>/<relative dir>/<file name>/.
+        formats (tuple): Output formats understood by matplotlib ("png", "svg", "pdf").
+        dpi (int): Resolution for raster formats.
+        use_calendar (bool): Calendar dates (True) or DAP (False) for time series.
+        scatter (tuple): (x_cde, y_cde) pairs rendered as scatter plots for OUT/T files.
+        workers (int, optional): Number of worker processes (defaults to the CPU count).
+        force (bool): Re-render even if the inputs are unchanged.
+        verbose (bool): Show loader/plotter output.
+    Returns:
+        dict: Counts of "rendered", "skipped" and "failed" files and "figures" written.
+    """
+    options = {
+        "formats": list(formats),
+        "dpi": dpi,
+        "use_calendar": use_calendar,
+        "scatter": [list(pair) for pair in scatter],
+        "verbose": verbose
+    }
+    signature_options = {k: v for k, v in options.items() if k != "verbose"}
+    os.makedirs(out_root, exist_ok=True)
+    manifest = load_manifest(out_root)
+    summary = {"rendered": 0, "skipped": 0, "failed": 0, "figures": 0}
+
+    tasks = {}
+    for file_path in find_input_files(root):
+        signature = input_signature(file_path, signature_options)
+        previous = manifest.get(file_path)
+        if (not force and previous and previous.get("signature") == signature
+                and all(os.path.exists(p) for p in previous.get("outputs", []))):
+            summary["skipped"] += 1
+            continue
+        relative_dir = os.path.relpath(os.path.dirname(file_path), root)
+        out_dir = os.path.normpath(os.path.join(out_root, relative_dir, _safe_name(os.path.basename(file_path))))
+        tasks[file_path] = (signature, out_dir)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_render_task, file_path, out_dir, options): file_path
+            for file_path, (_, out_dir) in tasks.items()
+        }
+        for future in as_completed(futures):
+            file_path = futures[future]
+            outputs, error = future.result()
+            if error:
+                print(error)
+                summary["failed"] += 1
+                manifest.pop(file_path, None)
+                continue
+            manifest[file_path] = {"signature": tasks[file_path][0], "outputs": outputs}
+            summary["rendered"] += 1
+            summary["figures"] += len(outputs)
+            print(f"Rendered {len(outputs)} figure(s) for {file_path}")
+
+    save_manifest(out_root, manifest)
+    return summary
+
+def _parse_scatter_pair(value):
+    """argparse type for X:Y scatter pairs."""
+    if ":" not in value:
+        raise argparse.ArgumentTypeError(f"Expected X:Y, got {value!r}")
+    x_cde, y_cde = value.split(":", 1)
+    return x_cde.strip().upper(), y_cde.strip().upper()
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Render DSSAT output figures without the GUI.")
+    parser.add_argument("root", help="DSSAT directory tree to scan (e.g. C:\\DSSAT48\\Maize)")
+    parser.add_argument("-o", "--output", default="figures", help="Output directory (default: figures)")
+    parser.add_argument("-f", "--format", action="append", choices=["png", "svg", "pdf"],
+                        help="Output format, may be repeated (default: png)")
+    parser.add_argument("--dpi", type=int, default=150, help="Resolution for PNG output (default: 150)")
+    parser.add_argument("--dap", action="store_true", help="Use days after planting instead of calendar dates")
+    parser.add_argument("--scatter", action="append", type=_parse_scatter_pair, default=[],
+                        help="Also render an X:Y scatter plot for OUT/T files, may be repeated")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render unchanged inputs")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show loader and plotter output")
+    args = parser.parse_args(argv)
+
+    summary = batch_render(
+        args.root, args.output,
+        formats=tuple(args.format or ["png"]),
+        dpi=args.dpi,
+        use_calendar=not args.dap,
+        scatter=tuple(args.scatter),
+        workers=args.workers,
+        force=args.force,
+        verbose=args.verbose
+    )
+    print(f"Rendered {summary['rendered']} file(s) ({summary['figures']} figures), "
+          f"skipped {summary['skipped']} unchanged, {summary['failed']} failed.")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import numpy as np
+
+def minmax_indices(x, y, n_buckets):
+    """Select the min and max point of every x bucket, plus the first and last points.
+
+    The x range is split into `n_buckets` equal-width buckets (typically one per
+    horizontal pixel), so the decimated line is visually identical to the full one.
+
+    Args:
+        x (np.ndarray): Sorted numeric x values.
+        y (np.ndarray): Y values aligned with x.
+        n_buckets (int): Number of buckets to split the x range into.
+    Returns:
+        np.ndarray: Sorted indices of the points to keep.
+    """
+    n = len(x)
+    if n <= 2 or n_buckets <= 0:
+        return np.arange(n)
+
+    x_min, x_max = x[0], x[-1]
+    span = x_max - x_min
+    if span <= 0:
+        buckets = np.zeros(n, dtype=np.int64)
+    else:
+        buckets = ((x - x_min) / span * n_buckets).astype(np.int64)
+        np.clip(buckets, 0, n_buckets - 1, out=buckets)
+
+    # Order by bucket, then by y: the first item of each bucket is its minimum, the last its maximum
+    order = np.lexsort((y, buckets))
+    sorted_buckets = buckets[order]
+    starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    keep = np.concatenate(([0, n - 1], order[starts], order[ends]))
+    return np.unique(keep)
+
+def lttb_indices(x, y, n_out):
+    """Select `n_out` points with the Largest-Triangle-Three-Buckets algorithm.
+
+    Args:
+        x (np.ndarray): Sorted numeric x values.
+        y (np.ndarray): Y values aligned with x.
+        n_out (int): Number of points to keep (including first and last).
+    Returns:
+        np.ndarray: Sorted indices of the points to keep.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket bounds over the interior points; first and last points are always kept
+    every = (n - 2) / (n_out - 2)
+    bounds = (np.arange(n_out - 1) * every).astype(np.int64) + 1
+    bounds[-1] = n - 1
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = bounds[i], bounds[i + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        if i + 2 < len(bounds):
+            next_start, next_end = bounds[i + 1], bounds[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        areas = np.abs(
+            (x[prev] - avg_x) * (bucket_y - y[prev])
+            - (x[prev] - bucket_x) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(areas))
+        selected[i + 1] = prev
+
+    return selected
+
+def decimate(x, y, max_points, method="minmax"):
+    """Return the indices to draw for a series given a point budget.
+
+    Args:
+        x (np.ndarray): Sorted numeric x values.
+        y (np.ndarray): Y values aligned with x.
+        max_points (int): Approximate number of points the viewport can resolve
+            (usually the axes width in pixels).
+        method (str): "minmax" (per-pixel min/max envelope) or "lttb".
+    Returns:
+        np.ndarray: Sorted indices of the points to keep. All indices are
+        returned when the series is already small enough.
+    """
+    n = len(x)
+    if method == "lttb":
+        if n <= max_points:
+            return np.arange(n)
+        return lttb_indices(x, y, max_points)
+    # min/max keeps up to four points per bucket
+    if n <= 4 * max_points:
+        return np.arange(n)
+    return minmax_indices(x, y, max_points)
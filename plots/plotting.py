@@ -1,9 +1,34 @@
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import matplotlib.font_manager as fm
+import matplotlib.colors as mcolors
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import itertools
+from collections import defaultdict
+import warnings
+import numpy as np
 from datetime import datetime
 
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from .decimation import decimate
+    from ..utils.profiler import profiled
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from plots.decimation import decimate
+    from utils.profiler import profiled
+
+# Decimation method for simulated lines ("minmax" or "lttb")
+DECIMATION_METHOD = "minmax"
+# Number of series above which plots switch to collection-based batch rendering
+BATCH_RENDER_THRESHOLD = 50
+# Maximum number of entries shown in the proxy legend of batch-rendered plots
+BATCH_LEGEND_MAX_ENTRIES = 40
+
+@profiled("build_plot_data")
 def build_plot_data(data, variable_cde, run=None, use_calendar=True):
     """
     Build plot data entries for a given variable (CDE) and optional run filter.
@@ -117,6 +142,99 @@ def build_plot_data(data, variable_cde, run=None, use_calendar=True):
 
     return plot_groups
 
+@profiled("build_plot_data")
+def build_scatter_plot_data(data, x_cde, y_cde, run):
+    """Build a scatter dataset pairing two variables (X vs Y) of a single run.
+
+    Args:
+        data (list): Normalized data entries.
+        x_cde (str): Variable code for the X axis.
+        y_cde (str): Variable code for the Y axis.
+        run (str): Run to take both variables from.
+    Returns:
+        dict or None: Scatter dataset, or None if either variable has no values.
+    """
+    x_values = []
+    y_values = []
+    for entry in data:
+        if entry.get('run') != run:
+            continue
+        for variable in entry.get('values', []):
+            cde = variable.get('cde')
+            values = variable.get('values', [])
+            if not values or all(v is None for v in values):
+                continue
+            if cde == x_cde:
+                x_values = [float(v) for v in values if v is not None]
+            elif cde == y_cde:
+                y_values = [float(v) for v in values if v is not None]
+    if not x_values or not y_values:
+        print(f"No valid data for {x_cde} vs {y_cde} in run {run}")
+        return None
+    min_length = min(len(x_values), len(y_values))
+    return {
+        "x": x_values[:min_length],
+        "y": y_values[:min_length],
+        "label": f"{x_cde} vs {y_cde} ({run})",
+        "run": run
+    }
+
+@profiled("build_plot_data")
+def build_evaluate_plot_data(data, selected_vars):
+    """Build simulated (x) vs measured (y) datasets for evaluate summary variables.
+
+    Args:
+        data (list): Normalized evaluate entries (one value per CDE and type).
+        selected_vars (list): Variable codes to include.
+    Returns:
+        list: One dataset per variable with simulated/measured values across runs.
+    """
+    plot_data = []
+    last_run = data[-1].get("run", "Unknown") if data else "Unknown"
+
+    # Aggregate values for each variable across runs
+    all_values = defaultdict(lambda: {'simulated': [], 'measured': []})
+    for entry in data:
+        values = entry.get('values', [])
+        # Group values by CDE
+        cde_values = defaultdict(lambda: {'simulated': None, 'measured': None})
+        for value_dict in values:
+            cde = value_dict.get('cde')
+            if not cde:
+                continue
+            if value_dict.get('type') == 'simulated' and value_dict.get('values'):
+                cde_values[cde]['simulated'] = value_dict['values'][0]  # Single value for evaluate files
+            elif value_dict.get('type') == 'measured' and value_dict.get('values'):
+                cde_values[cde]['measured'] = value_dict['values'][0]  # Single value for evaluate files
+
+        # Transfer grouped values to all_values
+        for cde, vals in cde_values.items():
+            if vals['simulated'] is not None:
+                all_values[cde]['simulated'].append(vals['simulated'])
+            if vals['measured'] is not None:
+                all_values[cde]['measured'].append(vals['measured'])
+
+    # Process each selected variable
+    for cde in selected_vars:
+        if cde in all_values:
+            x_simulated = [x for x in all_values[cde]['simulated'] if x is not None]
+            y_measured = [y for y in all_values[cde]['measured'] if y is not None]
+            # Fallback to simulated if no measured data
+            if not y_measured and x_simulated:
+                y_measured = x_simulated[:len(x_simulated)]
+            if x_simulated or y_measured:  # Plot if either is available
+                plot_data.append({
+                    "x": x_simulated if x_simulated else y_measured,
+                    "y": y_measured if y_measured else x_simulated,
+                    "y_expected": y_measured if y_measured else x_simulated,
+                    "label": f"{cde} (Simulated vs Measured)",
+                    "run": last_run,
+                    "variable": cde
+                })
+            else:
+                print(f"Warning: No valid data for {cde}")
+    return plot_data
+
 def _get_color_map(plot_data):
     """Assign distinct colors based on (variable, run) combinations."""
     keys = list(dict.fromkeys([
@@ -125,19 +243,25 @@ def _get_color_map(plot_data):
     ]))
     # Use Set1 for up to 9 distinct keys; otherwise fallback to tab20b+tab20c
     if len(keys) <= 9:
-        base_colors = plt.cm.get_cmap("Set1").colors
+        base_colors = plt.colormaps["Set1"].colors
     else:
-        base_colors = plt.cm.get_cmap("tab20b").colors + plt.cm.get_cmap("tab20c").colors
+        base_colors = plt.colormaps["tab20b"].colors + plt.colormaps["tab20c"].colors
     colors = itertools.cycle(base_colors)
     return {key: next(colors) for key in keys}
 
-def _apply_legend(ax, figure, plot_data, legend_visible):
-    """Apply or remove the legend with custom formatting."""
+def _apply_legend(ax, figure, plot_data, legend_visible, handles=None):
+    """Apply or remove the legend with custom formatting.
+
+    Args:
+        handles (list, optional): Proxy handles to use instead of the axes artists.
+    """
     figure.subplots_adjust(bottom=0.25)
     if legend_visible:
-        ncol = min(4, max(1, len(plot_data) // 2))
+        ncol = min(4, max(1, len(handles if handles is not None else plot_data) // 2))
         small_font = fm.FontProperties(size=7)
+        legend_kwargs = {'handles': handles} if handles is not None else {}
         ax.legend(
+            **legend_kwargs,
             loc='upper center',
             bbox_to_anchor=(0.5, -0.2),
             ncol=ncol,
@@ -151,39 +275,224 @@ def _apply_legend(ax, figure, plot_data, legend_visible):
         if ax.get_legend():
             ax.get_legend().remove()
 
-def plot_time_series(figure, plot_data, use_calendar_mode=True, legend_visible=True):
-    """Plot time series data with simulated lines and measured scatter points."""
-    figure.clear()
-    ax = figure.add_subplot(111)
+def _axes_pixel_width(ax):
+    """Return the drawable width of the axes in pixels (at least 100)."""
+    return max(int(ax.bbox.width), 100)
 
-    key_to_color = _get_color_map(plot_data)
+def _series_arrays(x_values, y_values, use_calendar_mode):
+    """Convert a series to arrays for decimation.
 
+    Returns:
+        tuple: (x_num, x_plot, y) where x_num is a float array used for bucketing
+        and viewport lookups, and x_plot is what is handed to matplotlib
+        (datetime64 in calendar mode, so the date axis keeps working).
+    """
+    y = np.asarray(y_values, dtype=float)
+    if use_calendar_mode and any(isinstance(x, datetime) for x in x_values):
+        x_plot = np.array(x_values, dtype='datetime64[us]')
+        x_num = mdates.date2num(x_plot)
+    else:
+        x_plot = np.asarray(x_values, dtype=float)
+        x_num = x_plot
+    order = np.argsort(x_num, kind='stable')
+    return x_num[order], x_plot[order], y[order]
+
+def _attach_viewport_decimation(ax, series, apply, method=DECIMATION_METHOD):
+    """Re-decimate simulated lines from full-resolution data whenever the x-limits or the canvas size change.
+
+    Args:
+        ax: Matplotlib axes holding the lines.
+        series (list): (x_num, y) tuples with the full-resolution data.
+        apply (callable): Called with one index array per series selecting the
+            points to draw; it updates the artist(s).
+        method (str): Decimation method passed to `decimate`.
+    """
+    def on_xlim_changed(axes):
+        lo, hi = sorted(axes.get_xlim())
+        max_points = _axes_pixel_width(axes)
+        indices = []
+        for x_num, y in series:
+            # Keep one point beyond each edge so the line runs off the view
+            start = max(np.searchsorted(x_num, lo, side='left') - 1, 0)
+            stop = min(np.searchsorted(x_num, hi, side='right') + 1, len(x_num))
+            indices.append(start + decimate(x_num[start:stop], y[start:stop], max_points, method))
+        apply(indices)
+
+    # A plain function is held strongly by the callback registry
+    ax.callbacks.connect('xlim_changed', on_xlim_changed)
+
+    # Resizing changes the pixel width (and so the decimation level) without touching the x-limits
+    canvas = ax.figure.canvas
+
+    def on_resize(event):
+        if ax not in canvas.figure.axes:
+            # The figure was cleared for a new plot; the canvas outlives these axes
+            canvas.mpl_disconnect(resize_id)
+            return
+        on_xlim_changed(ax)
+
+    resize_id = canvas.mpl_connect('resize_event', on_resize)
+
+def _valid_series(x_values, y_values, label):
+    """Drop points with a missing x or y value.
+
+    Returns:
+        tuple: (x_values, y_values) tuples, or None if nothing valid remains.
+    """
+    if not x_values or not y_values or len(x_values) != len(y_values):
+        print(f"Warning: Invalid data for {label}: x={len(x_values)}, y={len(y_values)}")
+        return None
+    valid_pairs = [(x, y) for x, y in zip(x_values, y_values) if x is not None and y is not None]
+    if not valid_pairs:
+        print(f"Warning: No valid data for {label}")
+        return None
+    return tuple(zip(*valid_pairs))
+
+def _use_batch_rendering(plot_data, batch):
+    """Resolve the batch rendering flag (None means automatic, by series count)."""
+    if batch is None:
+        return len(plot_data) > BATCH_RENDER_THRESHOLD
+    return batch
+
+def _proxy_legend_handles(entries):
+    """Build lightweight legend handles for batch-rendered plots.
+
+    Args:
+        entries (list): (label, color, kind) tuples where kind is "line",
+            "marker" or "hollow".
+    Returns:
+        list: Line2D handles not attached to any axes, capped at BATCH_LEGEND_MAX_ENTRIES.
+    """
+    handles = []
+    for label, color, kind in list(dict.fromkeys(entries))[:BATCH_LEGEND_MAX_ENTRIES]:
+        if kind == "line":
+            handles.append(Line2D([], [], color=color, linestyle='-', label=label))
+        elif kind == "hollow":
+            handles.append(Line2D([], [], color=color, linestyle='none', marker='o',
+                                  markerfacecolor='none', alpha=0.6, label=label))
+        else:
+            handles.append(Line2D([], [], color=color, linestyle='none', marker='o', alpha=0.6, label=label))
+    hidden = len(dict.fromkeys(entries)) - len(handles)
+    if hidden > 0:
+        handles.append(Line2D([], [], linestyle='none', label=f"... (+{hidden} more)"))
+    return handles
+
+def _batch_scatter(ax, points, **kwargs):
+    """Draw (x_values, y_values, color) groups as a single PathCollection with per-point colors."""
+    if not points:
+        return None
+    counts = [len(x) for x, _, _ in points]
+    x_all = np.concatenate([np.asarray(x) for x, _, _ in points])
+    y_all = np.concatenate([np.asarray(y, dtype=float) for _, y, _ in points])
+    colors = np.repeat(mcolors.to_rgba_array([color for _, _, color in points]), counts, axis=0)
+    return ax.scatter(x_all, y_all, c=colors, **kwargs)
+
+def _plot_time_series_batch(ax, plot_data, use_calendar_mode, key_to_color, decimate_lines, max_points):
+    """Draw all simulated lines as one LineCollection and all measured points as one PathCollection.
+
+    Returns:
+        tuple: (has_dates, legend_handles)
+    """
+    segments, line_colors, full_series, measured, legend_entries = [], [], [], [], []
+    has_dates = False
     for data in plot_data:
         x_values = data['x_calendar'] if use_calendar_mode else data['x_dap']
-        y_values = data['y']
         label = data['label']
-        plot_type = data.get('type', 'simulated')
-        run = data.get('run', 'Unknown')
-        var = data.get('variable', data['label'].split()[0])
-        color = key_to_color[(var, run)]
-
-        if not x_values or not y_values or len(x_values) != len(y_values):
-            print(f"Warning: Invalid data for {label}: x={len(x_values)}, y={len(y_values)}")
+        valid = _valid_series(x_values, data['y'], label)
+        if valid is None:
             continue
-
-        valid_pairs = [(x, y) for x, y in zip(x_values, y_values) if x is not None and y is not None]
-        if not valid_pairs:
-            print(f"Warning: No valid data for {label}")
+        x_values, y_values = valid
+        color = key_to_color[(data.get('variable', label.split()[0]), data.get('run', 'Unknown'))]
+        x_num, x_plot, y_full = _series_arrays(x_values, y_values, use_calendar_mode)
+        has_dates = has_dates or x_plot.dtype.kind == 'M'
+
+        if data.get('type', 'simulated') == 'measured':
+            measured.append((x_plot, y_full, color))
+            legend_entries.append((label, color, "marker"))
             continue
-        x_values, y_values = zip(*valid_pairs)
-
-        if not use_calendar_mode and plot_type == 'measured' and all(x == 0 for x in x_values):
-            print(f"Warning: All x_dap values are 0 for {label}. Check DAP calculation or planting date.")
 
-        if plot_type == 'measured':
-            ax.scatter(x_values, y_values, label=label, color=color, marker='o', alpha=0.6)
+        # Collections bypass unit conversion, so segments always use numeric x
+        if decimate_lines:
+            idx = decimate(x_num, y_full, max_points, DECIMATION_METHOD)
+            segments.append(np.column_stack((x_num[idx], y_full[idx])))
         else:
-            ax.plot(x_values, y_values, label=label, color=color, linestyle='-')
+            segments.append(np.column_stack((x_num, y_full)))
+        full_series.append((x_num, y_full))
+        line_colors.append(color)
+        legend_entries.append((label, color, "line"))
+
+    if has_dates:
+        ax.xaxis_date()
+    if segments:
+        collection = LineCollection(segments, colors=line_colors, linestyles='-')
+        ax.add_collection(collection)
+        ax.autoscale_view()
+        if decimate_lines:
+            def apply(indices):
+                collection.set_segments([
+                    np.column_stack((x_num[idx], y[idx])) for (x_num, y), idx in zip(full_series, indices)
+                ])
+            _attach_viewport_decimation(ax, full_series, apply)
+    _batch_scatter(ax, measured, marker='o', alpha=0.6)
+
+    return has_dates, _proxy_legend_handles(legend_entries)
+
+@profiled("render")
+def plot_time_series(figure, plot_data, use_calendar_mode=True, legend_visible=True, decimate_lines=True, batch=None):
+    """Plot time series data with simulated lines and measured scatter points.
+
+    Simulated lines with more points than the axes can resolve are drawn decimated
+    and re-decimated from the full-resolution data when the view is zoomed or panned.
+    Measured points are always drawn in full. With more than BATCH_RENDER_THRESHOLD
+    series (or `batch=True`) every line goes into one LineCollection and every
+    measured point into one PathCollection, with a proxy legend.
+    """
+    figure.clear()
+    ax = figure.add_subplot(111)
+
+    key_to_color = _get_color_map(plot_data)
+    max_points = _axes_pixel_width(ax)
+    legend_handles = None
+
+    if _use_batch_rendering(plot_data, batch):
+        has_dates, legend_handles = _plot_time_series_batch(
+            ax, plot_data, use_calendar_mode, key_to_color, decimate_lines, max_points
+        )
+    else:
+        has_dates = False
+        decimated_lines = []
+        for data in plot_data:
+            x_values = data['x_calendar'] if use_calendar_mode else data['x_dap']
+            label = data['label']
+            plot_type = data.get('type', 'simulated')
+            run = data.get('run', 'Unknown')
+            var = data.get('variable', data['label'].split()[0])
+            color = key_to_color[(var, run)]
+
+            valid = _valid_series(x_values, data['y'], label)
+            if valid is None:
+                continue
+            x_values, y_values = valid
+            has_dates = any(isinstance(x, datetime) for x in x_values)
+
+            if not use_calendar_mode and plot_type == 'measured' and all(x == 0 for x in x_values):
+                print(f"Warning: All x_dap values are 0 for {label}. Check DAP calculation or planting date.")
+
+            if plot_type == 'measured':
+                ax.scatter(x_values, y_values, label=label, color=color, marker='o', alpha=0.6)
+            elif decimate_lines and len(x_values) > max_points:
+                x_num, x_plot, y_full = _series_arrays(x_values, y_values, use_calendar_mode)
+                idx = decimate(x_num, y_full, max_points, DECIMATION_METHOD)
+                line, = ax.plot(x_plot[idx], y_full[idx], label=label, color=color, linestyle='-')
+                decimated_lines.append((line, x_num, x_plot, y_full))
+            else:
+                ax.plot(x_values, y_values, label=label, color=color, linestyle='-')
+
+        if decimated_lines:
+            def apply(indices):
+                for (line, _, x_plot, y), idx in zip(decimated_lines, indices):
+                    line.set_data(x_plot[idx], y[idx])
+            _attach_viewport_decimation(ax, [(x_num, y) for _, x_num, _, y in decimated_lines], apply)
 
     ax.set_xlabel('Calendar Day' if use_calendar_mode else 'Days After Planting')
     ax.set_ylabel('Value')
@@ -191,7 +500,7 @@ def plot_time_series(figure, plot_data, use_calendar_mode=True, legend_visible=T
 
     if use_calendar_mode:
         try:
-            if x_values and any(isinstance(x, datetime) for x in x_values):
+            if has_dates:
                 ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
                 figure.autofmt_xdate()
             else:
@@ -200,15 +509,22 @@ def plot_time_series(figure, plot_data, use_calendar_mode=True, legend_visible=T
             print(f"Error formatting dates for calendar mode: {e}")
             ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{int(x)}"))
 
-    _apply_legend(ax, figure, plot_data, legend_visible)
+    _apply_legend(ax, figure, plot_data, legend_visible, legend_handles)
     figure.canvas.draw()
 
-def plot_evaluate(figure, plot_data, legend_visible=True):
-    """Plot evaluation scatter data."""
+@profiled("render")
+def plot_evaluate(figure, plot_data, legend_visible=True, batch=None):
+    """Plot evaluation scatter data.
+
+    With more than BATCH_RENDER_THRESHOLD datasets (or `batch=True`) all points are
+    drawn as two PathCollections (measured and expected) with a proxy legend.
+    """
     figure.clear()
     ax = figure.add_subplot(111)
 
     key_to_color = _get_color_map(plot_data)
+    use_batch = _use_batch_rendering(plot_data, batch)
+    points, expected_points, legend_entries = [], [], []
 
     for data in plot_data:
         x_values = data['x']
@@ -225,7 +541,11 @@ def plot_evaluate(figure, plot_data, legend_visible=True):
             continue
         valid_x, valid_y = zip(*valid_pairs)
 
-        ax.scatter(valid_x, valid_y, marker='o', color=color, label=label, alpha=0.6)
+        if use_batch:
+            points.append((valid_x, valid_y, color))
+            legend_entries.append((label, color, "marker"))
+        else:
+            ax.scatter(valid_x, valid_y, marker='o', color=color, label=label, alpha=0.6)
 
         valid_expected_pairs = [
             (x, y_exp) for x, y_exp in zip(x_values, y_expected)
@@ -233,21 +553,41 @@ def plot_evaluate(figure, plot_data, legend_visible=True):
         ]
         if valid_expected_pairs:
             valid_x_exp, valid_y_exp = zip(*valid_expected_pairs)
-            ax.scatter(valid_x_exp, valid_y_exp, marker='o', facecolors='none', edgecolors=color, label=f'{label} (Expected)', alpha=0.6)
+            if use_batch:
+                expected_points.append((valid_x_exp, valid_y_exp, color))
+                legend_entries.append((f'{label} (Expected)', color, "hollow"))
+            else:
+                ax.scatter(valid_x_exp, valid_y_exp, marker='o', facecolors='none', edgecolors=color, label=f'{label} (Expected)', alpha=0.6)
+
+    legend_handles = None
+    if use_batch:
+        _batch_scatter(ax, points, marker='o', alpha=0.6)
+        collection = _batch_scatter(ax, expected_points, marker='o', alpha=0.6)
+        if collection is not None:
+            collection.set_edgecolors(collection.get_facecolors())
+            collection.set_facecolors('none')
+        legend_handles = _proxy_legend_handles(legend_entries)
 
     ax.set_xlabel('Simulated Data')
     ax.set_ylabel('Measured Data')
     ax.grid(True)
 
-    _apply_legend(ax, figure, plot_data, legend_visible)
+    _apply_legend(ax, figure, plot_data, legend_visible, legend_handles)
     figure.canvas.draw()
 
-def plot_scatter(figure, plot_data, legend_visible=True):
-    """Plot scatter data."""
+@profiled("render")
+def plot_scatter(figure, plot_data, legend_visible=True, batch=None):
+    """Plot scatter data.
+
+    With more than BATCH_RENDER_THRESHOLD datasets (or `batch=True`) all points are
+    drawn as one PathCollection with a proxy legend.
+    """
     figure.clear()
     ax = figure.add_subplot(111)
 
     key_to_color = _get_color_map(plot_data)
+    use_batch = _use_batch_rendering(plot_data, batch)
+    points, legend_entries = [], []
 
     for data in plot_data:
         run = data.get("run", "Unknown")
@@ -260,11 +600,111 @@ def plot_scatter(figure, plot_data, legend_visible=True):
             print(f"Warning: No valid data for {label}")
             continue
         valid_x, valid_y = zip(*valid_pairs)
-        ax.scatter(valid_x, valid_y, label=label, color=color)
+        if use_batch:
+            points.append((valid_x, valid_y, color))
+            legend_entries.append((label, color, "marker"))
+        else:
+            ax.scatter(valid_x, valid_y, label=label, color=color)
+
+    legend_handles = None
+    if use_batch:
+        _batch_scatter(ax, points)
+        legend_handles = _proxy_legend_handles(legend_entries)
 
     ax.set_xlabel('X-Axis Variable')
     ax.set_ylabel('Y-Axis Variable')
     ax.grid(True)
 
-    _apply_legend(ax, figure, plot_data, legend_visible)
+    _apply_legend(ax, figure, plot_data, legend_visible, legend_handles)
+    figure.canvas.draw()
+
+@profiled("build_plot_data")
+def build_ensemble_data(plot_data, use_calendar_mode=True, percentiles=(10, 90)):
+    """Align every simulated run of each variable on a common x axis and compute envelope bands.
+
+    Args:
+        plot_data (list): Time series datasets as produced by `build_plot_data`.
+        use_calendar_mode (bool): Align on calendar dates (True) or DAP (False).
+        percentiles (tuple): Lower and upper percentiles of the inner band.
+    Returns:
+        list: One dict per variable with the common axis "x", the "min", "low",
+        "median", "high" and "max" bands, "n_runs" and its "measured" datasets.
+    """
+    simulated = {}
+    measured = {}
+    for data in plot_data:
+        x_values = data['x_calendar'] if use_calendar_mode else data['x_dap']
+        valid = _valid_series(x_values, data['y'], data['label'])
+        if valid is None:
+            continue
+        variable = data.get('variable', data['label'].split()[0])
+        _, x_plot, y = _series_arrays(*valid, use_calendar_mode)
+        target = measured if data.get('type', 'simulated') == 'measured' else simulated
+        target.setdefault(variable, []).append((x_plot, y))
+
+    ensembles = []
+    for variable, series in simulated.items():
+        # Common axis is the union of every run's x values; each run fills one row
+        x_all = np.concatenate([x for x, _ in series])
+        common = np.unique(x_all)
+        rows = np.repeat(np.arange(len(series)), [len(x) for x, _ in series])
+        cols = np.searchsorted(common, x_all)
+        matrix = np.full((len(series), len(common)), np.nan)
+        matrix[rows, cols] = np.concatenate([y for _, y in series])
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            low, median, high = np.nanpercentile(matrix, [percentiles[0], 50, percentiles[1]], axis=0)
+            ensembles.append({
+                "variable": variable,
+                "x": common,
+                "min": np.nanmin(matrix, axis=0),
+                "low": low,
+                "median": median,
+                "high": high,
+                "max": np.nanmax(matrix, axis=0),
+                "percentiles": tuple(percentiles),
+                "n_runs": len(series),
+                "measured": measured.get(variable, [])
+            })
+    return ensembles
+
+@profiled("render")
+def plot_ensemble(figure, plot_data, use_calendar_mode=True, legend_visible=True, percentiles=(10, 90)):
+    """Plot one min/max and percentile envelope plus median line per variable, with measured points.
+
+    The cost is one band per variable regardless of how many runs were selected.
+    """
+    figure.clear()
+    ax = figure.add_subplot(111)
+
+    ensembles = build_ensemble_data(plot_data, use_calendar_mode, percentiles)
+    key_to_color = _get_color_map([{"variable": e["variable"], "run": "Ensemble", "label": e["variable"]} for e in ensembles])
+
+    measured, measured_entries = [], []
+    for ensemble in ensembles:
+        variable = ensemble["variable"]
+        color = key_to_color[(variable, "Ensemble")]
+        x = ensemble["x"]
+        low_pct, high_pct = ensemble["percentiles"]
+        ax.fill_between(x, ensemble["min"], ensemble["max"], color=color, alpha=0.15, linewidth=0,
+                        label=f"{variable} min-max ({ensemble['n_runs']} runs)")
+        ax.fill_between(x, ensemble["low"], ensemble["high"], color=color, alpha=0.35, linewidth=0,
+                        label=f"{variable} P{low_pct:g}-P{high_pct:g}")
+        ax.plot(x, ensemble["median"], color=color, linestyle='-', label=f"{variable} median")
+        if ensemble["measured"]:
+            measured.extend((x_meas, y_meas, color) for x_meas, y_meas in ensemble["measured"])
+            measured_entries.append((f"{variable} (measured)", color, "marker"))
+    _batch_scatter(ax, measured, marker='o', alpha=0.6)
+    legend_handles = ax.get_legend_handles_labels()[0] + _proxy_legend_handles(measured_entries)
+
+    ax.set_xlabel('Calendar Day' if use_calendar_mode else 'Days After Planting')
+    ax.set_ylabel('Value')
+    ax.grid(True)
+
+    if use_calendar_mode and any(e["x"].dtype.kind == 'M' for e in ensembles):
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+        figure.autofmt_xdate()
+
+    _apply_legend(ax, figure, ensembles, legend_visible, legend_handles)
     figure.canvas.draw()
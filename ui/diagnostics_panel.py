@@ -0,0 +1,116 @@
+import os
+import sys
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem,
+    QFileDialog, QMessageBox, QHeaderView
+)
+
+try:
+    from ..utils import profiler
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils import profiler
+
+
+class DiagnosticsPanel(QWidget):
+    """Per-stage wall time, peak memory and call counts of the last profiled operation."""
+    def __init__(self, parent=None):
+        """Build the panel and subscribe to finished operations.
+
+        Args:
+            parent: Parent widget (typically the diagnostics dock of MainWindow).
+        """
+        super().__init__(parent)
+        self.operation = None
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+
+        # Stages of the operation, in the order they finished
+        self.stage_tree = QTreeWidget()
+        self.stage_tree.setHeaderLabels(["Stage", "Calls", "Wall time (ms)", "Peak memory (MiB)"])
+        self.stage_tree.setRootIsDecorated(False)
+        self.stage_tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+
+        # Top functions of the cProfile run
+        self.function_tree = QTreeWidget()
+        self.function_tree.setHeaderLabels(["Function", "Calls", "Own time (ms)", "Cumulative (ms)"])
+        self.function_tree.setRootIsDecorated(False)
+        self.function_tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+
+        self.export_button = QPushButton("Export Trace...")
+        self.export_button.clicked.connect(self.export_trace)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(self.export_button)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.summary_label)
+        layout.addWidget(self.stage_tree, 1)
+        layout.addWidget(QLabel("Slowest functions (cumulative):"))
+        layout.addWidget(self.function_tree, 1)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        # Listeners are only called for operations of the main (GUI) thread, so the panel is updated directly
+        self.listener = self.show_operation
+        profiler.add_listener(self.listener)
+        self.destroyed.connect(lambda: profiler.remove_listener(self.listener))
+
+        self.show_operation(profiler.last_operation())
+
+    def show_operation(self, operation):
+        """Fill the tables with a finished operation.
+
+        Args:
+            operation (dict or None): Operation recorded by `utils.profiler.profile_span`.
+        """
+        self.operation = operation
+        self.stage_tree.clear()
+        self.function_tree.clear()
+        self.export_button.setEnabled(operation is not None)
+        if operation is None:
+            state = "on" if profiler.is_enabled() else \
+                f"off (enable it in Options or set {profiler.PROFILE_ENV_VAR}=1)"
+            self.summary_label.setText(f"No profiled operation yet. Profiling is {state}.")
+            return
+
+        calls = operation.get("function_calls")
+        self.summary_label.setText(
+            f"Last operation: {operation['operation']} at {operation['started']} "
+            f"({operation['wall_time'] * 1000:.1f} ms, peak {operation['peak_memory'] / 2 ** 20:.1f} MiB"
+            + (f", {calls} function calls)" if calls is not None else ")")
+        )
+        for stage, record in operation["stages"].items():
+            QTreeWidgetItem(self.stage_tree, [
+                stage, str(record["calls"]), f"{record['wall_time'] * 1000:.1f}",
+                f"{record['peak_memory'] / 2 ** 20:.2f}"
+            ])
+        for function in operation.get("top_functions", []):
+            QTreeWidgetItem(self.function_tree, [
+                function["function"], str(function["calls"]),
+                f"{function['total_time'] * 1000:.1f}", f"{function['cumulative_time'] * 1000:.1f}"
+            ])
+        for tree in (self.stage_tree, self.function_tree):
+            for col in range(1, tree.columnCount()):
+                tree.resizeColumnToContents(col)
+
+    def refresh(self):
+        """Redraw the panel (e.g. after profiling was switched on or off)."""
+        self.show_operation(self.operation)
+
+    def export_trace(self):
+        """Save the shown operation as a JSON trace."""
+        if self.operation is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Trace", "trace.json",
+                                                   "JSON Files (*.json);;All Files (*)")
+        if not file_path:
+            return
+        try:
+            profiler.export_trace(file_path, self.operation)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Could not export the trace:\n{str(e)}")
+            return
+        QMessageBox.information(self, "Export", f"Trace saved to:\n{file_path}")
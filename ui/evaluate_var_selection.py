@@ -1,10 +1,9 @@
 import os
 import sys
-from collections import defaultdict
 from datetime import datetime, timedelta
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGroupBox, QScrollArea, QCheckBox,
-    QPushButton, QMessageBox, QWidget, QTextEdit, QListWidget, QSizePolicy, QTabWidget,
+    QPushButton, QMessageBox, QWidget, QListWidget, QSizePolicy, QTabWidget,
     QApplication, QLabel
 )
 from PyQt5.QtCore import Qt
@@ -12,14 +11,19 @@ from PyQt5.QtCore import Qt
 # Adjust imports to handle both package and script execution
 try:
     from data.data_processor import load_all_file_data, extract_runs_and_variables, get_file_type
-    from plots.plotting import plot_evaluate
+    from plots.plotting import plot_evaluate, build_evaluate_plot_data
     from ui.graph_window import GraphWindow
+    from ui.file_preview import open_file_preview
+    from utils.profiler import profiled
 except ImportError:
     # Add project root to sys.path
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     sys.path.insert(0, project_root)
     from data.data_processor import load_all_file_data, extract_runs_and_variables, get_file_type
+    from plots.plotting import build_evaluate_plot_data
     from ui.graph_window import GraphWindow
+    from ui.file_preview import open_file_preview
+    from utils.profiler import profiled
     
 class EvaluateVarSelectionDialog(QDialog):
     """Dialog for selecting variables to evaluate and displaying their graphs"""
@@ -93,7 +97,7 @@ class EvaluateVarSelectionDialog(QDialog):
         self.reload_button = QPushButton("Reload Data")
         self.reload_button.clicked.connect(self.reload_data)
         self.graph_button = QPushButton("Create and Display Graph")
-        self.graph_button.clicked.connect(self.show_graph_tab)
+        self.graph_button.clicked.connect(lambda: self.show_graph_tab())
         self.close_button = QPushButton("Close")
         self.close_button.clicked.connect(self.reject)
 
@@ -127,30 +131,7 @@ class EvaluateVarSelectionDialog(QDialog):
         if not self.selected_files:
             QMessageBox.warning(self, "Warning!", "No files selected to preview.")
             return
-
-        # Read and display content of the first file
-        file_path = self.selected_files[0]
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                file_content = file.read()
-
-            # Create preview dialog
-            preview_dialog = QDialog(self)
-            preview_dialog.setWindowTitle(f"Preview of {os.path.basename(file_path)}")
-            preview_dialog.setGeometry(250, 250, 600, 400)
-
-            text_edit = QTextEdit(preview_dialog)
-            text_edit.setReadOnly(True)
-            text_edit.setPlainText(file_content)
-
-            layout = QVBoxLayout()
-            layout.addWidget(text_edit)
-            preview_dialog.setLayout(layout)
-
-            preview_dialog.exec_()
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not preview the file:\n{str(e)}")
+        open_file_preview(self.selected_files[0], self)
 
     def display_data(self):
         """Display the variable checkboxes using full names from DATA.CDE."""
@@ -245,6 +226,7 @@ class EvaluateVarSelectionDialog(QDialog):
         print(f"Loaded data: {self.data}")
         self.display_data()
 
+    @profiled("show graph")
     def show_graph_tab(self):
         """Prepare plot data and switch to the graph tab."""
         # Get selected variables
@@ -267,50 +249,7 @@ class EvaluateVarSelectionDialog(QDialog):
             return
 
         # Prepare plot data, using simulated as x and measured as y
-        self.plot_data = []
-
-        # Aggregate values for each variable across runs
-        all_values = defaultdict(lambda: {'simulated': [], 'measured': []})
-        for entry in self.data:
-            values = entry.get('values', [])
-            # Group values by CDE
-            cde_values = defaultdict(lambda: {'simulated': None, 'measured': None})
-            for value_dict in values:
-                cde = value_dict.get('cde')
-                if not cde:
-                    continue
-                if value_dict.get('type') == 'simulated' and value_dict.get('values'):
-                    cde_values[cde]['simulated'] = value_dict['values'][0]  # Single value for evaluate files
-                elif value_dict.get('type') == 'measured' and value_dict.get('values'):
-                    cde_values[cde]['measured'] = value_dict['values'][0]  # Single value for evaluate files
-
-            # Transfer grouped values to all_values
-            for cde, vals in cde_values.items():
-                if vals['simulated'] is not None:
-                    all_values[cde]['simulated'].append(vals['simulated'])
-                if vals['measured'] is not None:
-                    all_values[cde]['measured'].append(vals['measured'])
-
-        # Process each selected variable
-        for cde in selected_vars:
-            if cde in all_values:
-                x_simulated = [x for x in all_values[cde]['simulated'] if x is not None]
-                y_measured = [y for y in all_values[cde]['measured'] if y is not None]
-                # Fallback to simulated if no measured data
-                if not y_measured and x_simulated:
-                    y_measured = x_simulated[:len(x_simulated)]
-                if x_simulated or y_measured:  # Plot if either is available
-                    self.plot_data.append({
-                        "x": x_simulated if x_simulated else y_measured,
-                        "y": y_measured if y_measured else x_simulated,
-                        "y_expected": y_measured if y_measured else x_simulated,
-                        "label": f"{cde} (Simulated vs Measured)",
-                        "run": entry.get("run", "Unknown"),
-                        "variable": cde
-                    })
-
-                else:
-                    print(f"Warning: No valid data for {cde}")
+        self.plot_data = build_evaluate_plot_data(self.data, selected_vars)
 
         # Validate file selection
         filename = self.selected_files[0] if self.selected_files else None
@@ -332,8 +271,7 @@ class EvaluateVarSelectionDialog(QDialog):
                 )
                 self.graph_layout.addWidget(self.graph_window)
             else:
-                self.graph_window.plot_data = self.plot_data
-                self.graph_window.refresh_plot()
+                self.graph_window.set_data(self.data, self.plot_data)
 
             self.tab_widget.setCurrentIndex(1)
         else:
@@ -0,0 +1,152 @@
+import os
+import sys
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QScrollBar, QComboBox,
+    QLabel, QPushButton, QMessageBox
+)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QFontMetrics
+
+try:
+    from ..utils.mapped_text import MappedTextFile
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.mapped_text import MappedTextFile
+
+# Line prefix of the run headers listed in the "Jump to run" box
+RUN_HEADER_PREFIX = "*RUN"
+
+
+class FilePreviewDialog(QDialog):
+    """Paged preview of a text file: only the lines in view are read from the memory-mapped file."""
+    def __init__(self, file_path, parent=None):
+        """Open the file and show its first page.
+
+        Args:
+            file_path (str): File to preview.
+            parent: Parent widget for the dialog.
+        """
+        super().__init__(parent)
+        self.setWindowTitle(f"Preview of {os.path.basename(file_path)}")
+        self.resize(800, 500)
+        self.mapped_file = MappedTextFile(file_path)
+        self.first_line = 0
+
+        # Text view without its own scrolling; the scroll bar pages through the file
+        self.text_view = QPlainTextEdit()
+        self.text_view.setReadOnly(True)
+        self.text_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.text_view.setFont(QFont("Courier New", 9))
+        self.text_view.wheelEvent = self.on_wheel
+
+        self.scroll_bar = QScrollBar(Qt.Vertical)
+        self.scroll_bar.setRange(0, max(0, self.mapped_file.line_count - 1))
+        self.scroll_bar.setSingleStep(1)
+        self.scroll_bar.valueChanged.connect(self.show_lines)
+
+        # Jump to run headers
+        self.runs = self.mapped_file.find_line_prefix(RUN_HEADER_PREFIX)
+        self.run_combo = QComboBox()
+        self.run_combo.addItem("Jump to run...")
+        for line, text in self.runs:
+            self.run_combo.addItem(text)
+        self.run_combo.setEnabled(bool(self.runs))
+        self.run_combo.activated.connect(self.jump_to_run)
+
+        self.position_label = QLabel()
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+
+        view_layout = QHBoxLayout()
+        view_layout.addWidget(self.text_view)
+        view_layout.addWidget(self.scroll_bar)
+        bottom_layout = QHBoxLayout()
+        bottom_layout.addWidget(self.run_combo, 1)
+        bottom_layout.addWidget(self.position_label)
+        bottom_layout.addWidget(close_button)
+        layout = QVBoxLayout()
+        layout.addLayout(view_layout)
+        layout.addLayout(bottom_layout)
+        self.setLayout(layout)
+
+        self.show_lines(0)
+
+    def visible_line_count(self):
+        """Number of lines that fit in the text view."""
+        line_height = QFontMetrics(self.text_view.font()).lineSpacing()
+        return max(1, self.text_view.viewport().height() // max(1, line_height))
+
+    def show_lines(self, first_line):
+        """Render the window of lines starting at `first_line`.
+
+        Args:
+            first_line (int): Index of the first visible line.
+        """
+        count = self.visible_line_count()
+        # The last page fills the view rather than scrolling past the end
+        maximum = max(0, self.mapped_file.line_count - count)
+        self.scroll_bar.setPageStep(count)
+        if self.scroll_bar.maximum() != maximum:
+            self.scroll_bar.setMaximum(maximum)
+        first_line = min(first_line, maximum)
+        self.first_line = first_line
+        self.text_view.setPlainText("\n".join(self.mapped_file.lines(first_line, count)))
+        last_line = min(first_line + count, self.mapped_file.line_count)
+        self.position_label.setText(f"Lines {first_line + 1}-{last_line} of {self.mapped_file.line_count}")
+
+    def jump_to_run(self, index):
+        """Scroll to the run header chosen in the run box.
+
+        Args:
+            index (int): Index in the run box (0 is the placeholder entry).
+        """
+        if index > 0:
+            self.scroll_bar.setValue(self.runs[index - 1][0])
+
+    def on_wheel(self, event):
+        """Scroll the file three lines per wheel step."""
+        steps = event.angleDelta().y() // 120
+        self.scroll_bar.setValue(self.scroll_bar.value() - 3 * steps)
+
+    def keyPressEvent(self, event):
+        """Page through the file with the keyboard."""
+        keys = {
+            Qt.Key_PageDown: self.scroll_bar.pageStep(),
+            Qt.Key_PageUp: -self.scroll_bar.pageStep(),
+            Qt.Key_Down: 1,
+            Qt.Key_Up: -1
+        }
+        if event.key() in keys:
+            self.scroll_bar.setValue(self.scroll_bar.value() + keys[event.key()])
+        elif event.key() == Qt.Key_Home:
+            self.scroll_bar.setValue(0)
+        elif event.key() == Qt.Key_End:
+            self.scroll_bar.setValue(self.scroll_bar.maximum())
+        else:
+            super().keyPressEvent(event)
+
+    def resizeEvent(self, event):
+        """Re-render so the window of lines fills the view."""
+        super().resizeEvent(event)
+        self.show_lines(self.first_line)
+
+    def done(self, result):
+        """Unmap the file when the dialog closes."""
+        self.mapped_file.close()
+        super().done(result)
+
+
+def open_file_preview(file_path, parent=None):
+    """Show the paged preview of a file, reporting errors in a message box.
+
+    Args:
+        file_path (str): File to preview.
+        parent: Parent widget for the dialog.
+    """
+    try:
+        dialog = FilePreviewDialog(file_path, parent)
+    except Exception as e:
+        QMessageBox.critical(parent, "Error", f"Could not preview the file:\n{str(e)}")
+        return
+    dialog.exec_()
@@ -1,20 +1,50 @@
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
     QListWidget, QListWidgetItem, QComboBox, QPushButton, QApplication,
-    QStyle, QMessageBox, QTextEdit
+    QStyle, QMessageBox, QLineEdit
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QFileSystemWatcher, pyqtSignal
 from PyQt5.QtGui import QIcon
 
 # Relative import with module structure
 try:
     from ..utils.t_files_dictionary import CROP_T_FILE_EXTENSIONS
+    from ..data.header_sniffer import sniff_headers
+    from ..data.workspace_index import WorkspaceIndex
+    from .file_preview import open_file_preview
 except ImportError:
     # Add project root to sys.path for script execution
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from utils.t_files_dictionary import CROP_T_FILE_EXTENSIONS
+    from data.header_sniffer import sniff_headers
+    from data.workspace_index import WorkspaceIndex
+    from ui.file_preview import open_file_preview
+
+# Threads scanning directories in the background for the directory tree
+DIR_SCAN_WORKERS = 2
+# Item data role marking directory items whose children have been added
+CHILDREN_LOADED_ROLE = Qt.UserRole + 1
+
+# Item data role holding the classified type of a file list item
+FILE_TYPE_ROLE = Qt.UserRole + 2
+# File types shown by each filter of the file list (None shows every file)
+FILTER_FILE_TYPES = {
+    "Output files": {"out"},
+    "Alt.Output": {"alt"},
+    "T-files": {"t", "alt"},
+    "Evaluation": {"evaluate"},
+    "All files": None
+}
+
+# Subdirectory listings shared by every file selector: {path: (directory mtime, sorted names)}
+_subdirectory_cache = {}
+# Classified file listings shared by every file selector: {path: (directory mtime, file records)}
+_file_listing_cache = {}
+# Workspace index shared by every file selector (opened on first use)
+_workspace_index = None
 
 
 def find_dssat_path(default_path="C:\\DSSAT48"):
@@ -65,6 +95,191 @@ def get_file_type(filename):
         return "unknown"
 
 
+def classify_file(filename):
+    """Classify a file for the file list filters.
+
+    Args:
+        filename (str): Name of the file.
+
+    Returns:
+        str: "alt" for ALT outputs (*.ALT, which are also alfalfa T-files), otherwise
+        the type from `get_file_type` ("t", "evaluate", "out" or "unknown").
+    """
+    if filename.endswith(".ALT"):
+        return "alt"
+    return get_file_type(filename)
+
+
+def list_directory_files(dir_path):
+    """List the files of a directory with their classified type, size, mtime and experiment code.
+
+    The listing is cached and rebuilt when the directory mtime changes, when a
+    listed file's size or mtime changes (files rewritten in place, e.g. by a
+    DSSAT rerun, leave the directory mtime alone) or after
+    `invalidate_directory_listing`. Records of unchanged files are reused, so
+    their headers are not read again.
+
+    Args:
+        dir_path (str): Directory to list.
+
+    Returns:
+        list: File records (dicts with "name", "path", "type", "size", "mtime" and
+        "experiment"), sorted by name.
+    """
+    try:
+        dir_mtime = os.stat(dir_path).st_mtime_ns
+    except OSError:
+        _file_listing_cache.pop(dir_path, None)
+        return []
+    cached = _file_listing_cache.get(dir_path)
+    if cached and cached[0] == dir_mtime and not _records_changed(cached[1]):
+        return cached[1]
+
+    previous = {record["name"]: record for record in cached[1]} if cached else {}
+    records = []
+    unsniffed = {}
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                record = previous.get(entry.name)
+                if record is None or record["size"] != stat.st_size or record["mtime"] != stat.st_mtime_ns:
+                    record = {
+                        "name": entry.name,
+                        "path": entry.path,
+                        "type": classify_file(entry.name),
+                        "size": stat.st_size,
+                        "mtime": stat.st_mtime_ns,
+                        "experiment": None
+                    }
+                    if record["type"] == "out":
+                        unsniffed[entry.path] = record
+                records.append(record)
+    except OSError:
+        pass
+
+    # Experiment codes of new or changed OUT files, read from their headers in parallel
+    for header in sniff_headers(list(unsniffed)):
+        unsniffed[header["path"]]["experiment"] = header["experiment"]
+    records.sort(key=lambda record: record["name"])
+    _file_listing_cache[dir_path] = (dir_mtime, records)
+    return records
+
+
+def _records_changed(records):
+    """Return True if any cached file record no longer matches the file's size and mtime."""
+    for record in records:
+        try:
+            stat = os.stat(record["path"])
+        except OSError:
+            return True
+        if record["size"] != stat.st_size or record["mtime"] != stat.st_mtime_ns:
+            return True
+    return False
+
+
+def invalidate_directory_listing(dir_path):
+    """Drop the cached file listing of a directory so the next listing rescans it."""
+    _file_listing_cache.pop(dir_path, None)
+
+
+def get_workspace_index():
+    """Return the shared workspace index, or None if it cannot be opened."""
+    global _workspace_index
+    if _workspace_index is None:
+        try:
+            _workspace_index = WorkspaceIndex()
+        except Exception as e:
+            print(f"Warning: workspace search is unavailable: {e}")
+            return None
+    return _workspace_index
+
+
+def _is_directory(entry):
+    """Return True if a DirEntry is a directory (the type is cached by os.scandir)."""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def scan_subdirectories(dir_path):
+    """List the subdirectories of a directory, reusing the cached listing while its mtime is unchanged.
+
+    Args:
+        dir_path (str): Directory to scan.
+
+    Returns:
+        tuple: (changed, names) where names is the sorted list of subdirectory
+        names and changed is False if the cached listing was still valid.
+    """
+    try:
+        mtime = os.stat(dir_path).st_mtime_ns
+    except OSError:
+        return _subdirectory_cache.pop(dir_path, None) is not None, []
+    cached = _subdirectory_cache.get(dir_path)
+    if cached and cached[0] == mtime:
+        return False, cached[1]
+    try:
+        with os.scandir(dir_path) as entries:
+            names = sorted((entry.name for entry in entries if _is_directory(entry)), key=str.lower)
+    except OSError:
+        names = []
+    _subdirectory_cache[dir_path] = (mtime, names)
+    return True, names
+
+
+def cached_subdirectories(dir_path):
+    """Return the cached subdirectory names of a directory, or None if it was never scanned."""
+    cached = _subdirectory_cache.get(dir_path)
+    return cached[1] if cached else None
+
+
+class DirectoryScanner(QObject):
+    """Scans directories in worker threads and reports the listings through a signal."""
+    scanned = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        """Initialize the scanner and its thread pool.
+
+        Args:
+            parent: Parent QObject.
+        """
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=DIR_SCAN_WORKERS)
+        self._pending = set()
+
+    def request(self, dir_path, only_if_changed=False):
+        """Scan a directory in the background and emit `scanned(path, names)`.
+
+        Args:
+            dir_path (str): Directory to scan.
+            only_if_changed (bool): Do not emit if the cached listing is still valid.
+        """
+        if dir_path in self._pending:
+            return
+        self._pending.add(dir_path)
+        self._executor.submit(self._scan, dir_path, only_if_changed)
+
+    def _scan(self, dir_path, only_if_changed):
+        changed, names = scan_subdirectories(dir_path)
+        self._pending.discard(dir_path)
+        if changed or not only_if_changed:
+            try:
+                self.scanned.emit(dir_path, names)
+            except RuntimeError:
+                pass  # The dialog was closed while scanning
+
+    def shutdown(self):
+        """Stop accepting scans; running scans finish in the background."""
+        self._executor.shutdown(wait=False)
+
+
 class FileSelectorDialog(QDialog):
     """Dialog for selecting files and directories with filtering options."""
     def __init__(self, parent=None, initial_dir=None):
@@ -87,12 +302,19 @@ class FileSelectorDialog(QDialog):
         self.layout = QVBoxLayout()
         self.h_layout = QHBoxLayout()
 
-        # File list widget
+        # File list widget with the workspace search above it
+        file_layout = QVBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search workspace (experiment, crop or variable, e.g. crop:maize var:HWAM)")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.on_search_changed)
+        file_layout.addWidget(self.search_edit)
         self.file_list = QListWidget()
         self.file_list.setMinimumWidth(350)
         self.file_list.setSelectionMode(QListWidget.MultiSelection)
         self.file_list.itemClicked.connect(self.on_file_clicked)
-        self.h_layout.addWidget(self.file_list, 2)
+        file_layout.addWidget(self.file_list)
+        self.h_layout.addLayout(file_layout, 2)
 
         # Directory tree widget
         self.dir_tree = QTreeWidget()
@@ -101,8 +323,21 @@ class FileSelectorDialog(QDialog):
         self.dir_tree.setColumnCount(1)
         self.dir_tree.itemClicked.connect(self.on_dir_selected)
         self.dir_tree.itemDoubleClicked.connect(self.on_dir_double_clicked)
+        self.dir_tree.itemExpanded.connect(self.on_dir_expanded)
+        self.dir_tree.itemCollapsed.connect(self.on_dir_collapsed)
         self.h_layout.addWidget(self.dir_tree, 1)
 
+        # Directory items by path and the paths the user has expanded
+        self.dir_items = {}
+        self.expanded_paths = set()
+        self.dir_icon = QApplication.style().standardIcon(QStyle.SP_DirIcon)
+        self.scanner = DirectoryScanner(self)
+        self.scanner.scanned.connect(self.on_dir_scanned)
+
+        # Reload the file list when files are added, removed or renamed
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+
         self.layout.addLayout(self.h_layout)
 
         # Filters
@@ -129,18 +364,28 @@ class FileSelectorDialog(QDialog):
         self.setLayout(self.layout)
 
         # Populate directory tree with initial directory
-        self.populate_dir_tree(max_depth=2, select_path=self.current_dir)
+        self.populate_dir_tree(select_path=self.current_dir)
+
+        # Bring the workspace index of the DSSAT root up to date in the background
+        self.workspace_index = get_workspace_index()
+        workspace_root = find_dssat_path()
+        if self.workspace_index and os.path.isdir(workspace_root):
+            self.workspace_index.start_update(workspace_root)
+        else:
+            self.search_edit.setEnabled(self.workspace_index is not None)
+
+    def populate_dir_tree(self, select_path=None):
+        """Show the current directory as the tree root; children are loaded when a node expands.
+
+        Listings already scanned are reused (unchanged subtrees are rebuilt from the
+        cache without touching the disk) and re-validated in the background.
 
-    def populate_dir_tree(self, max_depth=2, current_depth=0, select_path=None):
-        """Populate the directory tree with subdirectories up to max_depth.
-        
         Args:
-            max_depth (int): Maximum depth to explore directories.
-            current_depth (int): Current depth in the tree.
             select_path (str): Path to select in the tree (optional).
         """
         # Clear current tree
         self.dir_tree.clear()
+        self.dir_items = {}
 
         # Add parent directory item
         parent_dir = os.path.dirname(self.current_dir.rstrip("\\/"))
@@ -154,40 +399,100 @@ class FileSelectorDialog(QDialog):
             self.dir_tree.addTopLevelItem(up_item)
 
         # Current directory as root
-        root = QTreeWidgetItem([os.path.basename(self.current_dir) or self.current_dir])
-        root.setData(0, Qt.UserRole, self.current_dir)
-        root.setIcon(0, QApplication.style().standardIcon(QStyle.SP_DirIcon))
+        root = self.make_dir_item(None, os.path.basename(self.current_dir) or self.current_dir, self.current_dir)
         self.dir_tree.addTopLevelItem(root)
-
-        # Add subdirectories if within max depth
-        if current_depth < max_depth:
-            self.add_subdirectories(root, self.current_dir, max_depth, current_depth + 1)
-
         self.dir_tree.expandItem(root)
+
         self.load_files()
         if select_path:
             self.select_path_in_tree(select_path)
 
-    def add_subdirectories(self, parent_item, dir_path, max_depth, current_depth):
-        """Recursively add subdirectories to the tree widget.
-        
-        Args: 
-            parent_item Parent QTreeWidgetItem to add subdirectories to..
-            dir_path (str): Directory path to scan.
-            max_depth (int): Maximum depth to explore.
-            current_depth (int): Current depth in tree.
+    def make_dir_item(self, parent_item, name, path):
+        """Create a directory item that loads its children on expansion.
+
+        Args:
+            parent_item: Parent QTreeWidgetItem (None for a top-level item).
+            name (str): Displayed name.
+            path (str): Full directory path.
+
+        Returns:
+            QTreeWidgetItem: The new item.
         """
-        try:
-            for item in os.listdir(dir_path):
-                full_path = os.path.join(dir_path, item)
-                if os.path.isdir(full_path):
-                    child = QTreeWidgetItem(parent_item, [item])
-                    child.setData(0, Qt.UserRole, full_path)
-                    child.setIcon(0, QApplication.style().standardIcon(QStyle.SP_DirIcon))
-                    if current_depth < max_depth:
-                        self.add_subdirectories(child, full_path, max_depth, current_depth + 1)
-        except PermissionError:
-            pass
+        item = QTreeWidgetItem(parent_item, [name]) if parent_item is not None else QTreeWidgetItem([name])
+        item.setData(0, Qt.UserRole, path)
+        item.setIcon(0, self.dir_icon)
+        item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        self.dir_items[path] = item
+        return item
+
+    def set_dir_children(self, item, names):
+        """Update the children of a directory item, keeping the items of unchanged subdirectories.
+
+        Args:
+            item: Directory QTreeWidgetItem.
+            names (list): Sorted subdirectory names.
+        """
+        path = item.data(0, Qt.UserRole)
+        existing = {}
+        for child in item.takeChildren():
+            if child.data(0, Qt.UserRole) is not None:
+                existing[child.text(0)] = child
+        for name in names:
+            child = existing.pop(name, None)
+            if child is not None:
+                item.addChild(child)
+            else:
+                child = self.make_dir_item(item, name, os.path.join(path, name))
+            if child.data(0, Qt.UserRole) in self.expanded_paths:
+                child.setExpanded(True)
+        for child in existing.values():
+            self.dir_items.pop(child.data(0, Qt.UserRole), None)
+        item.setData(0, CHILDREN_LOADED_ROLE, True)
+        if not names:
+            item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
+
+    def on_dir_expanded(self, item):
+        """Load the children of a directory item the first time it expands.
+
+        Args:
+            item: Expanded QTreeWidgetItem.
+        """
+        path = item.data(0, Qt.UserRole)
+        if path is None or self.dir_items.get(path) is not item:
+            return
+        if item.parent() is not None:
+            self.expanded_paths.add(path)
+        if item.data(0, CHILDREN_LOADED_ROLE):
+            self.scanner.request(path, only_if_changed=True)
+            return
+        names = cached_subdirectories(path)
+        if names is not None:
+            self.set_dir_children(item, names)
+            self.scanner.request(path, only_if_changed=True)
+        else:
+            loading = QTreeWidgetItem(item, ["Loading..."])
+            loading.setFlags(Qt.NoItemFlags)
+            self.scanner.request(path)
+
+    def on_dir_collapsed(self, item):
+        """Forget a collapsed directory so it is not re-expanded when the tree is rebuilt."""
+        self.expanded_paths.discard(item.data(0, Qt.UserRole))
+
+    def on_dir_scanned(self, path, names):
+        """Show a background listing if its directory is still in the tree.
+
+        Args:
+            path (str): Scanned directory.
+            names (list): Sorted subdirectory names.
+        """
+        item = self.dir_items.get(path)
+        if item is not None:
+            self.set_dir_children(item, names)
+
+    def done(self, result):
+        """Stop the directory scanner when the dialog closes."""
+        self.scanner.shutdown()
+        super().done(result)
 
     def select_path_in_tree(self, path):
         """Select a specific path in the directory tree
@@ -195,21 +500,13 @@ class FileSelectorDialog(QDialog):
         Args:
             path (str): Path to select.
         """
-        def recurse_select(item):
-            if item.data(0, Qt.UserRole) == path:
-                self.dir_tree.setCurrentItem(item)
-                self.current_dir = path
-                self.load_files()
-                return True
-            for i in range(item.childCount()):
-                if recurse_select(item.child(i)):
-                    item.setExpanded(True)
-                    return True
-            return False
-
-        root = self.dir_tree.topLevelItem(0)
-        if root:
-            recurse_select(root)
+        item = self.dir_items.get(path)
+        if item is None:
+            return
+        self.dir_tree.setCurrentItem(item)
+        if path != self.current_dir:
+            self.current_dir = path
+            self.load_files()
 
     def on_dir_selected(self, item, column):
         """Handle single-click selection of a directory.
@@ -219,7 +516,7 @@ class FileSelectorDialog(QDialog):
             column: Selected column(unused).
         """
         path = item.data(0, Qt.UserRole)
-        if os.path.isdir(path):
+        if path and os.path.isdir(path):
             self.current_dir = path
             self.populate_dir_tree()
 
@@ -231,24 +528,71 @@ class FileSelectorDialog(QDialog):
             column: Selected column (unused).
         """
         path = item.data(0, Qt.UserRole)
-        if os.path.isdir(path):
+        if path and os.path.isdir(path):
             self.current_dir = path
             self.populate_dir_tree()
 
     def load_files(self):
-        """Load files from the current directory into the file list."""
+        """Load files from the current directory into the file list (from the listing cache when unchanged)."""
+        if self.search_edit.text().strip():
+            self.search_edit.clear()  # Leaving the search results shows the directory again
+            return
         self.file_list.clear()
         if not self.current_dir:
             return
 
-        # List all files in the current directory
-        files = [f for f in os.listdir(self.current_dir) if os.path.isfile(os.path.join(self.current_dir, f))]
-        for file in files:
-            item = QListWidgetItem(file)
-            item.setData(Qt.UserRole, os.path.join(self.current_dir, file))
+        # Watch only the directory being shown
+        watched = self.watcher.directories()
+        if watched != [self.current_dir]:
+            if watched:
+                self.watcher.removePaths(watched)
+            if os.path.isdir(self.current_dir):
+                self.watcher.addPath(self.current_dir)
+
+        for record in list_directory_files(self.current_dir):
+            item = QListWidgetItem(record["name"])
+            item.setData(Qt.UserRole, record["path"])
+            item.setData(FILE_TYPE_ROLE, record["type"])
+            if record["experiment"]:
+                item.setToolTip(f"Experiment {record['experiment']}")
+            self.file_list.addItem(item)
+        self.apply_filter()
+
+    def on_search_changed(self, text):
+        """Show the indexed files matching the search text, or the current directory when it is cleared.
+
+        Args:
+            text (str): Search query (see `WorkspaceIndex.search`).
+        """
+        if not text.strip():
+            self.load_files()
+            return
+        self.file_list.clear()
+        for result in self.workspace_index.search(text):
+            details = ", ".join(value for value in (result["crop"], result["experiment"]) if value)
+            item = QListWidgetItem(f"{result['name']}  ({details})" if details else result["name"])
+            item.setData(Qt.UserRole, result["path"])
+            item.setData(FILE_TYPE_ROLE, classify_file(result["name"]))
+            item.setToolTip(result["path"])
             self.file_list.addItem(item)
         self.apply_filter()
 
+    def on_directory_changed(self, path):
+        """Refresh the file list after the watched directory changes.
+
+        Args:
+            path (str): Changed directory.
+        """
+        invalidate_directory_listing(path)
+        if path == self.current_dir and not self.search_edit.text().strip():
+            selected = set(self.selected_files)
+            self.load_files()
+            for i in range(self.file_list.count()):
+                item = self.file_list.item(i)
+                if item.data(Qt.UserRole) in selected:
+                    item.setSelected(True)
+            self.selected_files = [it.data(Qt.UserRole) for it in self.file_list.selectedItems()]
+
     def on_file_clicked(self, item):
         """Handle file selection and update selected files list.
         
@@ -263,26 +607,13 @@ class FileSelectorDialog(QDialog):
         self.selected_files = [it.data(Qt.UserRole) for it in self.file_list.selectedItems()]
 
     def apply_filter(self):
-        """Apply the selected filter to the file list."""
-        filter_option = self.filter_combo.currentText()
+        """Apply the selected filter to the file list using the cached file types."""
+        allowed = FILTER_FILE_TYPES.get(self.filter_combo.currentText())
+        self.file_list.setUpdatesEnabled(False)
         for i in range(self.file_list.count()):
             item = self.file_list.item(i)
-            path = item.data(Qt.UserRole)
-            if os.path.isdir(path):
-                item.setHidden(False)
-                continue
-            filename = os.path.basename(path)
-            file_type = get_file_type(filename)
-            hide = False
-            if filter_option == "Output files" and file_type != "out":
-                hide = True
-            elif filter_option == "Alt.Output" and not filename.endswith(".ALT"):
-                hide = True
-            elif filter_option == "T-files" and file_type != "t":
-                hide = True
-            elif filter_option == "Evaluation" and file_type != "evaluate":
-                hide = True
-            item.setHidden(hide)
+            item.setHidden(allowed is not None and item.data(FILE_TYPE_ROLE) not in allowed)
+        self.file_list.setUpdatesEnabled(True)
 
     def on_ok_clicked(self):
         """Handle OK button click to validate and accept selections."""
@@ -300,34 +631,11 @@ class FileSelectorDialog(QDialog):
         return self.selected_files
 
     def preview_file(self):
-        """Preview the content of the frst selected file in a dialog."""
+        """Preview the content of the frst selected file in a paged, memory-mapped viewer."""
         if not self.selected_files:
             QMessageBox.warning(self, "Warning!", "No files selected to preview.")
             return
-
-        # Read and display the content of the first selected file
-        file_path = self.selected_files[0]
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                file_content = file.read()
-
-            preview_dialog = QDialog(self)
-            preview_dialog.setWindowTitle(f"Preview of {os.path.basename(file_path)}")
-            preview_dialog.resize(600, 400)
-
-            text_edit = QTextEdit(preview_dialog)
-            text_edit.setReadOnly(True)
-            text_edit.setPlainText(file_content)
-
-            layout = QVBoxLayout()
-            layout.addWidget(text_edit)
-            preview_dialog.setLayout(layout)
-
-            center_window_on_parent(preview_dialog, self)
-            preview_dialog.exec_()
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not preview the file:\n{str(e)}")
+        open_file_preview(self.selected_files[0], self)
 
 
 def open_file_selector(parent=None, initial_dir=None):
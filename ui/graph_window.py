@@ -1,32 +1,53 @@
 import sys
 import os
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QRadioButton, QButtonGroup, QLabel, QSizePolicy, QDialog, QTableWidget, QTableWidgetItem
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QRadioButton, QButtonGroup, QLabel, QSizePolicy, QDialog, QFileDialog, QMessageBox, QTreeWidget, QTreeWidgetItem, QComboBox, QToolButton, QMenu, QAction, QCheckBox
 from PyQt5.QtCore import Qt
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
 try:
-    from ..plots.plotting import plot_time_series, plot_scatter, plot_evaluate
+    from ..plots.plotting import plot_time_series, plot_scatter, plot_evaluate, plot_ensemble
     from ..data.data_processor import get_file_type
     from ..export.export_functions import (
         export_data_to_txt_time_series, export_data_to_excel_time_series,
         export_data_to_txt_scatter, export_data_to_excel_scatter,
-        export_data_to_txt_evaluate, export_data_to_excel_evaluate
+        export_data_to_txt_evaluate, export_data_to_excel_evaluate, export_tfile_to_excel, export_tfile_to_txt
     )
-    from ..utils.stats_calculator import calculate_statistics, get_variable_data
+    from ..export.pdf_report import generate_pdf_report
+    from ..export.tidy_export import write_columnar, write_tidy_csv
+    from ..utils.stats_cache import StatisticsCache
+    from ..utils.stats_calculator import STATISTICS_COLUMNS, METRICS, BOOTSTRAP_METRICS
+    from ..utils.profiler import profiled
 except ImportError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from data.data_processor import get_file_type
-    from plots.plotting import plot_time_series, plot_scatter, plot_evaluate
+    from plots.plotting import plot_time_series, plot_scatter, plot_evaluate, plot_ensemble
     from export.export_functions import (
         export_data_to_txt_time_series, export_data_to_excel_time_series,
         export_data_to_txt_scatter, export_data_to_excel_scatter,
         export_data_to_txt_evaluate, export_data_to_excel_evaluate, export_tfile_to_excel, export_tfile_to_txt
     )
-    from utils.stats_calculator import calculate_statistics, get_variable_data
+    from export.pdf_report import generate_pdf_report
+    from export.tidy_export import write_columnar, write_tidy_csv
+    from utils.stats_cache import StatisticsCache
+    from utils.stats_calculator import STATISTICS_COLUMNS, METRICS, BOOTSTRAP_METRICS
+    from utils.profiler import profiled
 
     
+# Grouping choices offered in the statistics dialog (label, grouping levels)
+STATISTICS_GROUPINGS = [
+    ("None", ()),
+    ("Run", ("run",)),
+    ("Treatment", ("treatment",)),
+    ("Experiment", ("experiment",)),
+    ("Experiment and treatment", ("experiment", "treatment")),
+    ("Crop", ("crop",))
+]
+
+# Number of bootstrap resamples for the confidence intervals of the statistics dialog
+BOOTSTRAP_RESAMPLES = 1000
+
 def print_graph(canvas, parent):
     """Print the graph canvas using a print dialog.
     
@@ -64,6 +85,10 @@ class GraphWindow(QWidget):
         self.variables_group = variables_group
         self.runs_group = runs_group
         self.plot_type = plot_type.lower()
+        # Metrics listed in the statistics dialog and in exported reports
+        self.statistics_metrics = list(STATISTICS_COLUMNS)
+        # Statistics results, reused until the data is reloaded with set_data
+        self.statistics_cache = StatisticsCache()
 
         # Enable date mode for time series with .out files.
         self.enable_date_mode = (
@@ -90,6 +115,12 @@ class GraphWindow(QWidget):
         self.toggle_legend_btn.setCheckable(True)
         self.toggle_legend_btn.clicked.connect(self.toggle_legend)
 
+        # Ensemble toggle: one envelope band per variable instead of one line per run
+        self.ensemble_btn = QPushButton("Ensemble View")
+        self.ensemble_btn.setCheckable(True)
+        self.ensemble_btn.setEnabled(self.plot_type == "time series")
+        self.ensemble_btn.clicked.connect(lambda: self.refresh_plot())
+
         # Date mode controls
         self.date_mode_label = QLabel("Date Mode:")
         self.date_mode_calendar = QRadioButton("Calendar Days")
@@ -100,8 +131,8 @@ class GraphWindow(QWidget):
         self.date_mode_group.addButton(self.date_mode_calendar)
         self.date_mode_group.addButton(self.date_mode_dap)
 
-        self.date_mode_calendar.toggled.connect(self.refresh_plot)
-        self.date_mode_dap.toggled.connect(self.refresh_plot)
+        self.date_mode_calendar.toggled.connect(lambda: self.refresh_plot())
+        self.date_mode_dap.toggled.connect(lambda: self.refresh_plot())
 
         # Disable date mode controls if no applicable
         if not self.enable_date_mode:
@@ -114,6 +145,11 @@ class GraphWindow(QWidget):
         self.print_btn = QPushButton("Print")
         self.export_txt_btn = QPushButton("Export data to text file")
         self.export_excel_btn = QPushButton("Export to Excel")
+        self.export_report_btn = QPushButton("Export PDF Report")
+        self.export_report_btn.clicked.connect(self.export_pdf_report)
+        self.export_dataset_btn = QPushButton("Export Dataset")
+        self.export_dataset_btn.clicked.connect(self.export_dataset)
+        self.export_dataset_btn.setEnabled(bool(self.data))
         self.statistic_btn = QPushButton("Statistic")
         self.statistic_btn.clicked.connect(self.show_statistics)
         # Enable statistic button for evaluate files and sim-vs-obs supported OUT files
@@ -123,6 +159,7 @@ class GraphWindow(QWidget):
 
         # Add widgets to control panel layout
         control_layout.addWidget(self.toggle_legend_btn)
+        control_layout.addWidget(self.ensemble_btn)
         control_layout.addWidget(self.date_mode_label)
         control_layout.addWidget(self.date_mode_calendar)
         control_layout.addWidget(self.date_mode_dap)
@@ -130,6 +167,8 @@ class GraphWindow(QWidget):
         control_layout.addWidget(self.print_btn)
         control_layout.addWidget(self.export_txt_btn)
         control_layout.addWidget(self.export_excel_btn)
+        control_layout.addWidget(self.export_report_btn)
+        control_layout.addWidget(self.export_dataset_btn)
         control_layout.addWidget(self.statistic_btn)
         control_panel.setLayout(control_layout)
         control_panel.setFixedWidth(180)
@@ -143,6 +182,7 @@ class GraphWindow(QWidget):
         # Initialize legend state and plot
         self.legend_visible = True
         self.refresh_plot()
+        self.prewarm_statistics()
 
         # Connect button actions
         self.print_btn.clicked.connect(lambda: print_graph(self.canvas, self))
@@ -160,17 +200,50 @@ class GraphWindow(QWidget):
             self.export_txt_btn.clicked.connect(lambda: export_data_to_txt_evaluate(self.plot_data, self))
             self.export_excel_btn.clicked.connect(lambda: export_data_to_excel_evaluate(self.plot_data, self))
 
+    def set_data(self, data, plot_data=None):
+        """Show new data and/or plot data (after a reload or a new selection), redraw and prewarm the statistics.
+
+        Cached statistics are dropped only when `data` is a different dataset
+        (the selection dialogs replace the list when the files are reloaded).
+
+        Args:
+            data (list): Raw data for statistics and processing.
+            plot_data (list, optional): New plot data; the current one is kept if None.
+        """
+        if data is not self.data:
+            self.statistics_cache.invalidate()
+        self.data = data
+        if plot_data is not None:
+            self.plot_data = plot_data
+        self.export_dataset_btn.setEnabled(bool(data))
+        self.refresh_plot()
+        self.prewarm_statistics()
+
+    def statistics_variables(self):
+        """Return the variables of the statistics table, in plot order."""
+        return list(dict.fromkeys(data['label'].split(" (")[0] for data in self.plot_data))
+
+    def prewarm_statistics(self):
+        """Compute the statistics table in the background so the dialog opens instantly."""
+        if self.statistic_btn.isEnabled() and self.data:
+            self.statistics_cache.prewarm(self.data, self.statistics_variables(), self.statistics_metrics,
+                                          [levels for _, levels in STATISTICS_GROUPINGS])
+
     def toggle_legend(self):
         """Toggle the visibility of the plot legend."""
         self.legend_visible = not self.legend_visible
         self.refresh_plot()
         self.toggle_legend_btn.setText("Show Legend" if not self.legend_visible else "Hide Legend")
 
+    @profiled("refresh plot")
     def refresh_plot(self):
         """Refresh the plot based on the current plot type and settings."""
         if self.plot_type == "time series":
             use_calendar_mode = self.date_mode_calendar.isChecked() if self.enable_date_mode else True
-            plot_time_series(self.figure, self.plot_data, use_calendar_mode, self.legend_visible)
+            if self.ensemble_btn.isChecked():
+                plot_ensemble(self.figure, self.plot_data, use_calendar_mode, self.legend_visible)
+            else:
+                plot_time_series(self.figure, self.plot_data, use_calendar_mode, self.legend_visible)
         elif self.plot_type == "scatter plot":
             plot_scatter(self.figure, self.plot_data, self.legend_visible)
         elif self.plot_type == "evaluate data":
@@ -178,37 +251,135 @@ class GraphWindow(QWidget):
         else:
             print(f"Unsupported plot type: {self.plot_type}")
 
+    def export_pdf_report(self):
+        """Export every variable of the current plot (one page each) plus statistics to a PDF."""
+        options = QFileDialog.Options()
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save PDF Report", "", "PDF Files (*.pdf);;All Files (*)", options=options)
+        if not file_path:
+            return
+        use_calendar_mode = self.date_mode_calendar.isChecked() if self.enable_date_mode else True
+        try:
+            pages = generate_pdf_report(file_path, self.plot_data, self.plot_type, self.data,
+                                        use_calendar_mode=use_calendar_mode, metrics=self.statistics_metrics)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not export the report:\n{str(e)}")
+            return
+        QMessageBox.information(self, "Report", f"Report with {pages} page(s) saved to:\n{file_path}")
+
+    def export_dataset(self):
+        """Export the whole loaded dataset (all runs and variables) in long format."""
+        options = QFileDialog.Options()
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Dataset", "",
+            "CSV Files (*.csv);;Compressed CSV Files (*.csv.gz);;Parquet Files (*.parquet);;"
+            "Feather Files (*.feather);;All Files (*)", options=options
+        )
+        if not file_path:
+            return
+        try:
+            if file_path.lower().endswith((".csv", ".gz")):
+                rows = write_tidy_csv(self.data, file_path)
+            else:
+                rows = write_columnar(self.data, file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not export the dataset:\n{str(e)}")
+            return
+        QMessageBox.information(self, "Export", f"{rows} row(s) saved to:\n{file_path}")
+
     def show_statistics(self):
-        """Display a table of statistics for the selected variables."""
+        """Display a table of statistics for the selected variables, optionally broken down by group."""
         # Create dialog for statistics
         dialog = QDialog(self)
         dialog.setWindowTitle("Statistical Analysis")
         dialog.setGeometry(150, 150, 800, 400)
 
-        # Create table for statistics
-        table = QTableWidget()
-        table.setRowCount(len(self.plot_data))
-        table.setColumnCount(12)
-        table.setHorizontalHeaderLabels([
-            "Variable Name", "Mean (Obs)", "Mean (Sim)", "Mean Ratio", "Std.Dev (Obs)", 
-            "Std.Dev (Sim)", "r-Square", "Mean Diff.", "Mean Abs. Diff.", "RMSE", 
-            "d-stat", "Used Obs.", "Total Number"
-        ])
-
-        # Populate table with statistics
-        for row, data in enumerate(self.plot_data):
-            variable_name = data['label'].split(" (")[0]
-            observed, simulated = get_variable_data(self.data, variable_name)
-            stats = calculate_statistics(observed, simulated)
-            if stats:
-                table.setItem(row, 0, QTableWidgetItem(variable_name))
-                for col, (key, value) in enumerate(stats.items()):
-                    item = QTableWidgetItem(str(value))
-                    table.setItem(row, col + 1, item)
+        # One row per variable, all computed in a single vectorized pass
+        variables = self.statistics_variables()
+
+        # Grouping selector: each variable row expands into one row per group
+        group_layout = QHBoxLayout()
+        group_layout.addWidget(QLabel("Group by:"))
+        group_combo = QComboBox()
+        for text, levels in STATISTICS_GROUPINGS:
+            group_combo.addItem(text, levels)
+        group_layout.addWidget(group_combo)
+
+        # Metric selector: every registered metric, checked if currently listed
+        metrics_button = QToolButton()
+        metrics_button.setText("Metrics")
+        metrics_button.setPopupMode(QToolButton.InstantPopup)
+        metrics_menu = QMenu(metrics_button)
+        for name in METRICS:
+            action = QAction(name, metrics_menu, checkable=True)
+            action.setChecked(name in self.statistics_metrics)
+            metrics_menu.addAction(action)
+        metrics_button.setMenu(metrics_menu)
+        group_layout.addWidget(metrics_button)
+
+        # Optional bootstrap intervals, shown next to the variable-level values
+        ci_checkbox = QCheckBox("95% confidence intervals")
+        ci_checkbox.setToolTip(f"Bootstrap ({BOOTSTRAP_RESAMPLES} resamples) for {', '.join(BOOTSTRAP_METRICS)}")
+        group_layout.addWidget(ci_checkbox)
+        group_layout.addStretch()
+
+        # Create tree for statistics
+        tree = QTreeWidget()
+
+        def fill_row(item, name, stats, intervals=None):
+            item.setText(0, name)
+            for col, key in enumerate(self.statistics_metrics):
+                text = str(stats[key])
+                if intervals and key in intervals:
+                    low, high = intervals[key]
+                    text += f" [{low}, {high}]"
+                item.setText(col + 1, text)
+
+        @profiled("statistics table")
+        def populate():
+            tree.clear()
+            headers = ["Variable Name"] + self.statistics_metrics
+            tree.setColumnCount(len(headers))
+            tree.setHeaderLabels(headers)
+            items = {}
+            intervals = {}
+            ci_metrics = [name for name in BOOTSTRAP_METRICS if name in self.statistics_metrics]
+            if ci_checkbox.isChecked() and ci_metrics:
+                intervals = dict(self.statistics_cache.bootstrap_table(self.data, variables, metrics=ci_metrics,
+                                                                       n_resamples=BOOTSTRAP_RESAMPLES))
+            # Populate table with statistics
+            for variable_name, stats in self.statistics_cache.statistics_table(self.data, variables, metrics=self.statistics_metrics):
+                if stats:
+                    items[variable_name] = QTreeWidgetItem(tree)
+                    fill_row(items[variable_name], variable_name, stats, intervals.get(variable_name))
+
+            levels = group_combo.currentData()
+            if levels:
+                for variable_name, group, stats in self.statistics_cache.grouped_statistics(self.data, levels, variables, self.statistics_metrics):
+                    if stats and variable_name in items:
+                        fill_row(QTreeWidgetItem(items[variable_name]), " / ".join(group), stats)
+                tree.expandAll()
+            for col in range(len(headers)):
+                tree.resizeColumnToContents(col)
+
+        def update_metrics(toggled):
+            # Keep the registry order so columns do not jump around
+            checked = {action.text() for action in metrics_menu.actions() if action.isChecked()}
+            if not checked:
+                # At least one metric stays listed, so the table never loses all its columns
+                toggled.setChecked(True)
+                return
+            self.statistics_metrics = [name for name in METRICS if name in checked]
+            populate()
+
+        group_combo.currentIndexChanged.connect(lambda: populate())
+        metrics_menu.triggered.connect(update_metrics)
+        ci_checkbox.toggled.connect(lambda: populate())
+        populate()
 
         # Set up dialog layout
         layout = QVBoxLayout()
-        layout.addWidget(table)
+        layout.addLayout(group_layout)
+        layout.addWidget(tree)
         dialog.setLayout(layout)
         dialog.exec_()
         
@@ -1,7 +1,7 @@
 # C:\Users\User\Documents\Projetos\interface_Gbuild_refatorada\ui\main_window.py
 import os
 from PyQt5.QtWidgets import (
-    QAction, QApplication, QMainWindow, QLabel, QMessageBox, QWidget, QVBoxLayout, QHBoxLayout
+    QAction, QApplication, QMainWindow, QLabel, QMessageBox, QWidget, QVBoxLayout, QHBoxLayout, QDockWidget
 )
 from PyQt5.QtGui import QPixmap, QFont
 
@@ -14,11 +14,13 @@ try:
     from .scatter_plot_var_selection import open_scatter_var_selection
     from .evaluate_var_selection import open_evaluate_var_selection
     from .options_menu import OptionsDialog
+    from .diagnostics_panel import DiagnosticsPanel
 except ImportError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from ui.time_series_var_selection import open_time_series_var_selection
     from ui.scatter_plot_var_selection import open_scatter_var_selection
     from ui.options_menu import OptionsDialog
+    from ui.diagnostics_panel import DiagnosticsPanel
 
 class MainWindow(QMainWindow):
     """Main application window for the DSSAT Output Viewer."""
@@ -95,6 +97,14 @@ class MainWindow(QMainWindow):
         options_action.triggered.connect(self.show_options)
         menubar.addAction(options_action)
 
+        # Diagnostics panel (profiling results), hidden until requested
+        self.diagnostics_dock = QDockWidget("Diagnostics", self)
+        self.diagnostics_dock.setWidget(DiagnosticsPanel(self.diagnostics_dock))
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.diagnostics_dock)
+        self.diagnostics_dock.hide()
+        diagnostics_action = self.diagnostics_dock.toggleViewAction()
+        diagnostics_action.setText("Diagnostics")
+        menubar.addAction(diagnostics_action)
 
         # Menu Help
         help_menu = menubar.addMenu("Help")
@@ -179,6 +189,7 @@ class MainWindow(QMainWindow):
         # Create and show options dialog
         dialog = OptionsDialog(self)
         if dialog.exec_():
+            self.diagnostics_dock.widget().refresh()
             selected_type = dialog.get_plot_type()
             plot_type_map = {
                 "time_series": "Time Series",
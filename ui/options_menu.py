@@ -1,6 +1,14 @@
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTreeWidget, QTreeWidgetItem, QPushButton, QMessageBox
+import os
+import sys
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTreeWidget, QTreeWidgetItem, QPushButton, QMessageBox, QCheckBox
 from PyQt5.QtCore import Qt
 
+try:
+    from ..utils import profiler
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils import profiler
+
 class OptionsDialog(QDialog):
     """Dialog for selecting the plot type the DSSAT Output Viewer."""
     def __init__(self, parent=None):
@@ -49,6 +57,12 @@ class OptionsDialog(QDialog):
 
         layout.addWidget(self.tree_widget)
 
+        # Profiling mode (also enabled at startup by the GBUILD_PROFILE environment variable)
+        self.profiling_checkbox = QCheckBox("Enable profiling (see Diagnostics)")
+        self.profiling_checkbox.setChecked(profiler.is_enabled())
+        self.profiling_checkbox.setStyleSheet('font: 10pt "Arial";')
+        layout.addWidget(self.profiling_checkbox)
+
         # Apply button
         self.apply_button = QPushButton("Apply", self)
         self.apply_button.clicked.connect(self.apply)
@@ -68,7 +82,8 @@ class OptionsDialog(QDialog):
         layout.addWidget(self.apply_button)
 
     def apply(self):
-        """Apply the selected plot type and close the dialog if valid."""
+        """Apply the selected plot type and profiling mode and close the dialog if valid."""
+        profiler.set_enabled(self.profiling_checkbox.isChecked())
         # Get selected item from tree widget
         selected_item = self.tree_widget.currentItem()
         if not selected_item:
@@ -3,7 +3,7 @@ import sys
 from datetime import datetime, timedelta
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGroupBox, QScrollArea, QCheckBox,
-    QPushButton, QMessageBox, QWidget, QTextEdit, QListWidget, QSizePolicy, QTabWidget,
+    QPushButton, QMessageBox, QWidget, QListWidget, QSizePolicy, QTabWidget,
     QApplication, QLabel
 )
 from PyQt5.QtCore import Qt
@@ -12,13 +12,19 @@ from PyQt5.QtGui import QFont
 try:
     from utils.cde_data_parser import parse_data_cde
     from data.data_processor import load_all_file_data, extract_runs_and_variables, get_file_type
+    from plots.plotting import build_scatter_plot_data
     from ui.graph_window import GraphWindow
+    from ui.file_preview import open_file_preview
+    from utils.profiler import profiled
 except ImportError:
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     sys.path.insert(0, project_root)
     from utils.cde_data_parser import parse_data_cde
     from data.data_processor import load_all_file_data, extract_runs_and_variables, get_file_type
+    from plots.plotting import build_scatter_plot_data
     from ui.graph_window import GraphWindow
+    from ui.file_preview import open_file_preview
+    from utils.profiler import profiled
 
 class ScatterVarSelectionDialog(QDialog):
     """Dialog for selecting variables and runs for scatter plot visualization."""
@@ -120,7 +126,7 @@ class ScatterVarSelectionDialog(QDialog):
         self.reload_button = QPushButton("Reload Data")
         self.reload_button.clicked.connect(self.reload_data)
         self.graph_button = QPushButton("Create and Display Graph")
-        self.graph_button.clicked.connect(self.show_graph_tab)
+        self.graph_button.clicked.connect(lambda: self.show_graph_tab())
         self.close_button = QPushButton("Close")
         self.close_button.clicked.connect(self.reject)
         self.button_layout.addWidget(self.clear_button)
@@ -247,25 +253,9 @@ class ScatterVarSelectionDialog(QDialog):
             return
         file_name = selected_items[0].text()
         file_path = next(f for f in self.selected_files if os.path.basename(f) == file_name)
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read(1000)  # Limit to first 1000 chars
-            preview_dialog = QDialog(self)
-            preview_dialog.setWindowTitle(f"Preview: {file_name}")
-            layout = QVBoxLayout()
-            text_edit = QTextEdit()
-            text_edit.setReadOnly(True)
-            text_edit.setText(content)
-            layout.addWidget(text_edit)
-            close_button = QPushButton("Close")
-            close_button.clicked.connect(preview_dialog.accept)
-            layout.addWidget(close_button)
-            preview_dialog.setLayout(layout)
-            preview_dialog.resize(600, 400)
-            preview_dialog.exec_()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to preview file: {str(e)}")
+        open_file_preview(file_path, self)
 
+    @profiled("show graph")
     def show_graph_tab(self):
         """Create and display the scatter plot."""
         selected_x_vars = [checkbox.text() for checkbox in self.x_variables_widget.findChildren(QCheckBox) if checkbox.isChecked()]
@@ -283,30 +273,9 @@ class ScatterVarSelectionDialog(QDialog):
                         continue
                     x_cde = x_var.split('(')[-1].strip(')') if '(' in x_var else x_var
                     y_cde = y_var.split('(')[-1].strip(')') if '(' in y_var else y_var
-                    x_values = []
-                    y_values = []
-                    for entry in self.data:
-                        if entry.get('run') != run:
-                            continue
-                        for variable in entry.get('values', []):
-                            cde = variable.get('cde')
-                            values = variable.get('values', [])
-                            if not values or all(v is None for v in values):
-                                continue
-                            if cde == x_cde:
-                                x_values = [float(v) for v in values if v is not None]
-                            elif cde == y_cde:
-                                y_values = [float(v) for v in values if v is not None]
-                    if not x_values or not y_values:
-                        print(f"No valid data for {x_cde} vs {y_cde} in run {run}")
-                        continue
-                    min_length = min(len(x_values), len(y_values))
-                    self.plot_data.append({
-                        "x": x_values[:min_length],
-                        "y": y_values[:min_length],
-                        "label": f"{x_cde} vs {y_cde} ({run})",
-                        "run": run  
-                    })
+                    scatter_data = build_scatter_plot_data(self.data, x_cde, y_cde, run)
+                    if scatter_data:
+                        self.plot_data.append(scatter_data)
 
 
         if not self.plot_data:
@@ -319,8 +288,7 @@ class ScatterVarSelectionDialog(QDialog):
             return
 
         if self.graph_window:
-            self.graph_window.plot_data = self.plot_data
-            self.graph_window.refresh_plot()
+            self.graph_window.set_data(self.data, self.plot_data)
         else:
             self.graph_window = GraphWindow(
                 self.plot_data,
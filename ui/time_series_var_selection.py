@@ -3,7 +3,7 @@ import sys
 from datetime import datetime, timedelta
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGroupBox, QScrollArea, QCheckBox,
-    QPushButton, QMessageBox, QWidget, QTextEdit, QListWidget, QSizePolicy, QTabWidget,
+    QPushButton, QMessageBox, QWidget, QListWidget, QSizePolicy, QTabWidget,
     QApplication, QLabel
 )
 from PyQt5.QtCore import Qt
@@ -13,6 +13,8 @@ try:
     from utils.cde_data_parser import parse_data_cde
     from plots.plotting import plot_time_series, build_plot_data  # Add build_plot_data
     from ui.graph_window import GraphWindow
+    from ui.file_preview import open_file_preview
+    from utils.profiler import profiled
     from data.data_processor import load_all_file_data, extract_runs_and_variables, get_file_type
 except ImportError:
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -20,6 +22,8 @@ except ImportError:
     from utils.cde_data_parser import parse_data_cde
     from plots.plotting import plot_time_series, build_plot_data  # Add build_plot_data
     from ui.graph_window import GraphWindow
+    from ui.file_preview import open_file_preview
+    from utils.profiler import profiled
     from data.data_processor import load_all_file_data, extract_runs_and_variables, get_file_type
 
 class TimeSeriesVarSelectionDialog(QDialog):
@@ -112,7 +116,7 @@ class TimeSeriesVarSelectionDialog(QDialog):
         self.reload_button = QPushButton("Reload Data")
         self.reload_button.clicked.connect(self.reload_data)
         self.graph_button = QPushButton("Create and Display Graph")
-        self.graph_button.clicked.connect(self.show_graph_tab)
+        self.graph_button.clicked.connect(lambda: self.show_graph_tab())
         self.close_button = QPushButton("Close")
         self.close_button.clicked.connect(self.reject)
         self.button_layout.addWidget(self.clear_button)
@@ -230,25 +234,9 @@ class TimeSeriesVarSelectionDialog(QDialog):
             return
         file_name = selected_items[0].text()
         file_path = next(f for f in self.selected_files if os.path.basename(f) == file_name)
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read(1000)  # Limit to first 1000 chars
-            preview_dialog = QDialog(self)
-            preview_dialog.setWindowTitle(f"Preview: {file_name}")
-            layout = QVBoxLayout()
-            text_edit = QTextEdit()
-            text_edit.setReadOnly(True)
-            text_edit.setText(content)
-            layout.addWidget(text_edit)
-            close_button = QPushButton("Close")
-            close_button.clicked.connect(preview_dialog.accept)
-            layout.addWidget(close_button)
-            preview_dialog.setLayout(layout)
-            preview_dialog.resize(600, 400)
-            preview_dialog.exec_()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to preview file: {str(e)}")
+        open_file_preview(file_path, self)
 
+    @profiled("show graph")
     def show_graph_tab(self):
         """Create and display the time series graph."""
         selected_vars = [checkbox.text() for checkbox in self.variables_widget.findChildren(QCheckBox) if checkbox.isChecked()]
@@ -274,8 +262,7 @@ class TimeSeriesVarSelectionDialog(QDialog):
             return
 
         if self.graph_window:
-            self.graph_window.plot_data = self.plot_data
-            self.graph_window.refresh_plot()
+            self.graph_window.set_data(self.data, self.plot_data)
         else:
             self.graph_window = GraphWindow(
                 self.plot_data,
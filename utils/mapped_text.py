@@ -0,0 +1,104 @@
+import mmap
+
+import numpy as np
+
+# Bytes scanned per step when indexing line starts (bounds the temporary arrays)
+LINE_INDEX_CHUNK_BYTES = 16 * 1024 * 1024
+
+class MappedTextFile:
+    """Read-only, memory-mapped text file with a line-offset index.
+
+    Only the index of line start offsets is kept in memory; lines are decoded on
+    demand, so files of any size can be paged through.
+    """
+    def __init__(self, file_path, encoding="utf-8"):
+        """Map a file and index its lines.
+
+        Args:
+            file_path (str): File to open.
+            encoding (str): Encoding used to decode lines (undecodable bytes are replaced).
+        """
+        self.file_path = file_path
+        self.encoding = encoding
+        self._file = open(file_path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._data = b""
+        except BaseException:
+            self._file.close()
+            raise
+        self.size = len(self._data)
+        self.line_starts = self._index_lines()
+
+    def _index_lines(self):
+        """Return the byte offset of every line start."""
+        starts = [np.zeros(1, dtype=np.int64)]
+        for offset in range(0, self.size, LINE_INDEX_CHUNK_BYTES):
+            chunk = np.frombuffer(self._data[offset:offset + LINE_INDEX_CHUNK_BYTES], dtype=np.uint8)
+            starts.append(np.flatnonzero(chunk == 10).astype(np.int64) + offset + 1)
+        starts = np.concatenate(starts)
+        # A trailing newline does not open another line
+        if len(starts) > 1 and starts[-1] == self.size:
+            starts = starts[:-1]
+        return starts
+
+    @property
+    def line_count(self):
+        """Number of lines in the file (0 for an empty file)."""
+        return len(self.line_starts) if self.size else 0
+
+    def lines(self, first, count):
+        """Decode a window of lines.
+
+        Args:
+            first (int): Index of the first line.
+            count (int): Maximum number of lines.
+        Returns:
+            list: The lines, without line terminators.
+        """
+        first = max(0, min(first, self.line_count))
+        last = min(first + count, self.line_count)
+        if first >= last:
+            return []
+        start = int(self.line_starts[first])
+        end = int(self.line_starts[last]) if last < self.line_count else self.size
+        text = self._data[start:end].decode(self.encoding, errors="replace")
+        # Split on "\n" only, as the offset index does (splitlines() also breaks on form feeds etc.)
+        lines = text.split("\n")[:last - first]
+        return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+    def line_of_offset(self, offset):
+        """Return the index of the line containing a byte offset."""
+        return int(np.searchsorted(self.line_starts, offset, side="right")) - 1
+
+    def find_line_prefix(self, prefix):
+        """Find the lines that start with a prefix.
+
+        Args:
+            prefix (str): Text the lines start with (e.g. "*RUN").
+        Returns:
+            list: (line index, line text) tuples in file order.
+        """
+        needle = prefix.encode(self.encoding)
+        found = []
+        position = self._data.find(needle)
+        while position != -1:
+            if position == 0 or self._data[position - 1:position] == b"\n":
+                line = self.line_of_offset(position)
+                found.append((line, self.lines(line, 1)[0].strip()))
+            position = self._data.find(needle, position + 1)
+        return found
+
+    def close(self):
+        """Unmap and close the file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,252 @@
+"""Opt-in profiling of the main processing stages.
+
+Stages (file load, normalization, index build, plot data, rendering,
+statistics, export) are wrapped in `profile_span` / `profiled`. While
+profiling is off these cost one flag check. While it is on, each span records
+its wall time, peak traced memory and number of calls, and the outermost span
+of a thread (the "operation", e.g. one click) also runs cProfile. tracemalloc's
+peak is process-wide, so only main-thread spans reset and record it (their peak
+also includes whatever worker threads allocated meanwhile); spans of worker
+threads report no peak memory. The last
+finished operation of the main (GUI) thread is kept and sent to listeners such
+as the diagnostics panel; operations of worker threads (e.g. the statistics
+prewarm) are tagged as background and kept apart, so they do not replace it.
+
+Profiling is enabled with GBUILD_PROFILE=1 or from the Options dialog.
+"""
+import os
+import io
+import sys
+import json
+import time
+import pstats
+import cProfile
+import platform
+import threading
+import functools
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# Environment variable enabling profiling at startup (1, true, yes or on)
+PROFILE_ENV_VAR = "GBUILD_PROFILE"
+# Functions listed in an operation's cProfile summary (by cumulative time)
+PROFILE_TOP_FUNCTIONS = 25
+# Version of the exported JSON trace
+TRACE_VERSION = 1
+
+_enabled = False
+# Whether tracemalloc was started here (and so may be stopped here)
+_started_tracemalloc = False
+# Span stack of the current thread
+_local = threading.local()
+# cProfile can only run once per process; a second concurrent operation is timed without it
+_cprofile_lock = threading.Lock()
+_listeners = []
+_last_operation = None
+_last_background_operation = None
+
+def is_enabled():
+    """Return True if profiling is on."""
+    return _enabled
+
+def set_enabled(enabled):
+    """Turn profiling on or off (memory tracing starts and stops with it).
+
+    Args:
+        enabled (bool): New state.
+    """
+    global _enabled, _started_tracemalloc
+    enabled = bool(enabled)
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    elif not enabled and _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+    _enabled = enabled
+
+def add_listener(callback):
+    """Call `callback(operation)` whenever a main-thread operation finishes."""
+    _listeners.append(callback)
+
+def remove_listener(callback):
+    """Stop notifying a listener added with `add_listener`."""
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+def last_operation(background=False):
+    """Return the last finished operation (see `profile_span`), or None.
+
+    Args:
+        background (bool): Return the last operation of a worker thread instead.
+    """
+    return _last_background_operation if background else _last_operation
+
+def _traced_memory():
+    """(current, peak) traced bytes, or zeros if tracemalloc is off."""
+    return tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+
+def _reset_peak():
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+
+def _top_functions(profiler):
+    """Summarize a cProfile run: total function calls and the top functions by cumulative time."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    functions = []
+    for (file_name, line, name), (primitive_calls, calls, total_time, cumulative_time, _) in stats.stats.items():
+        if file_name == __file__:
+            continue  # The span wrappers themselves
+        functions.append({
+            "function": f"{os.path.basename(file_name)}:{line}({name})" if line else name,
+            "calls": calls,
+            "total_time": total_time,
+            "cumulative_time": cumulative_time
+        })
+    functions.sort(key=lambda f: f["cumulative_time"], reverse=True)
+    return stats.total_calls, functions[:PROFILE_TOP_FUNCTIONS]
+
+def _finish_operation(operation):
+    """Store a finished operation and notify the listeners (main-thread operations only)."""
+    global _last_operation, _last_background_operation
+    if operation["background"]:
+        _last_background_operation = operation
+        return
+    _last_operation = operation
+    for callback in list(_listeners):
+        try:
+            callback(operation)
+        except Exception as e:
+            print(f"Warning: profiling listener failed: {e}")
+
+@contextmanager
+def profile_span(stage):
+    """Time a stage; the outermost span of a thread becomes the profiled operation.
+
+    Nested spans of a stage that is already open are merged into it, so
+    recursive or layered calls are not counted twice. Peak memory is the
+    process-wide traced peak during the span, above its starting usage; it is
+    only measured on the main thread (None elsewhere), since resetting the peak
+    from a worker would corrupt the main thread's measurement.
+
+    Args:
+        stage (str): Stage name (e.g. "file load", "build_plot_data").
+    """
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    if not _enabled or any(frame["stage"] == stage for frame in stack):
+        yield
+        return
+
+    background = threading.current_thread() is not threading.main_thread()
+    current, peak = _traced_memory()
+    if stack:
+        stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+        operation = stack[0]["operation"]
+    else:
+        operation = {
+            "operation": stage,
+            "started": datetime.now().isoformat(timespec="milliseconds"),
+            "thread": threading.current_thread().name,
+            "background": background,
+            "stages": {}
+        }
+    if not background:
+        _reset_peak()
+
+    profiler = None
+    if not stack and _cprofile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) is already active
+            profiler = None
+            _cprofile_lock.release()
+
+    frame = {"stage": stage, "operation": operation, "base": current, "peak": current, "start": time.perf_counter()}
+    stack.append(frame)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - frame["start"]
+        stack.pop()
+        peak = max(frame["peak"], _traced_memory()[1])
+        record = operation["stages"].setdefault(
+            stage, {"calls": 0, "wall_time": 0.0, "peak_memory": None if background else 0}
+        )
+        record["calls"] += 1
+        record["wall_time"] += elapsed
+        if not background:
+            record["peak_memory"] = max(record["peak_memory"], peak - frame["base"])
+
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+        else:
+            operation["wall_time"] = elapsed
+            operation["peak_memory"] = None if background else peak - frame["base"]
+            operation["function_calls"], operation["top_functions"] = None, []
+            if profiler is not None:
+                profiler.disable()
+                _cprofile_lock.release()
+                operation["function_calls"], operation["top_functions"] = _top_functions(profiler)
+            _finish_operation(operation)
+
+def profiled(stage):
+    """Decorator wrapping every call of a function in `profile_span(stage)`.
+
+    Qt signals pass their arguments on to the wrapper, so decorated methods
+    should be connected through a lambda.
+
+    Args:
+        stage (str): Stage name.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with profile_span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def operation_trace(operation=None):
+    """Build the JSON trace of an operation (the last one by default).
+
+    Args:
+        operation (dict, optional): Operation recorded by `profile_span`.
+    Returns:
+        dict: Trace with the run metadata, or None if nothing was profiled.
+    """
+    operation = operation or _last_operation
+    if operation is None:
+        return None
+    return {
+        "version": TRACE_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "argv": sys.argv,
+        **operation
+    }
+
+def export_trace(file_path, operation=None):
+    """Write the JSON trace of an operation (the last one by default).
+
+    Args:
+        file_path (str): Output path.
+        operation (dict, optional): Operation recorded by `profile_span`.
+    Returns:
+        bool: False if there was nothing to export.
+    """
+    trace = operation_trace(operation)
+    if trace is None:
+        return False
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(trace, f, indent=2)
+    return True
+
+if os.environ.get(PROFILE_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on"):
+    set_enabled(True)
@@ -0,0 +1,172 @@
+import os
+import sys
+import zlib
+import threading
+from collections import OrderedDict
+
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from .stats_calculator import STATISTICS_COLUMNS, statistics_table, grouped_statistics, bootstrap_table
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.stats_calculator import STATISTICS_COLUMNS, statistics_table, grouped_statistics, bootstrap_table
+
+# Maximum number of cached results (one per variable and selection)
+STATS_CACHE_MAX_ENTRIES = 5000
+
+class StatisticsCache:
+    """Cache of statistics results keyed by dataset version, variable, run filter and metric set.
+
+    Results are stored per variable, so a table over a different selection only
+    computes the variables it has not seen yet. Variables another thread (e.g.
+    the prewarm) is computing are waited for rather than computed twice.
+    `invalidate` bumps the dataset version whenever the underlying data is reloaded.
+    """
+    def __init__(self, max_entries=STATS_CACHE_MAX_ENTRIES):
+        """Initialize an empty cache.
+
+        Args:
+            max_entries (int): Least recently used results beyond this count are dropped.
+        """
+        self.version = 0
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Keys being computed by some thread -> Event set once they are stored
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._prewarm_thread = None
+
+    def invalidate(self):
+        """Drop every cached result and start a new dataset version."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def _get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return True, self._entries[key]
+        return False, None
+
+    def _put(self, key, value):
+        with self._lock:
+            # Results computed for a previous dataset version are not stored
+            if key[0] != self.version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _cached_rows(self, kind, variables, selection, compute):
+        """Look up one result per variable, computing the missing ones in a single call.
+
+        Variables already being computed by another thread are waited for; if
+        that computation fails or is invalidated, they are computed here.
+        """
+        results, missing, waiting = {}, [], []
+        with self._lock:
+            version = self.version
+            for variable in variables:
+                key = (version, kind, variable) + selection
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    results[variable] = self._entries[key]
+                elif key in self._in_flight:
+                    waiting.append((variable, self._in_flight[key]))
+                else:
+                    self._in_flight[key] = threading.Event()
+                    missing.append(variable)
+
+        if missing:
+            try:
+                computed = compute(missing)
+                for variable in missing:
+                    results[variable] = computed.get(variable)
+                    self._put((version, kind, variable) + selection, results[variable])
+            finally:
+                with self._lock:
+                    for variable in missing:
+                        self._in_flight.pop((version, kind, variable) + selection).set()
+
+        retry = []
+        for variable, event in waiting:
+            event.wait()
+            found, value = self._get((version, kind, variable) + selection)
+            if found:
+                results[variable] = value
+            else:
+                retry.append(variable)
+        if retry:
+            computed = compute(retry)
+            for variable in retry:
+                results[variable] = computed.get(variable)
+        return [(variable, results[variable]) for variable in variables]
+
+    def statistics_table(self, data, variables, run=None, metrics=None):
+        """Cached `stats_calculator.statistics_table`."""
+        metrics = tuple(STATISTICS_COLUMNS if metrics is None else metrics)
+        return self._cached_rows(
+            "table", variables, (run, metrics),
+            lambda missing: dict(statistics_table(data, missing, run, list(metrics)))
+        )
+
+    def grouped_statistics(self, data, by, variables, metrics=None):
+        """Cached `stats_calculator.grouped_statistics`, in the same (variable, group, stats) format."""
+        by = tuple(by)
+        metrics = tuple(STATISTICS_COLUMNS if metrics is None else metrics)
+
+        def compute(missing):
+            rows = {variable: [] for variable in missing}
+            for variable, group, stats in grouped_statistics(data, by, missing, list(metrics)):
+                rows[variable].append((group, stats))
+            return rows
+
+        cached = self._cached_rows("grouped", variables, (by, metrics), compute)
+        return [(variable, group, stats) for variable, rows in cached for group, stats in rows]
+
+    def bootstrap_table(self, data, variables, run=None, metrics=None, n_resamples=1000, confidence=0.95):
+        """Cached `stats_calculator.bootstrap_table`.
+
+        Each variable is resampled with its own seed, derived from the variable and
+        the selection, so its intervals do not depend on which other variables
+        were missing from the cache at the same time.
+        """
+        metrics = tuple(metrics) if metrics is not None else None
+        selection = (run, metrics, n_resamples, confidence)
+
+        def compute(missing):
+            kwargs = {"metrics": list(metrics)} if metrics is not None else {}
+            rows = {}
+            for variable in missing:
+                seed = zlib.crc32(repr((variable,) + selection).encode("utf-8"))
+                rows.update(bootstrap_table(data, [variable], run, n_resamples=n_resamples,
+                                            confidence=confidence, seed=seed, **kwargs))
+            return rows
+
+        return self._cached_rows("bootstrap", variables, selection, compute)
+
+    def prewarm(self, data, variables, metrics=None, groupings=()):
+        """Compute the statistics table (and grouped tables) in a background thread.
+
+        Args:
+            data (list): List of data entries.
+            variables (list): Variable codes of the table.
+            metrics (list, optional): Metric names (defaults to STATISTICS_COLUMNS).
+            groupings (iterable): Grouping level tuples to compute as well.
+        Returns:
+            threading.Thread: The started daemon thread.
+        """
+        def run():
+            try:
+                self.statistics_table(data, variables, metrics=metrics)
+                for levels in groupings:
+                    if levels:
+                        self.grouped_statistics(data, levels, variables, metrics)
+            except Exception as e:
+                print(f"Warning: could not pre-compute statistics: {e}")
+
+        self._prewarm_thread = threading.Thread(target=run, name="statistics-prewarm", daemon=True)
+        self._prewarm_thread.start()
+        return self._prewarm_thread
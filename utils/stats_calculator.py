@@ -1,12 +1,202 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-from scipy.stats import pearsonr
 
-def calculate_statistics(observed, simulated):
+# Attempts to realize a relative import, in case of failure, fallback to the project root
+try:
+    from .profiler import profiled
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.profiler import profiled
+
+# Default column order of the statistics table (after the variable name)
+STATISTICS_COLUMNS = [
+    'Mean (Obs)', 'Mean (Sim)', 'Mean Ratio', 'Std.Dev (Obs)', 'Std.Dev (Sim)', 'r-Square',
+    'Mean Diff.', 'Mean Abs. Diff.', 'RMSE', 'd-stat', 'Used Obs.', 'Total Number'
+]
+# Sufficient statistics every metric is written against (see `statistics_from_sums`)
+SUFFICIENT_STATISTICS = (
+    'n', 'sum_obs', 'sum_sim', 'sum_abs_diff', 'sse', 'n_ape', 'sum_ape',
+    'ss_obs', 'ss_sim', 'cross', 'agreement'
+)
+# Metrics offered with bootstrap confidence intervals
+BOOTSTRAP_METRICS = ('RMSE', 'd-stat', 'r-Square', 'Mean Diff.')
+# Upper bound of resample x pair cells evaluated at once (bounds the index matrix memory)
+BOOTSTRAP_CHUNK_CELLS = 2000000
+# Above this many cells in total, the resamples are split across processes
+BOOTSTRAP_PARALLEL_CELLS = 20000000
+# Ways `align_series` can match observations to simulated values
+ALIGNMENT_MODES = ("exact", "nearest", "interpolate")
+# Entry attributes the statistics can be grouped by
+GROUP_LEVELS = ("run", "treatment", "experiment", "crop")
+
+# Registered metrics: name -> (function of the sufficient statistics, is a count)
+METRICS = {}
+
+def register_metric(name, func, is_count=False):
+    """Register an evaluation metric.
+
+    Metrics are written against the sufficient statistics, which are computed
+    once per variable or group, so adding a metric adds no pass over the data.
+
+    Args:
+        name (str): Column name shown in the statistics table.
+        func (callable): Takes the sums dict (see `statistics_from_sums`) and returns an array.
+        is_count (bool): Format the value as an integer.
+    """
+    METRICS[name] = (func, is_count)
+
+def _mean_obs(s):
+    return s['sum_obs'] / s['n']
+
+def _mean_sim(s):
+    return s['sum_sim'] / s['n']
+
+def _correlation(s):
+    return s['cross'] / np.sqrt(s['ss_obs'] * s['ss_sim'])
+
+def _rmse(s):
+    return np.sqrt(s['sse'] / s['n'])
+
+def _kling_gupta(s):
+    """Kling-Gupta efficiency: 1 - sqrt((r - 1)^2 + (alpha - 1)^2 + (beta - 1)^2)."""
+    alpha = np.sqrt(s['ss_sim'] / s['ss_obs'])
+    beta = s['sum_sim'] / s['sum_obs']
+    return 1 - np.sqrt((_correlation(s) - 1) ** 2 + (alpha - 1) ** 2 + (beta - 1) ** 2)
+
+register_metric('Mean (Obs)', _mean_obs)
+register_metric('Mean (Sim)', _mean_sim)
+register_metric('Mean Ratio', lambda s: np.where(_mean_obs(s) != 0, _mean_sim(s) / _mean_obs(s), np.nan))
+register_metric('Std.Dev (Obs)', lambda s: np.sqrt(s['ss_obs'] / s['n']))
+register_metric('Std.Dev (Sim)', lambda s: np.sqrt(s['ss_sim'] / s['n']))
+register_metric('r-Square', lambda s: _correlation(s) ** 2)
+register_metric('Mean Diff.', lambda s: _mean_sim(s) - _mean_obs(s))
+register_metric('Mean Abs. Diff.', lambda s: s['sum_abs_diff'] / s['n'])
+register_metric('RMSE', _rmse)
+# Willmott's index of agreement
+register_metric('d-stat', lambda s: 1 - s['sse'] / s['agreement'])
+register_metric('Used Obs.', lambda s: s['n'], is_count=True)
+register_metric('Total Number', lambda s: s['n'], is_count=True)
+# Nash-Sutcliffe efficiency
+register_metric('NSE', lambda s: 1 - s['sse'] / s['ss_obs'])
+register_metric('KGE', _kling_gupta)
+# RMSE as a percentage of the observed mean
+register_metric('nRMSE (%)', lambda s: 100 * _rmse(s) / _mean_obs(s))
+# Percent bias, positive when the model underestimates: 100 * sum(O - S) / sum(O)
+register_metric('PBIAS (%)', lambda s: 100 * (s['sum_obs'] - s['sum_sim']) / s['sum_obs'])
+# Mean absolute percentage error over the pairs with a non-zero observation
+register_metric('MAPE (%)', lambda s: 100 * s['sum_ape'] / s['n_ape'])
+
+def calculate_statistics_batch(observed, simulated, mask=None, metrics=None):
+    """Calculate every statistical measure for many variables in one vectorized pass.
+
+    Each row holds the observed/simulated pairs of one variable; rows shorter than
+    the widest one are padded and excluded through `mask`.
+
+    Args:
+        observed (np.ndarray): 2-D array (variables x pairs) of observed values.
+        simulated (np.ndarray): 2-D array of simulated values, same shape.
+        mask (np.ndarray, optional): Boolean array, True where a pair is valid.
+            Defaults to every finite pair.
+        metrics (list, optional): Registered metric names (defaults to STATISTICS_COLUMNS).
+    Returns:
+        dict: Measure name -> 1-D float array with one value per row (NaN where undefined),
+        plus 'n', the number of valid pairs per row.
+    """
+    observed = np.asarray(observed, dtype=float)
+    simulated = np.asarray(simulated, dtype=float)
+    if mask is None:
+        mask = np.isfinite(observed) & np.isfinite(simulated)
+    obs = np.where(mask, observed, 0.0)
+    sim = np.where(mask, simulated, 0.0)
+    n = mask.sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # First stage: raw sums
+        sum_obs = obs.sum(axis=1)
+        sum_sim = sim.sum(axis=1)
+        diff = sim - obs
+        nonzero = mask & (obs != 0)
+        sums = {
+            'n': n,
+            'sum_obs': sum_obs,
+            'sum_sim': sum_sim,
+            'sum_abs_diff': np.abs(diff).sum(axis=1),
+            'sse': (diff ** 2).sum(axis=1),
+            # Absolute percentage errors, defined where the observation is not zero
+            'n_ape': nonzero.sum(axis=1),
+            'sum_ape': (np.abs(diff) / np.where(nonzero, np.abs(obs), np.inf)).sum(axis=1)
+        }
+
+        # Second stage: sums centered on the row means (masked entries contribute 0)
+        mean_obs = sum_obs / n
+        mean_sim = sum_sim / n
+        dev_obs = np.where(mask, obs - mean_obs[:, None], 0.0)
+        dev_sim = np.where(mask, sim - mean_sim[:, None], 0.0)
+        sums['ss_obs'] = (dev_obs ** 2).sum(axis=1)
+        sums['ss_sim'] = (dev_sim ** 2).sum(axis=1)
+        sums['cross'] = (dev_obs * dev_sim).sum(axis=1)
+        # Willmott's potential error: (|S - mean(O)| + |O - mean(O)|)^2
+        sums['agreement'] = (np.where(mask, np.abs(sim - mean_obs[:, None]) + np.abs(dev_obs), 0.0) ** 2).sum(axis=1)
+    return statistics_from_sums(sums, metrics)
+
+def statistics_from_sums(sums, metrics=None):
+    """Evaluate registered metrics on per-row sufficient statistics.
+
+    Args:
+        sums (dict): Arrays named in SUFFICIENT_STATISTICS: counts and raw sums
+            ('n', 'sum_obs', 'sum_sim', 'sum_abs_diff', 'sse', 'n_ape', 'sum_ape')
+            and sums centered on the means ('ss_obs', 'ss_sim', 'cross', 'agreement').
+        metrics (list, optional): Registered metric names (defaults to STATISTICS_COLUMNS).
+    Returns:
+        dict: Measure name -> 1-D float array with one value per row (NaN where undefined),
+        plus 'n', the number of valid pairs per row.
+    """
+    names = STATISTICS_COLUMNS if metrics is None else metrics
+    unknown = [name for name in names if name not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metric(s): {', '.join(unknown)}")
+    batch = {'n': np.asarray(sums['n'])}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for name in names:
+            batch[name] = np.asarray(METRICS[name][0](sums), dtype=float)
+    return batch
+
+def format_statistics(batch, row=0):
+    """Format one row of `calculate_statistics_batch` output for display.
+
+    Args:
+        batch (dict): Output of `calculate_statistics_batch`.
+        row (int): Row (variable) to format.
+    Returns:
+        dict: Metric name -> value rounded to 2 decimals ('N/A' where undefined),
+        in the order the metrics were computed, or None if the row has no pairs.
+    """
+    if int(batch['n'][row]) == 0:
+        return None
+    stats = {}
+    for key in batch:
+        if key not in METRICS:
+            continue
+        value = batch[key][row]
+        if METRICS[key][1]:
+            stats[key] = int(value)
+        elif not np.isfinite(value):
+            stats[key] = 'N/A'
+        else:
+            stats[key] = round(float(value), 2)
+    return stats
+
+@profiled("statistics")
+def calculate_statistics(observed, simulated, metrics=None):
     """Calculate statistical measures for observed vs simulated data.
     
     Args:
         observed (list): List of observed values.
         simulated (list): List of simulated values.
+        metrics (list, optional): Registered metric names (defaults to STATISTICS_COLUMNS).
     
     Returns:
         dict: Statistical measures (mean, std dev, r-square, etc.) or None if invalid input.
@@ -16,40 +206,535 @@ def calculate_statistics(observed, simulated):
     if n_obs == 0 or len(simulated) != n_obs:
         return None
 
-    # Calculate basic statistics
-    mean_obs = np.mean(observed)
-    mean_sim = np.mean(simulated)
-    mean_ratio = mean_sim / mean_obs if mean_obs != 0 else float('nan')
-    std_dev_obs = np.std(observed)
-    std_dev_sim = np.std(simulated)
-    mean_diff = mean_sim - mean_obs
-    mean_abs_diff = np.mean(np.abs(np.array(simulated) - np.array(observed)))
-    rmse = np.sqrt(np.mean((np.array(simulated) - np.array(observed)) ** 2))
-    
-    # r-Square (using Pearson correlation)
-    corr, _ = pearsonr(observed, simulated)
-    r_square = corr ** 2 if not np.isnan(corr) else float('nan')
-    
-    # d-stat (Willmott's index of agreement)
-    diff = np.array(simulated) - np.array(observed)
-    d_stat = 1 - (np.sum(diff ** 2) / np.sum((np.abs(diff) + np.abs(diff)) ** 2)) if n_obs > 0 else float('nan')
-    
-    # Return formatted statistics dictionary
-    return {
-        'Mean (Obs)': round(mean_obs, 2),
-        'Mean (Sim)': round(mean_sim, 2),
-        'Mean Ratio': round(mean_ratio, 2) if not np.isnan(mean_ratio) else 'N/A',
-        'Std.Dev (Obs)': round(std_dev_obs, 2),
-        'Std.Dev (Sim)': round(std_dev_sim, 2),
-        'r-Square': round(r_square, 2) if not np.isnan(r_square) else 'N/A',
-        'Mean Diff.': round(mean_diff, 2),
-        'Mean Abs. Diff.': round(mean_abs_diff, 2),
-        'RMSE': round(rmse, 2),
-        'd-stat': round(d_stat, 2) if not np.isnan(d_stat) else 'N/A',
-        'Used Obs.': n_obs,
-        'Total Number': n_obs
+    batch = calculate_statistics_batch(
+        np.asarray(observed, dtype=float)[None, :],
+        np.asarray(simulated, dtype=float)[None, :],
+        np.ones((1, n_obs), dtype=bool),
+        metrics
+    )
+    return format_statistics(batch)
+
+def iter_entry_pairs(data, variables=None, run=None):
+    """Yield the observed and simulated values of each variable, entry by entry.
+
+    Within each run, measured and simulated values are paired by date when both
+    carry dates (see `align_series`), otherwise by position.
+
+    Args:
+        data (list): List of data entries containing run and variable information.
+        variables (iterable, optional): Variable codes to extract (all if None).
+        run (str, optional): Specific run to filter by.
+    Yields:
+        tuple: (entry, variable, observed values, simulated values).
+    """
+    wanted = set(variables) if variables is not None else None
+
+    for entry in data:
+        if not isinstance(entry, dict) or 'values' not in entry:
+            continue
+        if run and entry.get("run") != run:
+            continue
+        values = entry['values']
+
+        # Handle evaluate.out format (values as dict with measured/simulated)
+        if isinstance(values, dict):
+            for variable, value_dict in values.items():
+                if wanted is not None and variable not in wanted:
+                    continue
+                observed, simulated = [], []
+                try:
+                    if value_dict.get('measured') is not None:
+                        observed.append(float(value_dict['measured']))
+                    if value_dict.get('simulated') is not None:
+                        simulated.append(float(value_dict['simulated']))
+                except (ValueError, TypeError):
+                    pass
+                yield entry, variable, observed, simulated
+
+        # Handle .out format (values as list with cde and type)
+        elif isinstance(values, list):
+            by_variable = {}
+            for var_entry in values:
+                if not isinstance(var_entry, dict):
+                    continue
+                variable = var_entry.get('cde')
+                if wanted is not None and variable not in wanted:
+                    continue
+                if var_entry.get('type') in ('measured', 'simulated'):
+                    by_variable.setdefault(variable, {})[var_entry['type']] = var_entry
+
+            for variable, typed in by_variable.items():
+                obs_vals = typed.get('measured', {}).get('values')
+                sim_vals = typed.get('simulated', {}).get('values')
+                if not (obs_vals and sim_vals):
+                    continue
+                obs_dates = typed['measured'].get('x_calendar')
+                sim_dates = typed['simulated'].get('x_calendar')
+                if obs_dates and sim_dates:
+                    observed, simulated, _, _ = align_series(obs_dates, obs_vals, sim_dates, sim_vals)
+                    yield entry, variable, observed.tolist(), simulated.tolist()
+                    continue
+                observed, simulated = [], []
+                for o, s in zip(obs_vals, sim_vals):
+                    try:
+                        o, s = float(o), float(s)
+                    except (ValueError, TypeError):
+                        continue
+                    observed.append(o)
+                    simulated.append(s)
+                yield entry, variable, observed, simulated
+
+def collect_variable_data(data, variables=None, run=None):
+    """Extract observed and simulated values for many variables in a single scan of the data.
+
+    Args:
+        data (list): List of data entries containing run and variable information.
+        variables (iterable, optional): Variable codes to extract (all if None).
+        run (str, optional): Specific run to filter by.
+    Returns:
+        dict: Variable code -> (observed values, simulated values) lists.
+    """
+    pairs = {}
+    for _, variable, observed, simulated in iter_entry_pairs(data, variables, run):
+        all_observed, all_simulated = pairs.setdefault(variable, ([], []))
+        all_observed.extend(observed)
+        all_simulated.extend(simulated)
+    return pairs
+
+def pack_variable_arrays(pairs, variables):
+    """Pack per-variable observed/simulated lists into padded 2-D arrays.
+
+    Variables whose observed and simulated counts differ get an empty row,
+    matching `calculate_statistics`, which rejects such input.
+
+    Args:
+        pairs (dict): Output of `collect_variable_data`.
+        variables (list): Variable codes, one row each, in order.
+    Returns:
+        tuple: (observed, simulated, mask) arrays of shape (len(variables), max pairs).
+    """
+    lengths = []
+    for variable in variables:
+        observed, simulated = pairs.get(variable, ([], []))
+        lengths.append(len(observed) if len(observed) == len(simulated) else 0)
+    width = max(lengths, default=0)
+
+    obs = np.zeros((len(variables), width))
+    sim = np.zeros((len(variables), width))
+    mask = np.arange(width)[None, :] < np.asarray(lengths, dtype=int)[:, None]
+    for row, (variable, length) in enumerate(zip(variables, lengths)):
+        if length:
+            observed, simulated = pairs[variable]
+            obs[row, :length] = observed
+            sim[row, :length] = simulated
+    return obs, sim, mask
+
+@profiled("statistics")
+def statistics_table(data, variables, run=None, metrics=None):
+    """Compute the formatted statistics of many variables at once.
+
+    Args:
+        data (list): List of data entries.
+        variables (list): Variable codes, one table row each.
+        run (str, optional): Specific run to filter by.
+        metrics (list, optional): Registered metric names (defaults to STATISTICS_COLUMNS).
+    Returns:
+        list: (variable, stats) tuples where stats is a dict as returned by
+        `calculate_statistics`, or None if the variable has no valid pairs.
+    """
+    pairs = collect_variable_data(data, variables, run)
+    batch = calculate_statistics_batch(*pack_variable_arrays(pairs, variables), metrics=metrics)
+    return [(variable, format_statistics(batch, row)) for row, variable in enumerate(variables)]
+
+def _bootstrap_chunk(observed, simulated, lengths, n_resamples, seed, metrics):
+    """Evaluate `n_resamples` bootstrap resamples of every row (runs in a worker process).
+
+    One index matrix is drawn for all rows and resamples; row i only draws
+    indices below lengths[i], and its padding is masked out.
+
+    Returns:
+        dict: Metric name -> array of shape (rows, n_resamples).
+    """
+    rng = np.random.default_rng(seed)
+    n_rows, width = observed.shape
+    rows = np.repeat(np.arange(n_rows), n_resamples)
+    row_lengths = lengths[rows]
+    indices = (rng.random((len(rows), width)) * row_lengths[:, None]).astype(np.int64)
+    mask = np.arange(width)[None, :] < row_lengths[:, None]
+    batch = calculate_statistics_batch(observed[rows[:, None], indices], simulated[rows[:, None], indices], mask, metrics)
+    return {name: batch[name].reshape(n_rows, n_resamples) for name in metrics}
+
+def bootstrap_statistics(observed, simulated, mask=None, metrics=BOOTSTRAP_METRICS, n_resamples=1000,
+                         confidence=0.95, seed=None, workers=None):
+    """Compute percentile bootstrap confidence intervals for many variables at once.
+
+    Resamples are evaluated as padded 2-D batches by `calculate_statistics_batch`,
+    in chunks of at most BOOTSTRAP_CHUNK_CELLS cells. Large requests are spread
+    over worker processes. Each chunk has its own seed spawned from `seed`, so
+    results do not depend on the number of workers.
+
+    Args:
+        observed (np.ndarray): 2-D array (variables x pairs) of observed values.
+        simulated (np.ndarray): 2-D array of simulated values, same shape.
+        mask (np.ndarray, optional): Boolean array, True where a pair is valid.
+            Valid pairs must be left-aligned (as produced by `pack_variable_arrays`).
+        metrics (tuple): Registered metric names.
+        n_resamples (int): Number of bootstrap resamples per variable.
+        confidence (float): Confidence level of the intervals.
+        seed (int, optional): Seed for reproducible intervals.
+        workers (int, optional): Worker processes; defaults to the CPU count for large requests.
+    Returns:
+        dict: Metric name -> (low, high) tuple of 1-D arrays, one value per row
+        (NaN where undefined or the row has fewer than 2 pairs).
+    """
+    observed = np.asarray(observed, dtype=float)
+    simulated = np.asarray(simulated, dtype=float)
+    if mask is None:
+        mask = np.isfinite(observed) & np.isfinite(simulated)
+    metrics = list(metrics)
+    lengths = mask.sum(axis=1)
+    n_rows, width = observed.shape
+    alpha = (1 - confidence) / 2 * 100
+    nan_rows = np.full(n_rows, np.nan)
+    if not n_rows or not width or not (lengths > 1).any():
+        return {name: (nan_rows, nan_rows.copy()) for name in metrics}
+
+    # Rows shorter than 2 pairs give no usable interval; resample a dummy pair and discard
+    sample_lengths = np.maximum(lengths, 1)
+    resamples_per_chunk = max(1, BOOTSTRAP_CHUNK_CELLS // (n_rows * width))
+    chunk_sizes = [min(resamples_per_chunk, n_resamples - start) for start in range(0, n_resamples, resamples_per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    args = [(observed, simulated, sample_lengths, size, chunk_seed, metrics) for size, chunk_seed in zip(chunk_sizes, seeds)]
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if n_rows * width * n_resamples > BOOTSTRAP_PARALLEL_CELLS else 1
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_bootstrap_chunk, *zip(*args)))
+    else:
+        chunks = [_bootstrap_chunk(*chunk_args) for chunk_args in args]
+
+    intervals = {}
+    for name in metrics:
+        values = np.concatenate([chunk[name] for chunk in chunks], axis=1)
+        values[lengths < 2] = np.nan
+        with np.errstate(invalid='ignore'):
+            # All-NaN rows (e.g. constant series for r-Square) are reported as NaN
+            finite = np.isfinite(values).any(axis=1)
+            low, high = np.full(n_rows, np.nan), np.full(n_rows, np.nan)
+            if finite.any():
+                low[finite], high[finite] = np.nanpercentile(values[finite], [alpha, 100 - alpha], axis=1)
+        intervals[name] = (low, high)
+    return intervals
+
+@profiled("statistics")
+def bootstrap_table(data, variables, run=None, metrics=BOOTSTRAP_METRICS, n_resamples=1000,
+                    confidence=0.95, seed=None):
+    """Compute formatted bootstrap confidence intervals of many variables at once.
+
+    Args:
+        data (list): List of data entries.
+        variables (list): Variable codes, one row each.
+        run (str, optional): Specific run to filter by.
+        metrics (tuple): Registered metric names.
+        n_resamples (int): Number of bootstrap resamples per variable.
+        confidence (float): Confidence level of the intervals.
+        seed (int, optional): Seed for reproducible intervals.
+    Returns:
+        list: (variable, intervals) tuples where intervals maps each metric to a
+        (low, high) tuple rounded to 2 decimals ('N/A' where undefined), or None
+        if the variable has fewer than 2 valid pairs.
+    """
+    pairs = collect_variable_data(data, variables, run)
+    obs, sim, mask = pack_variable_arrays(pairs, variables)
+    intervals = bootstrap_statistics(obs, sim, mask, metrics, n_resamples, confidence, seed)
+    lengths = mask.sum(axis=1)
+
+    def fmt(value):
+        return 'N/A' if not np.isfinite(value) else round(float(value), 2)
+
+    table = []
+    for row, variable in enumerate(variables):
+        if lengths[row] < 2:
+            table.append((variable, None))
+            continue
+        table.append((variable, {name: (fmt(intervals[name][0][row]), fmt(intervals[name][1][row])) for name in metrics}))
+    return table
+
+class StatisticsAccumulator:
+    """Constant-memory accumulator of the sufficient statistics of one variable.
+
+    Chunks are folded in with the pairwise (Chan et al.) form of Welford's update,
+    so means, sums of squares and the cross product stay numerically stable over
+    any number of chunks. Willmott's agreement term depends on the overall
+    observed mean and is accumulated in a second pass with `update_agreement`.
+    """
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self.n = 0
+        self.mean_obs = 0.0
+        self.mean_sim = 0.0
+        self.ss_obs = 0.0
+        self.ss_sim = 0.0
+        self.cross = 0.0
+        self.sum_abs_diff = 0.0
+        self.sse = 0.0
+        self.n_ape = 0
+        self.sum_ape = 0.0
+        self.agreement = 0.0
+        self.agreement_n = 0
+
+    @staticmethod
+    def _valid_pairs(observed, simulated):
+        obs = np.asarray(observed, dtype=float)
+        sim = np.asarray(simulated, dtype=float)
+        valid = np.isfinite(obs) & np.isfinite(sim)
+        return obs[valid], sim[valid]
+
+    def update(self, observed, simulated):
+        """Fold one chunk of observed/simulated pairs into the accumulator.
+
+        Args:
+            observed (list): Observed values of the chunk.
+            simulated (list): Simulated values, paired by position.
+        """
+        obs, sim = self._valid_pairs(observed, simulated)
+        n_chunk = len(obs)
+        if not n_chunk:
+            return
+        mean_obs, mean_sim = obs.mean(), sim.mean()
+        dev_obs, dev_sim = obs - mean_obs, sim - mean_sim
+        diff = sim - obs
+        nonzero = obs != 0
+
+        # Chan et al. merge of the chunk moments into the running moments
+        n = self.n + n_chunk
+        delta_obs = mean_obs - self.mean_obs
+        delta_sim = mean_sim - self.mean_sim
+        weight = self.n * n_chunk / n
+        self.ss_obs += (dev_obs ** 2).sum() + delta_obs ** 2 * weight
+        self.ss_sim += (dev_sim ** 2).sum() + delta_sim ** 2 * weight
+        self.cross += (dev_obs * dev_sim).sum() + delta_obs * delta_sim * weight
+        self.mean_obs += delta_obs * n_chunk / n
+        self.mean_sim += delta_sim * n_chunk / n
+        self.n = n
+
+        self.sum_abs_diff += np.abs(diff).sum()
+        self.sse += (diff ** 2).sum()
+        self.n_ape += int(nonzero.sum())
+        self.sum_ape += (np.abs(diff[nonzero]) / np.abs(obs[nonzero])).sum()
+
+    def update_agreement(self, observed, simulated):
+        """Second pass: accumulate Willmott's agreement term around the final observed mean.
+
+        Args:
+            observed (list): Observed values of the chunk (same chunks as the first pass).
+            simulated (list): Simulated values, paired by position.
+        """
+        obs, sim = self._valid_pairs(observed, simulated)
+        self.agreement += ((np.abs(sim - self.mean_obs) + np.abs(obs - self.mean_obs)) ** 2).sum()
+        self.agreement_n += len(obs)
+
+    def sums(self):
+        """Return the sufficient statistics in the format of `statistics_from_sums`.
+
+        The agreement term is NaN (d-stat 'N/A') unless the second pass covered every pair.
+        """
+        agreement = self.agreement if self.agreement_n == self.n else np.nan
+        values = {
+            'n': self.n, 'sum_obs': self.mean_obs * self.n, 'sum_sim': self.mean_sim * self.n,
+            'sum_abs_diff': self.sum_abs_diff, 'sse': self.sse, 'n_ape': self.n_ape, 'sum_ape': self.sum_ape,
+            'ss_obs': self.ss_obs, 'ss_sim': self.ss_sim, 'cross': self.cross, 'agreement': agreement
+        }
+        return {key: np.array([value]) for key, value in values.items()}
+
+    def statistics(self, metrics=None):
+        """Return the formatted statistics, as `calculate_statistics` does (None if empty)."""
+        return format_statistics(statistics_from_sums(self.sums(), metrics))
+
+def data_chunks(datasets, variables=None):
+    """Turn a stream of loaded datasets into (variable, observed, simulated) chunks.
+
+    Args:
+        datasets (iterable): Data lists, e.g. a generator loading one file at a time.
+        variables (iterable, optional): Variable codes to extract (all if None).
+    Yields:
+        tuple: (variable, observed values, simulated values) for each run of each dataset.
+    """
+    for data in datasets:
+        for _, variable, observed, simulated in iter_entry_pairs(data or [], variables):
+            if observed and len(observed) == len(simulated):
+                yield variable, observed, simulated
+
+@profiled("statistics")
+def streaming_statistics(chunk_source, metrics=None):
+    """Compute per-variable statistics from chunks without holding the series in memory.
+
+    Args:
+        chunk_source: Callable returning a fresh iterable of (variable, observed,
+            simulated) chunks, or a re-iterable such as a list. Both are read twice
+            (the second pass is needed for d-stat). A one-shot iterator is read once
+            and d-stat is reported as 'N/A'.
+        metrics (list, optional): Registered metric names (defaults to STATISTICS_COLUMNS).
+    Returns:
+        dict: Variable code -> statistics dict as returned by `calculate_statistics`
+        (None for variables without pairs).
+    """
+    if callable(chunk_source):
+        open_chunks = chunk_source
+    elif iter(chunk_source) is chunk_source:
+        open_chunks = None
+    else:
+        open_chunks = lambda: chunk_source
+
+    accumulators = {}
+    first_pass = open_chunks() if open_chunks else chunk_source
+    for variable, observed, simulated in first_pass:
+        accumulators.setdefault(variable, StatisticsAccumulator()).update(observed, simulated)
+
+    if open_chunks:
+        for variable, observed, simulated in open_chunks():
+            if variable in accumulators:
+                accumulators[variable].update_agreement(observed, simulated)
+    else:
+        print("Warning: single-pass chunk source, d-stat is not available.")
+
+    return {variable: accumulator.statistics(metrics) for variable, accumulator in accumulators.items()}
+
+def _group_label(entry, level):
+    """Return the label of an entry for one grouping level ("Unknown" if missing)."""
+    value = entry.get(level)
+    # Older loaders only record the run name, which is the treatment for OUT/evaluate files
+    if value is None and level == "treatment":
+        value = entry.get("run")
+    return str(value) if value is not None else "Unknown"
+
+def collect_grouped_columns(data, by, variables=None):
+    """Flatten the observed/simulated pairs of the data into columnar arrays with group labels.
+
+    Args:
+        data (list): List of data entries.
+        by (list): Grouping levels, any of GROUP_LEVELS.
+        variables (iterable, optional): Variable codes to extract (all if None).
+    Returns:
+        dict: "variable" and one column per level (object arrays) plus
+        "observed" and "simulated" (float arrays), one item per valid pair.
+    """
+    columns = {"variable": [], "observed": [], "simulated": []}
+    for level in by:
+        columns[level] = []
+    for entry, variable, observed, simulated in iter_entry_pairs(data, variables):
+        count = min(len(observed), len(simulated))
+        if not count:
+            continue
+        columns["variable"].extend([variable] * count)
+        for level in by:
+            columns[level].extend([_group_label(entry, level)] * count)
+        columns["observed"].extend(observed[:count])
+        columns["simulated"].extend(simulated[:count])
+
+    result = {key: np.asarray(values, dtype=object) for key, values in columns.items()}
+    result["observed"] = np.asarray(columns["observed"], dtype=float)
+    result["simulated"] = np.asarray(columns["simulated"], dtype=float)
+    return result
+
+def grouped_sums(codes, observed, simulated):
+    """Compute the sufficient statistics of every group in one sort-and-segment pass.
+
+    Args:
+        codes (np.ndarray): Integer group code of every pair.
+        observed (np.ndarray): Observed values.
+        simulated (np.ndarray): Simulated values.
+    Returns:
+        tuple: (group codes, sums) where sums holds one array item per group in the
+        format expected by `statistics_from_sums`.
+    """
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    obs = observed[order]
+    sim = simulated[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+    if not len(starts):
+        empty = np.array([], dtype=float)
+        return codes, {key: empty for key in SUFFICIENT_STATISTICS}
+    counts = np.diff(np.r_[starts, len(codes)])
+
+    # First pass: raw sums per segment
+    diff = sim - obs
+    sums = {
+        'n': counts,
+        'sum_obs': np.add.reduceat(obs, starts),
+        'sum_sim': np.add.reduceat(sim, starts),
+        'sum_abs_diff': np.add.reduceat(np.abs(diff), starts),
+        'sse': np.add.reduceat(diff ** 2, starts),
+        'n_ape': np.add.reduceat((obs != 0).astype(int), starts),
+        'sum_ape': np.add.reduceat(np.abs(diff) / np.where(obs != 0, np.abs(obs), np.inf), starts)
     }
 
+    # Second pass: deviations from the group means, broadcast back to every pair
+    mean_obs = np.repeat(sums['sum_obs'] / counts, counts)
+    mean_sim = np.repeat(sums['sum_sim'] / counts, counts)
+    dev_obs = obs - mean_obs
+    dev_sim = sim - mean_sim
+    sums['ss_obs'] = np.add.reduceat(dev_obs ** 2, starts)
+    sums['ss_sim'] = np.add.reduceat(dev_sim ** 2, starts)
+    sums['cross'] = np.add.reduceat(dev_obs * dev_sim, starts)
+    sums['agreement'] = np.add.reduceat((np.abs(sim - mean_obs) + np.abs(dev_obs)) ** 2, starts)
+    return codes[starts], sums
+
+@profiled("statistics")
+def grouped_statistics(data, by=("run",), variables=None, metrics=None):
+    """Compute the statistics of every variable broken down by run, treatment, experiment or crop.
+
+    Args:
+        data (list): List of data entries.
+        by (tuple): Grouping levels, any of GROUP_LEVELS (e.g. ("experiment", "treatment")).
+        variables (list, optional): Variable codes to include (all if None), in display order.
+        metrics (list, optional): Registered metric names (defaults to STATISTICS_COLUMNS).
+    Returns:
+        list: (variable, group, stats) tuples ordered by variable then group, where
+        group is a tuple of labels (one per level) and stats is formatted as by
+        `calculate_statistics`.
+    """
+    by = tuple(by)
+    unknown = [level for level in by if level not in GROUP_LEVELS]
+    if unknown:
+        raise ValueError(f"Unknown grouping level(s): {', '.join(unknown)}")
+
+    columns = collect_grouped_columns(data, by, variables)
+    valid = np.isfinite(columns["observed"]) & np.isfinite(columns["simulated"])
+    if not valid.any():
+        return []
+
+    # Encode the key columns as integers and combine them into a single group code
+    names = ["variable"] + list(by)
+    labels, inverses = [], []
+    for name in names:
+        column_labels, inverse = np.unique(columns[name][valid].astype(str), return_inverse=True)
+        if name == "variable" and variables is not None:
+            # Keep the caller's variable order instead of alphabetical order
+            rank = {variable: i for i, variable in enumerate(variables)}
+            order = np.argsort([rank.get(label, len(rank)) for label in column_labels], kind='stable')
+            remap = np.empty_like(order)
+            remap[order] = np.arange(len(order))
+            column_labels = column_labels[order]
+            inverse = remap[inverse]
+        labels.append(column_labels)
+        inverses.append(inverse)
+    dims = tuple(len(column_labels) for column_labels in labels)
+    codes = np.ravel_multi_index(inverses, dims)
+
+    group_codes, sums = grouped_sums(codes, columns["observed"][valid], columns["simulated"][valid])
+    batch = statistics_from_sums(sums, metrics)
+    keys = np.unravel_index(group_codes, dims)
+
+    table = []
+    for row in range(len(group_codes)):
+        variable = str(labels[0][keys[0][row]])
+        group = tuple(str(labels[i][keys[i][row]]) for i in range(1, len(names)))
+        table.append((variable, group, format_statistics(batch, row)))
+    return table
+
 def get_variable_data(data, variable, run=None):
     """Extract observed and simulated values for a given variable from the data.
     
@@ -61,95 +746,183 @@ def get_variable_data(data, variable, run=None):
     Returns:
         tuple: (observed values, simulated values) as lists.
     """
-    observed = []
-    simulated = []
-    
-    for entry in data:
-        # Filter by run if specified
-        if run and entry.get("run") != run:
-            continue
-        
-        if isinstance(entry, dict) and 'values' in entry:
-            values = entry['values']
-            
-            # Handle evaluate.out format (values as dict with measured/simulated)
-            if isinstance(values, dict) and variable in values:
-                value_dict = values[variable]
-                if 'measured' in value_dict and value_dict['measured'] is not None:
-                    try:
-                        observed.append(float(value_dict['measured']))
-                    except (ValueError, TypeError):
-                        continue
-                if 'simulated' in value_dict and value_dict['simulated'] is not None:
-                    try:
-                        simulated.append(float(value_dict['simulated']))
-                    except (ValueError, TypeError):
-                        continue
-            
-            # Handle .out format (values as list with cde and type)s
-            elif isinstance(values, list):
-                obs_vals = None
-                sim_vals = None
-                for var_entry in values:
-                    if isinstance(var_entry, dict) and var_entry.get('cde') == variable:
-                        if var_entry.get('type') == 'measured':
-                            obs_vals = var_entry.get('values', [])
-                        elif var_entry.get('type') == 'simulated':
-                            sim_vals = var_entry.get('values', [])
-                
-                if obs_vals and sim_vals:
-                    min_len = min(len(obs_vals), len(sim_vals))
-                    for i in range(min_len):
-                        try:
-                            o = float(obs_vals[i])
-                            s = float(sim_vals[i])
-                            observed.append(o)
-                            simulated.append(s)
-                        except (ValueError, TypeError):
-                            continue
-    
-    return observed, simulated
+    return collect_variable_data(data, [variable], run).get(variable, ([], []))
+
+def parse_dates(dates):
+    """Convert date strings or datetimes to a datetime64[D] array.
+
+    Args:
+        dates (list): ISO date strings ("YYYY-MM-DD", optionally with a time) or datetimes.
+    Returns:
+        np.ndarray: datetime64[D] array, NaT where a value is missing or unparseable.
+    """
+    try:
+        return np.array(dates, dtype='datetime64[D]')
+    except (ValueError, TypeError):
+        parsed = np.empty(len(dates), dtype='datetime64[D]')
+        for i, date in enumerate(dates):
+            try:
+                parsed[i] = np.datetime64(date, 'D') if date is not None else np.datetime64('NaT')
+            except (ValueError, TypeError):
+                parsed[i] = np.datetime64('NaT')
+        return parsed
+
+def _as_float_array(values):
+    """Convert values to floats, NaN where a value is missing or not numeric."""
+    try:
+        return np.array(values, dtype=float)
+    except (ValueError, TypeError):
+        converted = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                converted[i] = float(value)
+            except (ValueError, TypeError):
+                converted[i] = np.nan
+        return converted
 
-def extract_normalized_series(data, variable, run=None):
+def _alignment_keys(x):
+    """Return (numeric keys, x values) for dates or indexes.
+
+    Dates become datetime64[D] values with day-number keys (NaN for NaT);
+    numeric indexes are their own keys.
+    """
+    first = next(iter(x), None)
+    if isinstance(first, (int, float, np.integer, np.floating)) and not isinstance(first, bool):
+        keys = _as_float_array(x)
+        return keys, keys
+    dates = parse_dates(list(x))
+    return np.where(np.isnat(dates), np.nan, dates.astype('int64')), dates
+
+def align_series(obs_x, obs_y, sim_x, sim_y, mode="exact", tolerance_days=1):
+    """Match observations to simulated values on sorted date (or index) arrays.
+
+    The simulated series is sorted once and every observation is located with
+    `np.searchsorted`, so alignment is O(n log n). Every observation is kept,
+    including several observations on the same date.
+
+    Args:
+        obs_x (list): Observation dates (strings/datetimes) or numeric indexes.
+        obs_y (list): Observed values.
+        sim_x (list): Simulated dates or numeric indexes.
+        sim_y (list): Simulated values.
+        mode (str): "exact" (same date), "nearest" (closest simulated date within
+            `tolerance_days`) or "interpolate" (linear interpolation between the
+            surrounding simulated dates).
+        tolerance_days (int): Maximum distance for "nearest" matching.
+    Returns:
+        tuple: (observed, simulated, obs_positions, sim_x_used) arrays, where
+        obs_positions are the indexes of the matched observations in the input
+        and sim_x_used the simulated date or index each one was matched to (the
+        observation's own when interpolated).
+    """
+    if mode not in ALIGNMENT_MODES:
+        raise ValueError(f"Unknown alignment mode: {mode}")
+    n_obs = min(len(obs_x), len(obs_y))
+    n_sim = min(len(sim_x), len(sim_y))
+    obs_keys, obs_x_values = _alignment_keys(list(obs_x[:n_obs]))
+    sim_keys, sim_x_values = _alignment_keys(list(sim_x[:n_sim]))
+    obs_y = _as_float_array(list(obs_y[:n_obs]))
+    sim_y = _as_float_array(list(sim_y[:n_sim]))
+
+    obs_positions = np.flatnonzero(np.isfinite(obs_keys) & np.isfinite(obs_y))
+    sim_valid = np.flatnonzero(np.isfinite(sim_keys) & np.isfinite(sim_y))
+    if not len(obs_positions) or not len(sim_valid):
+        empty = np.array([], dtype=float)
+        return empty, empty, np.array([], dtype=int), sim_x_values[:0]
+
+    # Sort the simulated series once; a stable sort keeps the first of duplicate dates first
+    sim_order = sim_valid[np.argsort(sim_keys[sim_valid], kind='stable')]
+    keys = sim_keys[sim_order]
+    targets = obs_keys[obs_positions]
+
+    if mode == "interpolate":
+        matched = (targets >= keys[0]) & (targets <= keys[-1])
+        obs_positions = obs_positions[matched]
+        simulated = np.interp(targets[matched], keys, sim_y[sim_order])
+        return obs_y[obs_positions], simulated, obs_positions, obs_x_values[obs_positions]
+
+    position = np.searchsorted(keys, targets, side='left')
+    right = np.minimum(position, len(keys) - 1)
+    if mode == "exact":
+        chosen = right
+        matched = keys[chosen] == targets
+    else:
+        left = np.maximum(position - 1, 0)
+        chosen = np.where(np.abs(keys[left] - targets) <= np.abs(keys[right] - targets), left, right)
+        matched = np.abs(keys[chosen] - targets) <= tolerance_days
+    sim_index = sim_order[chosen[matched]]
+    obs_positions = obs_positions[matched]
+    return obs_y[obs_positions], sim_y[sim_index], obs_positions, sim_x_values[sim_index]
+
+def extract_normalized_series(data, variable, run=None, mode="exact", tolerance_days=1, return_pairs=False):
     """Extract normalized observed and simulated series for a variable, aligned by calendar or index.
-    
+
+    Measured and simulated values are aligned run by run with `align_series`;
+    series without dates are aligned by position.
+
     Args: 
         data (list): List of data entries containing run and variable information.
         variable (str): Variable code (CDE) to extract.
         run (str, optional): Specific run to filter by.
+        mode (str): "exact", "nearest" or "interpolate" (see `align_series`).
+        tolerance_days (int): Maximum date distance for "nearest" matching.
+        return_pairs (bool): Also return the pairs that were used.
     
     Returns:
-        tuple: (observed values, simulated values) aligned by common calendar or index keys.
+        tuple: (observed values, simulated values), plus with `return_pairs` a list
+        of (run, observed date or index, matched simulated date or index) tuples.
     """
-    measured_points = []
-    simulated_points = []
-
+    # Gather every series of the variable per run; repeated entries are appended, not overwritten
+    series = {}
     for entry in data:
         # Filter by run if specified
-        if run and entry.get("run") != run:
+        if not isinstance(entry, dict) or (run and entry.get("run") != run):
             continue
 
         values = entry.get("values", [])
+        if not isinstance(values, list):
+            continue
         for var_entry in values:
-            if var_entry.get("cde") != variable:
+            if not isinstance(var_entry, dict) or var_entry.get("cde") != variable:
                 continue
-
             val_type = var_entry.get("type")
-            val_values = var_entry.get("values", [])
-            x_calendar = var_entry.get("x_calendar", [])
-
-            # Pair values with calendar dates or indexes
-            if val_type == "measured":
-                measured_points = list(zip(x_calendar, val_values)) if x_calendar else list(enumerate(val_values))
-            elif val_type == "simulated":
-                simulated_points = list(zip(x_calendar, val_values)) if x_calendar else list(enumerate(val_values))
+            if val_type not in ("measured", "simulated"):
+                continue
+            val_values = list(var_entry.get("values", []))
+            x_calendar = list(var_entry.get("x_calendar") or [])
+            run_series = series.setdefault(entry.get("run"), {"measured": ([], []), "simulated": ([], [])})
+            x_values, y_values = run_series[val_type]
+            # Pair values with calendar dates or, without dates, with their position
+            if len(x_calendar) >= len(val_values):
+                x_values.extend(x_calendar[:len(val_values)])
+            else:
+                x_values.extend(range(len(x_values), len(x_values) + len(val_values)))
+            y_values.extend(val_values)
 
-    # Aligned measured and simulated data by common keys
-    measured_dict = dict(measured_points)
-    simulated_dict = dict(simulated_points)
-    common_keys = sorted(set(measured_dict) & set(simulated_dict))
+    observed, simulated, pairs = [], [], []
+    for run_name, run_series in series.items():
+        obs_x, obs_y = run_series["measured"]
+        sim_x, sim_y = run_series["simulated"]
+        if not obs_y or not sim_y:
+            continue
+        # Dates on one side only cannot be compared with indexes on the other
+        if isinstance(obs_x[0], int) != isinstance(sim_x[0], int):
+            obs_x, sim_x = list(range(len(obs_y))), list(range(len(sim_y)))
+        run_observed, run_simulated, obs_positions, sim_used = align_series(obs_x, obs_y, sim_x, sim_y, mode, tolerance_days)
+        observed.extend(run_observed.tolist())
+        simulated.extend(run_simulated.tolist())
+        if return_pairs:
+            pairs.extend(
+                (run_name, _pair_key(obs_x[i]), _pair_key(x))
+                for i, x in zip(obs_positions.tolist(), sim_used.tolist())
+            )
 
-    observed = [float(measured_dict[k]) for k in common_keys]
-    simulated = [float(simulated_dict[k]) for k in common_keys]
+    if return_pairs:
+        return observed, simulated, pairs
+    return observed, simulated
 
-    return observed, simulated
\ No newline at end of file
+def _pair_key(value):
+    """Render a date or index of the pair report as an ISO date string or int."""
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return int(value)
+    return str(value)[:10]